@@ -5,6 +5,9 @@ from __future__ import division
 from __future__ import print_function
 
 from compas_fea.fea.ansys_sel import Writer
+from compas_fea.fea.ansys_sel.results import gp_columns
+from compas_fea.fea.ansys_sel.results import gp_groups
+from compas_fea.fea.ansys_sel.results import results_region
 from compas.geometry import length_vector
 
 from subprocess import Popen
@@ -37,7 +40,8 @@ element_fields = ['sf', 'sm', 'sk', 'se', 's', 'e', 'pe', 'rbfor', 'ctf']
 # -------------------------------------------------------------------------
 # Generates the APDL (.inp) file based on the strucutre object
 # -------------------------------------------------------------------------
-def input_generate(structure, fields, output, lstep, sbstep):
+def input_generate(structure, fields, output, lstep, sbstep, full_precision=False, sink=None, cache=False,
+                   workers=None, sets=None):
     """ Creates the Ansys .inp file from the Structure object.
 
     Parameters
@@ -48,6 +52,18 @@ def input_generate(structure, fields, output, lstep, sbstep):
         Data field requests.
     output : bool
         Print terminal output.
+    full_precision : bool
+        Write node co-ordinates with full double precision instead of 3 decimals.
+    sink : obj
+        FileSink, MemorySink or PipeSink to write to, defaults to the .inp file in structure.path.
+    cache : bool, str
+        Write the model sections as /INPUT include files keyed by content hash and reuse unchanged ones,
+        True for the folder [name]_cache in structure.path or the path of a folder.
+    workers : int
+        Number of processes rendering the node, set, element, material and boundary condition sections,
+        forking platforms only, see Writer.write_sections.
+    sets : list
+        Names of the node and element sets to export the results for, None for the whole structure.
 
     Returns
     -------
@@ -67,16 +83,29 @@ def input_generate(structure, fields, output, lstep, sbstep):
     if 'u' not in fields:
         fields.append('u')
 
-    with Writer(structure=structure, software='ansys_sel', filename=filename, fields=fields) as writer:
+    if cache is True:
+        cache = '{0}{1}_cache'.format(structure.path, structure.name)
+
+    elements = structure.elements
+    boundary_conditions = []
+    for key in structure.steps_order[:1]:
+        keys = structure.steps[key].displacements
+        boundary_conditions = [keys] if isinstance(keys, str) else keys
+
+    with Writer(structure=structure, software='ansys_sel', filename=filename, fields=fields,
+                full_precision=full_precision, sink=sink, cache=cache or None) as writer:
         writer.write_heading() # Writes the Heading in the .inp (APDL) file
-        writer.write_nodes() # Writes nodes in the .inp (APDL) file
-        writer.write_node_sets() # Writes nodes sets in the .inp (APDL) file
-        writer.write_elements(structure) # Writes elements in the .inp (APDL) file
-        writer.write_element_sets() # Writes element sets in the .inp (APDL) file
-        writer.write_materials() # Writes materials in the .inp (APDL) file
-        writer.write_boundary_conditions() # Writes boundary conditions in the .inp (APDL) file        
+        writer.write_sections([ # Writes nodes, sets, elements, materials and boundary conditions in the .inp (APDL) file
+            ('nodes', [structure.nodes.xyz]),
+            ('node_sets', [structure.sets]),
+            ('elements', [elements.offsets, elements.connectivity, structure.element_properties,
+                          structure.sections, structure.materials, structure.sets]),
+            ('element_sets', [structure.sets]),
+            ('materials', [structure.element_properties, structure.sections, structure.materials, structure.sets]),
+            ('boundary_conditions', [boundary_conditions, structure.displacements, structure.sets]),
+        ], workers=workers)
         writer.write_steps() # Writes steps/solver in the .inp (APDL) file
-        writer.write_results(structure,fields, lstep, sbstep) # Writes results in the .inp (APDL) file
+        writer.write_results(structure,fields, lstep, sbstep, sets=sets) # Writes results in the .inp (APDL) file
     if output:
         toc = time() - tic
         print('Ansys MAPDL input file successfull generated in {0:.3f} s'.format(toc))
@@ -209,10 +238,200 @@ def launch_process(structure, exe, cpus, output, ansys_version=None):
         #exit()  
     return   error_found    
 
+# -------------------------------------------------------------------------
+# read the element infos written with the input file
+# -------------------------------------------------------------------------
+def _read_element_infos(out_path):
+    """ Reads the element types and local axes from elem_infos.txt.
+
+    Parameters
+    ----------
+    out_path : str
+        Output folder of the analysis.
+
+    Returns
+    -------
+    dict
+        Element infos per element key, empty if the file does not exist.
+
+    """
+
+    filename = os.path.join(out_path, 'elem_infos.txt')
+
+    if not os.path.isfile(filename):
+        return {}
+
+    elem_infos_dict = {'elem_nr' : {}, 'elem_typ' : {}, 'elem_loc_x_glob_x' : {}, 'elem_loc_x_glob_y' : {},  'elem_loc_x_glob_z' : {}, 'elem_loc_y_glob_x' : {}, 'elem_loc_y_glob_y' : {}, 'elem_loc_y_glob_z' : {}}
+    columns = ['elem_typ', 'elem_nr', 'elem_loc_x_glob_x', 'elem_loc_x_glob_y', 'elem_loc_x_glob_z',
+               'elem_loc_y_glob_x', 'elem_loc_y_glob_y', 'elem_loc_y_glob_z']
+
+    with open(filename, 'r') as efile:
+        for line in efile:
+            ele = [float(line[i:i + 24]) for i in range(0, 192, 24)]
+            if not ele[1]:
+                continue
+            key = int(ele[1]) - 1
+            for column, value in zip(columns, ele):
+                elem_infos_dict[column][key] = value
+
+    return elem_infos_dict
+
+
+def _read_gp_rows(filename, columns, groups):
+    """ Reads a GP results file with a row per group of gp_groups and node.
+
+    Parameters
+    ----------
+    filename : str
+        Path of the file.
+    columns : list
+        Columns of gp_columns.
+    groups : list
+        Groups of gp_groups.
+
+    Returns
+    -------
+    dict
+        Row values per (group, node key).
+
+    """
+
+    width = 24 * len(columns)
+    rows = {}
+
+    with open(filename, 'r') as gpfile:
+        for i, (layers, elements, nodes) in enumerate(groups):
+            for node in nodes:
+                line = gpfile.readline()
+                values = [float(line[j:j + 24]) for j in range(0, width, 24)]
+                rows[i, int(values[0]) - 1] = values
+
+    return rows
+
+
+def _read_gp_infos(structure, out_path, fields, elem_infos_dict, sets=None):
+    """ Numbers the GPs and reads their step invariant data from gp_infos.txt.
+
+    Parameters
+    ----------
+    structure : obj
+        Structure object.
+    out_path : str
+        Output folder of the analysis.
+    fields : list
+        Data field requests.
+    elem_infos_dict : dict
+        Element infos of _read_element_infos.
+    sets : list
+        Names of the node and element sets the results were exported for, None for the whole structure.
+
+    Returns
+    -------
+    tuple
+        Groups of gp_groups, (group, node key) of every GP key, and the GP numbers, element numbers, element infos
+        and co-ordinates per column and GP key. None if no GP field is requested.
+
+    Notes
+    -----
+    - The GPs are the nodes of each shell element in ascending element and node order.
+
+    """
+
+    columns = gp_columns(fields, step=False)
+
+    if not columns:
+        return None
+
+    nodes, elements = results_region(structure, sets)
+    groups = gp_groups(structure, elements)
+    group = {}
+    for i, (layers, elements, nodes) in enumerate(groups):
+        for element in elements:
+            group[element] = i
+
+    filename = os.path.join(out_path, 'gp_infos.txt')
+    rows = _read_gp_rows(filename, columns, groups) if os.path.isfile(filename) else {}
+
+    # GP number and element number under the names of the former per layer files
+    layers = []
+    if 's' in fields or 'eps' in fields or 'all' in fields:
+        layers += ['top', 'bot']
+    if 'sig_sr' in fields or 'all' in fields:
+        layers += ['1L', '2L', '3L', '4L']
+
+    infos = []
+    if 's' in fields or 'all' in fields:
+        infos = ['loc_x_glob_x', 'loc_x_glob_y', 'loc_x_glob_z', 'loc_y_glob_x', 'loc_y_glob_y', 'loc_y_glob_z']
+
+    gps = []
+    gp_name = {}
+    elem_nr = {}
+    gp_dict = dict((column, {}) for column in (columns[1:] if rows else []) + infos)
+
+    for element in sorted(group):
+        for node in sorted(set(structure.elements.get_nodes(element))):
+            key = len(gps)
+            gps.append((group[element], node))
+            gp_name[key] = float(key + 1)
+            elem_nr[key] = float(element + 1)
+            if rows:
+                for column, value in zip(columns[1:], rows[group[element], node][1:]):
+                    gp_dict[column][key] = value
+            for column in infos:
+                gp_dict[column][key] = elem_infos_dict.get('elem_' + column, {}).get(element, 0.)
+
+    for layer in layers:
+        gp_dict['GP_name_' + layer] = gp_name
+        gp_dict['elem_nr_' + layer] = elem_nr
+    if infos:
+        gp_dict['nr'] = gp_name
+        gp_dict['elem_typ'] = dict((i, 1.) for i in gp_name)
+
+    return groups, gps, gp_dict
+
+
+def _read_gp_results(out_path, step, fields, gp_infos):
+    """ Reads the stresses, strains and steel stresses at the GPs of a step from <step>_gp_results.txt.
+
+    Parameters
+    ----------
+    out_path : str
+        Output folder of the analysis.
+    step : str
+        Name of the step.
+    fields : list
+        Data field requests.
+    gp_infos : tuple
+        Step invariant GP data of _read_gp_infos.
+
+    Returns
+    -------
+    dict
+        GP results per column and GP key, sharing the step invariant columns with all steps, empty if the file
+        does not exist.
+
+    """
+
+    columns = gp_columns(fields)
+    filename = os.path.join(out_path, step + '_gp_results.txt')
+
+    if not gp_infos or not os.path.isfile(filename):
+        return {}
+
+    groups, gps, infos = gp_infos
+    rows = _read_gp_rows(filename, columns, groups)
+    gp_dict = dict(infos)
+
+    for i, column in enumerate(columns[1:], 1):
+        gp_dict[column] = dict((key, rows[gp][i]) for key, gp in enumerate(gps))
+
+    return gp_dict
+
+
 # -------------------------------------------------------------------------
 # extract the results from ANSYS APDL and save in the structure 
 # -------------------------------------------------------------------------
-def extract_data(structure, fields, exe, output, return_data, components, error_found=False):
+def extract_data(structure, fields, exe, output, return_data, components, error_found=False, sets=None):
     
     """ Extract data from the txt files
 
@@ -232,6 +451,8 @@ def extract_data(structure, fields, exe, output, return_data, components, error_
         Specific components to extract from the fields data. (not used in the current version)
     error_found: bool
         Flag that defines weather an error occured during the analysis
+    sets : list
+        Names of the node and element sets the results were exported for, as given to input_generate.
 
     Returns
     -------
@@ -254,6 +475,12 @@ def extract_data(structure, fields, exe, output, return_data, components, error_
         #elif type(steps) == str:
         #    steps = [steps]
 
+        # extract gerneal element infos (written once by write_results)
+        elem_infos_dict = _read_element_infos(out_path)
+
+        # GP numbering, element infos and co-ordinates at the GPs, the same for all steps
+        gp_infos = _read_gp_infos(structure, out_path, fields, elem_infos_dict, sets)
+
         for step in steps:
             structure.results[step] = {} #creates an empty dict for each analysis step
             if structure.steps[step].__name__ == 'GeneralStep':
@@ -273,35 +500,9 @@ def extract_data(structure, fields, exe, output, return_data, components, error_
 
                 #if no error occured read out results and write to results dict
                 else:
-                    # extract gerneal element infos
-                    filename = step + '_elem_infos.txt'
-
-                    isfile_filename=str(out_path) + "\\" + filename
-
-                    if os.path.isfile(isfile_filename)==True:
-                        
-                        efile = open(os.path.join(out_path, filename), 'r')    
-                        e_i = efile.readlines()                    
-                        #leeres Resultat dict.                    
-                        elem_infos_dict = {'elem_nr' : {}, 'elem_typ' : {}, 'elem_loc_x_glob_x' : {}, 'elem_loc_x_glob_y' : {},  'elem_loc_x_glob_z' : {}, 'elem_loc_y_glob_x' : {}, 'elem_loc_y_glob_y' : {}, 'elem_loc_y_glob_z' : {}}
-                        
-                        
-                        #print
-                        for i in range(len(e_i)):
-                            e_i_string = e_i[i].split(',')
-                            ele = map(float, e_i_string[1:])
-                            key = int(ele[0]) - 1                                                    
-                            # Speichert Resultate von fuer Elemente im gesamt Resultatverzeichnis (result_data)
-                            elem_infos_dict['elem_nr'][key]=float(ele[0])
-                            elem_infos_dict['elem_typ'][key]=float(ele[1])
-                            elem_infos_dict['elem_loc_x_glob_x'][key]=float(ele[2])
-                            elem_infos_dict['elem_loc_x_glob_y'][key]=float(ele[3])
-                            elem_infos_dict['elem_loc_x_glob_z'][key]=float(ele[4])
-                            elem_infos_dict['elem_loc_y_glob_x'][key]=float(ele[5])
-                            elem_infos_dict['elem_loc_y_glob_y'][key]=float(ele[6])
-                            elem_infos_dict['elem_loc_y_glob_z'][key]=float(ele[7])
-
-                        elem_infos_list.append(elem_infos_dict)  
+                    # gerneal element infos, the same for all steps
+                    if elem_infos_dict:
+                        elem_infos_list.append(elem_infos_dict)
 
 
 
@@ -354,8 +555,8 @@ def extract_data(structure, fields, exe, output, return_data, components, error_
                             #print(shell_forces_moments)
                             for f_m in shell_forces_moments:
                                 fmstring = f_m.split(',')
-                                f_m = map(float, fmstring[2:]) # includes the value sf1, sf2, etc                                        
-                                key = int(float(fmstring[1])) - 1
+                                f_m = [float(i) for i in fmstring[1:]] # includes the value sf1, sf2, etc                                        
+                                key = int(float(fmstring[0])) - 1
                             
                                 # Speichert Resultate von fuer Elemente im gesamt Resultatverzeichnis (result_data)
                                 result_data[str(step)]["element"]["sf1"].update({key : {"ip1_sp0" : f_m[0]}})
@@ -368,273 +569,13 @@ def extract_data(structure, fields, exe, output, return_data, components, error_
                                 result_data[str(step)]["element"]["sm3"].update({key : {"ip1_sp0" : f_m[7]}})
                                 result_data[str(step)]["element"]["ele_type"].update({key : {"ip1_sp0" : f_m[8]}})
                         
-                        
-                    # Principal Stresses at each GP
-                    # -------------------------------------------------------
-                    if 's' in fields or 'all' in fields:
-                        
-                        # Add stresses elment infos to the structure
-                        filename = step + '_stresses_elem_infos.txt'
-                        
-                        isfile_filename=str(out_path) + "\\" + filename
-                                            
-                            
-                        if os.path.isfile(isfile_filename)==True:          
-                            psfile = open(os.path.join(out_path, filename), 'r')
-                            ps = psfile.readlines()
-                                        
-                            
-                            stress_dict = {'nr': {},'loc_x_glob_x': {}, 'loc_x_glob_y': {}, 'loc_x_glob_z': {}, 'loc_y_glob_x': {} , 'loc_y_glob_y': {} , 'loc_y_glob_z': {} , 'elem_typ': {} } # sig_c1 and sig_c3  top an einem GP
-                            for i in range(len(ps)):
-                                psstring = ps[i].split(',')
-                                stress = map(float, psstring)
-                                key = int(stress[0]) - 1                            
-                                stress_dict['nr'][key] = float(stress[0])
-                                stress_dict['loc_x_glob_x'][key] = float(stress[1])
-                                stress_dict['loc_x_glob_y'][key] = float(stress[2])
-                                stress_dict['loc_x_glob_z'][key] = float(stress[3])                            
-                                stress_dict['loc_y_glob_x'][key] = float(stress[4])                                                        
-                                stress_dict['loc_y_glob_y'][key] = float(stress[5])
-                                stress_dict['loc_y_glob_z'][key] = float(stress[6])
-                                stress_dict['elem_typ'][key] = float(stress[7])
-                            
-                            gplist.append(stress_dict)  
-                        
-
-
-                        # Add stresses TOP to the structure
-                        filename = step + '_stresses_top.txt'
-                        
-                        isfile_filename=str(out_path) + "\\" + filename
-                                            
-                            
-                        if os.path.isfile(isfile_filename)==True:          
-                            psfile = open(os.path.join(out_path, filename), 'r')
-                            ps = psfile.readlines()
-                                        
-                            
-                            stress_dict = {'GP_name_top': {},'elem_nr_top': {}, 'sig_x_top': {}, 'sig_y_top': {}, 'tau_xy_top': {} , 'fcc_eff_top': {} , 'coor_intp_layer_x_top': {} , 'coor_intp_layer_y_top': {}, 'coor_intp_layer_z_top': {}} # sig_c1 and sig_c3  top an einem GP
-                            for i in range(len(ps)):
-                                psstring = ps[i].split(',')
-                                stress = map(float, psstring)
-                                key = int(stress[0]) - 1                            
-                                stress_dict['GP_name_top'][key] = float(stress[0])
-                                stress_dict['elem_nr_top'][key] = float(stress[1])
-                                stress_dict['sig_x_top'][key] = float(stress[2])
-                                stress_dict['sig_y_top'][key] = float(stress[3])                            
-                                stress_dict['tau_xy_top'][key] = float(stress[4])                                                        
-                                stress_dict['fcc_eff_top'][key] = float(stress[5])
-                                stress_dict['coor_intp_layer_x_top'][key] = float(stress[6])
-                                stress_dict['coor_intp_layer_y_top'][key] = float(stress[7])
-                                stress_dict['coor_intp_layer_z_top'][key] = float(stress[8])
-                            
-                            gplist.append(stress_dict)  
-
-                        
-                        # Add stresses BOT to the structure      
-                        filename = step + '_stresses_bot.txt'
-                        
-                        isfile_filename=str(out_path) + "\\" + filename
-                                            
-                            
-                        if os.path.isfile(isfile_filename)==True:          
-                            psfile = open(os.path.join(out_path, filename), 'r')
-                            ps = psfile.readlines()
-                                        
-                            
-                            stress_dict = {'GP_name_bot': {},'elem_nr_bot': {}, 'sig_x_bot': {}, 'sig_y_bot': {}, 'tau_xy_bot': {} , 'fcc_eff_bot': {} , 'coor_intp_layer_x_bot': {} , 'coor_intp_layer_y_bot': {}, 'coor_intp_layer_z_bot': {}} # sig_c1 and sig_c3  top an einem GP
-                            for i in range(len(ps)):
-                                psstring = ps[i].split(',')
-                                stress = map(float, psstring)
-                                key = int(stress[0]) - 1
-                                stress_dict['GP_name_bot'][key] = float(stress[0])
-                                stress_dict['elem_nr_bot'][key] = float(stress[1])
-                                stress_dict['sig_x_bot'][key] = float(stress[2])
-                                stress_dict['sig_y_bot'][key] = float(stress[3])                            
-                                stress_dict['tau_xy_bot'][key] = float(stress[4])                                                        
-                                stress_dict['fcc_eff_bot'][key] = float(stress[5])
-                                stress_dict['coor_intp_layer_x_bot'][key] = float(stress[6])
-                                stress_dict['coor_intp_layer_y_bot'][key] = float(stress[7])
-                                stress_dict['coor_intp_layer_z_bot'][key] = float(stress[8])                                                                      
-                            
-                            gplist.append(stress_dict)
-                        
-
-                    
-                    # Principal Strains at each GP
+                    # Stresses, strains and steel stresses at each GP
                     # -------------------------------------------------------
-                    if 'eps' in fields or 'all' in fields:
-                        
-                        # Add strains TOP to the structure
-                        filename = step + '_strains_top.txt'
-                        
-                        isfile_filename=str(out_path) + "\\" + filename
-                                            
-                            
-                        if os.path.isfile(isfile_filename)==True:          
-                            epsfile = open(os.path.join(out_path, filename), 'r')
-                            eps = epsfile.readlines()
-                                        
-                            
-                            strain_dict = {'GP_name_top': {},'elem_nr_top': {}, 'eps_1_top': {}, 'eps_3_top': {}, 'coor_intp_layer_x_top': {} , 'coor_intp_layer_y_top': {}, 'coor_intp_layer_z_top': {}} 
-                            for i in range(len(eps)):
-                                epsstring = eps[i].split(',')
-                                strain = map(float, epsstring)
-                                key = int(strain[0]) - 1                            
-                                strain_dict['GP_name_top'][key] = float(strain[0])
-                                strain_dict['elem_nr_top'][key] = float(strain[1])
-                                strain_dict['eps_1_top'][key] = float(strain[2])
-                                strain_dict['eps_3_top'][key] = float(strain[3])                            
-                                strain_dict['coor_intp_layer_x_top'][key] = float(strain[4])
-                                strain_dict['coor_intp_layer_y_top'][key] = float(strain[5])
-                                strain_dict['coor_intp_layer_z_top'][key] = float(strain[6])
-                            
-                            gplist.append(strain_dict)  
-                        
-                        
-
-                        # Add strain BOT to the structure                          
-                        filename = step + '_strains_bot.txt'
-                        
-                        isfile_filename=str(out_path) + "\\" + filename
-                                            
-                            
-                        if os.path.isfile(isfile_filename)==True:          
-                            epsfile = open(os.path.join(out_path, filename), 'r')
-                            eps = epsfile.readlines()
-                                        
-                            
-                            strain_dict = {'GP_name_bot': {},'elem_nr_bot': {}, 'eps_1_bot': {}, 'eps_3_bot': {}, 'coor_intp_layer_x_bot': {} , 'coor_intp_layer_y_bot': {}, 'coor_intp_layer_z_bot': {}} 
-                            for i in range(len(eps)):
-                                epsstring = eps[i].split(',')
-                                strain = map(float, epsstring)
-                                key = int(strain[0]) - 1                            
-                                strain_dict['GP_name_bot'][key] = float(strain[0])
-                                strain_dict['elem_nr_bot'][key] = float(strain[1])
-                                strain_dict['eps_1_bot'][key] = float(strain[2])
-                                strain_dict['eps_3_bot'][key] = float(strain[3])                            
-                                strain_dict['coor_intp_layer_x_bot'][key] = float(strain[4])
-                                strain_dict['coor_intp_layer_y_bot'][key] = float(strain[5])
-                                strain_dict['coor_intp_layer_z_bot'][key] = float(strain[6])
-                            
-                            gplist.append(strain_dict)  
-                        
-                                        
-                    # 
-                    # 
+                    gp_dict = _read_gp_results(out_path, step, fields, gp_infos)
+                    if gp_dict:
+                        gplist.append(gp_dict)
 
-                    # Steel stresses reinforcement layer 1 at each GP
-                    # -------------------------------------------------------
-                    if 'sig_sr' in fields or 'all' in fields:
-                        
-                        # Add steel stress reinforcement layer 1 to the structure
-                        filename = step + '_sig_sr_1L.txt'
-                        
-                        isfile_filename=str(out_path) + "\\" + filename
-                                            
-                            
-                        if os.path.isfile(isfile_filename)==True:          
-                            sig_sr_1_file = open(os.path.join(out_path, filename), 'r')
-                            sig_sr_1 = sig_sr_1_file.readlines()
-                                        
-                            
-                            sig_sr_1_dict = {'GP_name_1L': {},'elem_nr_1L': {}, 'sig_sr_1L_x': {}, 'sig_sr_1L_y': {}, 'coor_x_sig_sr_1L': {} , 'coor_y_sig_sr_1L': {}, 'coor_z_sig_sr_1L': {}} 
-                            for i in range(len(sig_sr_1)):
-                                sig_sr_1_string = sig_sr_1[i].split(',')
-                                sig_sr_1_stress = map(float, sig_sr_1_string)
-                                key = int(sig_sr_1_stress[0]) - 1                            
-                                sig_sr_1_dict['GP_name_1L'][key] = float(sig_sr_1_stress[0])
-                                sig_sr_1_dict['elem_nr_1L'][key] = float(sig_sr_1_stress[1])
-                                sig_sr_1_dict['sig_sr_1L_x'][key] = float(sig_sr_1_stress[2])
-                                sig_sr_1_dict['sig_sr_1L_y'][key] = float(sig_sr_1_stress[3])                            
-                                sig_sr_1_dict['coor_x_sig_sr_1L'][key] = float(sig_sr_1_stress[4])
-                                sig_sr_1_dict['coor_y_sig_sr_1L'][key] = float(sig_sr_1_stress[5])
-                                sig_sr_1_dict['coor_z_sig_sr_1L'][key] = float(sig_sr_1_stress[6])
-                            
-                            gplist.append(sig_sr_1_dict)  
-                        
-                        # Add steel stress reinforcement layer 2 to the structure
-                        filename = step + '_sig_sr_2L.txt'
-                        
-                        isfile_filename=str(out_path) + "\\" + filename
-                                            
-                            
-                        if os.path.isfile(isfile_filename)==True:          
-                            sig_sr_2_file = open(os.path.join(out_path, filename), 'r')
-                            sig_sr_2 = sig_sr_2_file.readlines()
-                                        
-                            
-                            sig_sr_2_dict = {'GP_name_2L': {},'elem_nr_2L': {}, 'sig_sr_2L_x': {}, 'sig_sr_2L_y': {}, 'coor_x_sig_sr_2L': {} , 'coor_y_sig_sr_2L': {}, 'coor_z_sig_sr_2L': {}} 
-                            for i in range(len(sig_sr_2)):
-                                sig_sr_2_string = sig_sr_2[i].split(',')
-                                sig_sr_2_stress = map(float, sig_sr_2_string)
-                                key = int(sig_sr_2_stress[0]) - 1                            
-                                sig_sr_2_dict['GP_name_2L'][key] = float(sig_sr_2_stress[0])
-                                sig_sr_2_dict['elem_nr_2L'][key] = float(sig_sr_2_stress[1])
-                                sig_sr_2_dict['sig_sr_2L_x'][key] = float(sig_sr_2_stress[2])
-                                sig_sr_2_dict['sig_sr_2L_y'][key] = float(sig_sr_2_stress[3])                            
-                                sig_sr_2_dict['coor_x_sig_sr_2L'][key] = float(sig_sr_2_stress[4])
-                                sig_sr_2_dict['coor_y_sig_sr_2L'][key] = float(sig_sr_2_stress[5])
-                                sig_sr_2_dict['coor_z_sig_sr_2L'][key] = float(sig_sr_2_stress[6])
-                            
-                            gplist.append(sig_sr_2_dict)  
-                        
-                        # Add steel stress reinforcement layer 3 to the structure
-                        filename = step + '_sig_sr_3L.txt'
-                        
-                        isfile_filename=str(out_path) + "\\" + filename
-                                            
-                            
-                        if os.path.isfile(isfile_filename)==True:          
-                            sig_sr_3_file = open(os.path.join(out_path, filename), 'r')
-                            sig_sr_3 = sig_sr_3_file.readlines()
-                                        
-                            
-                            sig_sr_3_dict = {'GP_name_3L': {},'elem_nr_3L': {}, 'sig_sr_3L_x': {}, 'sig_sr_3L_y': {}, 'coor_x_sig_sr_3L': {} , 'coor_y_sig_sr_3L': {}, 'coor_z_sig_sr_3L': {}} 
-                            for i in range(len(sig_sr_3)):
-                                sig_sr_3_string = sig_sr_3[i].split(',')
-                                sig_sr_3_stress = map(float, sig_sr_3_string)
-                                key = int(sig_sr_3_stress[0]) - 1                            
-                                sig_sr_3_dict['GP_name_3L'][key] = float(sig_sr_3_stress[0])
-                                sig_sr_3_dict['elem_nr_3L'][key] = float(sig_sr_3_stress[1])
-                                sig_sr_3_dict['sig_sr_3L_x'][key] = float(sig_sr_3_stress[2])
-                                sig_sr_3_dict['sig_sr_3L_y'][key] = float(sig_sr_3_stress[3])                            
-                                sig_sr_3_dict['coor_x_sig_sr_3L'][key] = float(sig_sr_3_stress[4])
-                                sig_sr_3_dict['coor_y_sig_sr_3L'][key] = float(sig_sr_3_stress[5])
-                                sig_sr_3_dict['coor_z_sig_sr_3L'][key] = float(sig_sr_3_stress[6])
-                            
-                            gplist.append(sig_sr_3_dict)                                     
 
-                        
-                        # Add steel stress reinforcement layer 4 to the structure
-                        filename = step + '_sig_sr_4L.txt'
-                        
-                        isfile_filename=str(out_path) + "\\" + filename
-                                            
-                            
-                        if os.path.isfile(isfile_filename)==True:          
-                            sig_sr_4_file = open(os.path.join(out_path, filename), 'r')
-                            sig_sr_4 = sig_sr_4_file.readlines()
-                                        
-                            
-                            sig_sr_4_dict = {'GP_name_4L': {},'elem_nr_4L': {}, 'sig_sr_4L_x': {}, 'sig_sr_4L_y': {}, 'coor_x_sig_sr_4L': {} , 'coor_y_sig_sr_4L': {}, 'coor_z_sig_sr_4L': {}} 
-                            for i in range(len(sig_sr_4)):
-                                sig_sr_4_string = sig_sr_4[i].split(',')
-                                sig_sr_4_stress = map(float, sig_sr_4_string)
-                                key = int(sig_sr_4_stress[0]) - 1                            
-                                sig_sr_4_dict['GP_name_4L'][key] = float(sig_sr_4_stress[0])
-                                sig_sr_4_dict['elem_nr_4L'][key] = float(sig_sr_4_stress[1])
-                                sig_sr_4_dict['sig_sr_4L_x'][key] = float(sig_sr_4_stress[2])
-                                sig_sr_4_dict['sig_sr_4L_y'][key] = float(sig_sr_4_stress[3])                            
-                                sig_sr_4_dict['coor_x_sig_sr_4L'][key] = float(sig_sr_4_stress[4])
-                                sig_sr_4_dict['coor_y_sig_sr_4L'][key] = float(sig_sr_4_stress[5])
-                                sig_sr_4_dict['coor_z_sig_sr_4L'][key] = float(sig_sr_4_stress[6])
-                            
-                            gplist.append(sig_sr_4_dict) 
-                                            # 
-                    # 
-                                                
-                                
                 #  Speichert nodal and element reuslts in die structure.result dict von Compas FEA. damit die Compas FEA Funktion rhino.plot_data() genutzt werden kann
                 
 
@@ -8,8 +8,6 @@ from __future__ import print_function
 from math import pi
 
 
-
-
 __all__ = [
     'Elements',
 ]
@@ -37,180 +35,190 @@ class Elements(object):
 
         pass
 
-    def write_elements(self,structure):
+    def write_elements(self, structure=None):
 
         self.write_section('Elements')
         self.blank_line()
         self.write_line('allsel')
         self.blank_line()
-        elements = self.structure.elements
-        materials = self.structure.materials
         properties = self.structure.element_properties
         sections = self.structure.sections
         sets = self.structure.sets
 
-        written_springs = []
-        count_prop=-1 # This is only for numbering the secnum in ansys
+        self.write_local_systems()
+        numbers = self.material_numbers()
+
+        count_prop=-1 # This is only for numbering the element type in ansys
         for key in sorted(properties):
             count_prop=count_prop+1
+            index=count_prop+1
             self.write_subsection(key)
             self.blank_line()            
-            self.write_line('secnum, {0}'.format(count_prop+1))
-            self.blank_line()            
             property = properties[key]
+            mat, sec = numbers[key]
             reinforcement = property.rebar
             elset = property.elset
 
             section = sections[property.section]
             stype = section.__name__
-            geometry = section.geometry
-            nr_layers = section.nr_layers
 
-            if geometry is not None:
-                loc_coor_OR= section.loc_coords_OR
-                loc_coor_XA= section.loc_coords_XA
-                loc_coor_YA= section.loc_coords_YA
+            selection = property.elements if property.elements else sets[elset].selection # Zum elemeset zugehorige Elementnummern
 
-            material = materials.get(property.material)
+            if not selection:
+                continue
 
-            if material:
-                m_index = material.index + 1
+            # =====================================================================================================
+            # =====================================================================================================
+            # SHELL
+            # =====================================================================================================
+            # =====================================================================================================
 
-            s_index = section.index + 1
+            if stype == 'ShellSection':
 
-            selection = property.elements if property.elements else sets[elset].selection # Zum elemeset zugehorige Elementnummern
-            
-            if geometry is not None:
-    
-                t = geometry.get('t', None) 
-                nn = nr_layers.get('nn', None) 
-                
-                ORxyz = loc_coor_OR.get('ORxyz', None)
-                XAxyz = loc_coor_XA.get('XAxyz', None)
-                YAxyz = loc_coor_YA.get('YAxyz', None)                    
-                A = geometry.get('A', None)
-                J = geometry.get('J', None)
-                Ixx = geometry.get('Ixx', None)
-                Iyy = geometry.get('Iyy', None)
-                E = material.E.get('E', None)
-                G = material.G.get('G', None)
-                v = material.v['v']
-                p = material.p   
-
-            for select in selection:
-
-                element = elements[select]
-                nodes = [str(i + 1) for i in element.nodes]
-                no = len(nodes)
-                n = select + 1
-                
-                #ex = element.axes.get('ex', None)
-                #ey = element.axes.get('ey', None)
-                #ez = element.axes.get('ez', None)
-
-                # =====================================================================================================
-                # =====================================================================================================
-                # SOLID
-                # =====================================================================================================
-                # =====================================================================================================
-
-                if stype == 'SolidSection':
+                if reinforcement:
                     raise NotImplementedError
 
-                # =====================================================================================================
-                # =====================================================================================================
-                # SHELL
-                # =====================================================================================================
-                # =====================================================================================================
-
-                elif stype == 'ShellSection':
-
-
-                        
-                    e = 'element_{0}'.format(select)
-                    self.write_line('! ----- Start Element {0} ----- '.format(n))
-                    
-                    # Create element
-                    self.write_line('et, {0}, shell181'.format(n))
-                    self.write_line('type, {0}'.format(n))     
-                    self.write_line('en,{0},{1}'.format(n, ','.join(nodes)))
-                    self.write_line('keyopt, {0}, 1,0'.format(n))
-                    self.write_line('keyopt, {0}, 3,2'.format(n))
-                    self.write_line('keyopt, {0}, 8,2'.format(n))
-
-                    # loc coor system for the element
-                    self.write_line('esel,s,elem,,{0}'.format(n))
-                    self.write_line('k,1,{0},{1},{2}'.format(ORxyz[0],ORxyz[1],ORxyz[2]))   #set kp origin          
-                    self.write_line('k,2,{0},{1},{2}'.format(XAxyz[0],XAxyz[1],XAxyz[2]))   #set kp in x direction
-                    self.write_line('k,3,{0},{1},{2}'.format(YAxyz[0],YAxyz[1],YAxyz[2]))   #set kp in y direction                    
-                    No_loc_system=10+n
-                    self.write_line('cskp,{0},0,1,2,3'.format(No_loc_system)) # Set and actiave local coordiante system                   
-                    self.write_line('emodif,all,esys,{}'.format(No_loc_system))
-                    self.write_line('kdele,1,3,1') 
-                    self.write_line('allsel') 
-                    self.write_line('csys,0') # set to the orignal coordiante system                   
-    
-
-
-                    if reinforcement:
-                        raise NotImplementedError
-
-
-                # =====================================================================================================
-                # =====================================================================================================
-                # TRUSS
-                # =====================================================================================================
-                # =====================================================================================================
-                
-                elif stype == 'TrussSection':
-                    raise NotImplementedError
+                # Element type
+                self.write_line('et, {0}, shell181'.format(index))
+                self.write_line('keyopt, {0}, 1,0'.format(index))
+                self.write_line('keyopt, {0}, 3,2'.format(index))
+                self.write_line('keyopt, {0}, 8,2'.format(index))
+                self.blank_line()
 
-                # =====================================================================================================
-                # =====================================================================================================
-                # SPRING
-                # =====================================================================================================
-                # =====================================================================================================
+                esys = self.local_systems[self._local_axes(section)]
+                self.write_element_block(selection, index, mat, sec, esys=esys, min_nodes=4)
 
-                elif stype == 'SpringSection':
+            # =====================================================================================================
+            # =====================================================================================================
+            # MPC 
+            # =====================================================================================================
+            # =====================================================================================================
 
-                    raise NotImplementedError
+            elif stype == 'MPCSection':
 
-                # =====================================================================================================
-                # =====================================================================================================
-                # MASS
-                # =====================================================================================================
-                # =====================================================================================================
+                # Element type
+                self.write_line('et, {0}, mpc184'.format(index))                    
+                self.write_line('keyopt, {0}, 1,1'.format(index))
+                self.blank_line()
 
-                elif stype == 'MassSection':
+                self.write_element_block(selection, index, mat, sec)
 
-                    raise NotImplementedError
+            # =====================================================================================================
+            # =====================================================================================================
+            # SOLID, TRUSS, SPRING, MASS, BEAM
+            # =====================================================================================================
+            # =====================================================================================================
 
-                # =====================================================================================================
-                # =====================================================================================================
-                # MPC 
-                # =====================================================================================================
-                # =====================================================================================================
-
-                elif stype == 'MPCSection':
-
-                    self.write_line('! ----- Start Element {0} ----- '.format(n))                                      
-                    
-                    # Create element
-                    self.write_line('et, {0}, mpc184'.format(n))                    
-                    self.write_line('type, {0}'.format(n))             
-                    self.write_line('en,{0},{1}'.format(n, ','.join(nodes)))
-                    self.write_line('keyopt, {0}, 1,1'.format(n))
-
-                # =====================================================================================================
-                # =====================================================================================================
-                # BEAM
-                # =====================================================================================================
-                # =====================================================================================================
-
-                else:
-                                        
-                    raise NotImplementedError
+            else:
 
+                raise NotImplementedError
 
+            self.write_line('allsel') 
             self.blank_line()
             self.blank_line()
+
+    def write_local_systems(self):
+        """Writes one local co-ordinate system per unique shell section axes definition.
+
+        Returns
+        -------
+        None
+
+        Notes
+        -----
+        - The co-ordinate system numbers are stored in self.local_systems, keyed by the ORxyz, XAxyz and YAxyz
+          points, and referenced by the esys field of the element blocks.
+
+        """
+
+        properties = self.structure.element_properties
+        sections = self.structure.sections
+
+        self.local_systems = {}
+
+        for key in sorted(properties):
+            section = sections[properties[key].section]
+            if section.__name__ == 'ShellSection':
+                axes = self._local_axes(section)
+                if axes not in self.local_systems:
+                    self.local_systems[axes] = 11 + len(self.local_systems)
+
+        if not self.local_systems:
+            return
+
+        self.write_subsection('Local coordinate systems')
+
+        for axes, No_loc_system in sorted(self.local_systems.items(), key=lambda item: item[1]):
+            ORxyz, XAxyz, YAxyz = axes
+            self.write_line('k,1,{0},{1},{2}'.format(ORxyz[0],ORxyz[1],ORxyz[2]))   #set kp origin          
+            self.write_line('k,2,{0},{1},{2}'.format(XAxyz[0],XAxyz[1],XAxyz[2]))   #set kp in x direction
+            self.write_line('k,3,{0},{1},{2}'.format(YAxyz[0],YAxyz[1],YAxyz[2]))   #set kp in y direction                    
+            self.write_line('cskp,{0},0,1,2,3'.format(No_loc_system)) # Set and actiave local coordiante system                   
+
+        self.write_line('kdele,1,3,1') 
+        self.write_line('csys,0') # set to the orignal coordiante system                   
+        self.blank_line()
+        self.blank_line()
+
+    def _local_axes(self, section):
+
+        ORxyz = section.loc_coords_OR.get('ORxyz', None)
+        XAxyz = section.loc_coords_XA.get('XAxyz', None)
+        YAxyz = section.loc_coords_YA.get('YAxyz', None)
+
+        return tuple(ORxyz), tuple(XAxyz), tuple(YAxyz)
+
+    def write_element_block(self, selection, index, mat=None, sec=None, esys=0, min_nodes=0, chunk=50000):
+        """Writes the elements of one element property as a single EBLOCK.
+
+        Parameters
+        ----------
+        selection : list
+            Element keys of the element property.
+        index : int
+            Ansys number of the element type of the elements.
+        mat : int
+            Ansys material number, None for the default 1.
+        sec : int
+            Ansys section number, None for the default 1.
+        esys : int
+            Element co-ordinate system number, 0 for the global system.
+        min_nodes : int
+            Pad the node list to this length by repeating the last node, e.g. 4 for triangular shell181 elements.
+        chunk : int
+            Number of element rows formatted at once.
+
+        Returns
+        -------
+        None
+
+        Notes
+        -----
+        - Each row holds mat, type, real, secnum, esys, birth/death, solid ref, shape, node count, -, element number
+          and up to 8 nodes, further nodes continue on lines of up to 19 fields.
+
+        """
+
+        offsets = self.structure.elements.offsets
+        connectivity = self.structure.elements.connectivity
+
+        self.write_line('eblock,19,solid,,{0}'.format(len(selection)))
+        self.write_line('(19i9)')
+
+        for start in range(0, len(selection), chunk):
+
+            rows = []
+
+            for select in selection[start:start + chunk]:
+
+                nodes = [i + 1 for i in connectivity[offsets[select]:offsets[select + 1]]]
+                nodes.extend([nodes[-1]] * (min_nodes - len(nodes)))
+                fields = [mat or 1, index, 1, sec or 1, esys, 0, 0, 0, len(nodes), 0, select + 1] + nodes
+
+                rows.append(('%9d' * len(fields[:19])) % tuple(fields[:19]))
+                for j in range(19, len(fields), 19):
+                    rows.append(('%9d' * len(fields[j:j + 19])) % tuple(fields[j:j + 19]))
+
+            self.write_line('\n'.join(rows))
+
+        self.write_line('%9d' % -1)
@@ -13,6 +13,8 @@ __all__ = [
 MPa = 10**(-6)
 GPa = 10**(-9)
 
+_shell_materials = ['ElasticIsotropic', 'CMMUsermat']
+
 
 class Materials(object):
 
@@ -24,211 +26,49 @@ class Materials(object):
         self.write_section('Materials')
         self.blank_line()
         
-        materials = self.structure.materials
-        element_set = self.structure.sets
         properties = self.structure.element_properties
-        sections = self.structure.sections
         elsets=self.structure.sets
 
+        numbers = self.material_numbers()
+        written_materials = set()
+        written_sections = set()
 
-        count_mat=0 # Dies wird nur fur die Bestimmung der Materialnummer verwendet in Ansys (daher auch start bei 0 (ansys) und nicht bei -1 (python)). count_mat wird NICHT fur das Auslesen von Materaildaten verwenden, da sonst Probleme mit der sortierung auftreten
         for key_prop in sorted(properties):
-            
-            count_mat=count_mat+1
-            
-            # Bestimmung des materialtypes (mtype)
+
             property = properties[key_prop]
-            material = materials[property.material]            
+            material = self.structure.materials[property.material]
             mtype = material.__name__
-
-            # Bestimmung der Geometrie
-            section = sections[property.section]
-            geometry = section.geometry
-       
+            mat, sec = numbers[key_prop]
 
             # Bestimmung der element set 
             elset=elsets[property.elset]
             ele_set=elset.name
-            
-            # ------------------------------------------------------------------------------------------------------
-            # Material and element properties einlesen
-            # ------------------------------------------------------------------------------------------------------                        
-            if mtype == 'ElasticIsotropic':  
-                E = material.E['E']
-                v = material.v['v']
-                p = material.p   
-                t=geometry.get('t', None)  
-                nn=section.nr_layers 
-                G=E/(2*(1+v))
-                E111=5/6*G*t    
-                E221=5/6*G*t                     
-                E121=0                
-                delta_h=t/nn
-                
-                self.write_subsection(material.name)      
-
-            elif mtype == 'MPCStiff':                  
-                self.blank_line()
-                self.write_line('!No Material properties for MPCs are needed') 
-                self.blank_line()   
-
-            elif mtype == 'CMMUsermat':  
-                R_Rohr = material.R_Rohr['R_Rohr']
-                rho = material.rho['rho']
-                oo = material.oo['oo']
-                uu = material.uu['uu']
-                
-                beton = material.beton['beton']
-                fcc = material.fcc['fcc']                
-                vc = material.vc['vc']
-                ecu = material.ecu['ecu']
-                k_E = material.k_E['k_E']
-                theta_b0 = material.theta_b0['theta_b0']
-                theta_b1 = material.theta_b1['theta_b1']
-                k_riss = material.k_riss['k_riss']
-                Entfestigung = material.Entfestigung['Entfestigung']
-                lambdaTS = material.lambdaTS['lambdaTS']
-                srmx = material.srmx['srmx']
-                srmy = material.srmy['srmy']
-                Begrenzung = material.Begrenzung['Begrenzung']
-                KritQ = material.KritQ['KritQ']
-                winkelD = material.winkelD['winkelD']
-                k_vr = material.k_vr['k_vr']
-                fswy = material.fswy['fswy']
-
-
-                stahl1 = material.stahl1['stahl1']
-                zm1 = material.zm1['zm1']
-                fsy1 = material.fsy1['fsy1']
-                fsu1 = material.fsu1['fsu1']
-                esu1 = material.esu1['esu1']
-                esv1 = material.esv1['esv1']
-                Es1 = material.Es1['Es1']
-                ka1 = material.ka1['ka1']
-                kb1 = material.kb1['kb1']
-                kc1 = material.kc1['kc1']
-                as1 = material.as1['as1']
-                dm1 = material.dm1['dm1']
-                psi1 = material.psi1['psi1']
-
-                stahl2 = material.stahl2['stahl2']
-                zm2 = material.zm2['zm2']
-                fsy2 = material.fsy2['fsy2']
-                fsu2 = material.fsu2['fsu2']
-                esu2 = material.esu2['esu2']
-                esv2 = material.esv2['esv2']
-                Es2 = material.Es2['Es2']
-                ka2 = material.ka2['ka2']
-                kb2 = material.kb2['kb2']
-                kc2 = material.kc2['kc2']
-                as2 = material.as2['as2']
-                dm2 = material.dm2['dm2']
-                psi2 = material.psi2['psi2']
-
-                stahl3 = material.stahl3['stahl3']
-                zm3 = material.zm3['zm3']
-                fsy3 = material.fsy3['fsy3']
-                fsu3 = material.fsu3['fsu3']
-                esu3 = material.esu3['esu3']
-                esv3 = material.esv3['esv3']
-                Es3 = material.Es3['Es3']
-                ka3 = material.ka3['ka3']
-                kb3 = material.kb3['kb3']
-                kc3 = material.kc3['kc3']
-                as3 = material.as3['as3']
-                dm3 = material.dm3['dm3']
-                psi3 = material.psi3['psi3']
-
-                stahl4 = material.stahl4['stahl4']
-                zm4 = material.zm4['zm4']
-                fsy4 = material.fsy4['fsy4']
-                fsu4 = material.fsu4['fsu4']
-                esu4 = material.esu4['esu4']
-                esv4 = material.esv4['esv4']
-                Es4 = material.Es4['Es4']
-                ka4 = material.ka4['ka4']
-                kb4 = material.kb4['kb4']
-                kc4 = material.kc4['kc4']
-                as4 = material.as4['as4']
-                dm4 = material.dm4['dm4']
-                psi4 = material.psi4['psi4']
-
-                Dimens=2  # Shell181
-                Modell=1 #Cracked Membrane model!                                                
-
-
-                # Berechnete werte
-                Ec = k_E*fcc**(1/3)
-                E =Ec              
-                v = vc                
-                
-                t=geometry.get('t', None)  
-                nr_layer=section.nr_layers   
-                nn=nr_layer.get('nn', None)
-                h=t
-                G=E/(2*(1+v))
-                E111=5/6*G*t    
-                E221=5/6*G*t                     
-                E121=0
-                
-                delta_h=t/nn
-
-                
-                self.write_subsection(material.name)       
-            
 
             # ------------------------------------------------------------------------------------------------------
             # material properties schreiben
             # ------------------------------------------------------------------------------------------------------
-            
-            if mtype == 'ElasticIsotropic':                
-                self.blank_line()
-                self.write_line('mp,ex,{0},{1}'.format(count_mat, E))
-                self.write_line('mp,ey,{0},{1}'.format(count_mat, E))
-                self.write_line('mp,prxy,{0},{1}'.format(count_mat, v))
-                self.write_line('mp,dens,{0},{1}'.format(count_mat, p))
-                self.blank_line()
-
-                self.write_line('allsel')  
-                self.write_line('cmsel,s, {0}, elem'.format(ele_set))  
-                self.write_line('mpchg,{0},all'.format(count_mat))
 
-            elif mtype == 'MPCStiff':
+            if mtype == 'MPCStiff':
+                self.blank_line()
+                self.write_line('!No Material properties for MPCs are needed') 
+                self.blank_line()   
                 self.blank_line()
                 self.write_line('!No Element properties for MPCs are needed') 
                 self.blank_line()    
 
-            elif mtype == 'CMMUsermat':
+            elif mat is not None:
 
-                self.blank_line()
-                self.write_line('tb,user,{0},1,76'.format(count_mat))
-                self.write_line('tbtemp,0')
-                self.write_line('tbdata,1,{0},{1}'.format(Dimens, Modell))
-                self.write_line('tbdata,3,{0},{1},{2},{3}'.format(nn, h, oo, uu))
-                self.write_line('tbdata,7,{0},{1},{2},{3},{4}'.format(stahl4, zm4, as4, dm4, psi4))
-                self.write_line('tbdata,12,{0},{1},{2},{3},{4}'.format(fsy4, fsu4, esu4, esv4, Es4))
-                self.write_line('tbdata,17,{0},{1},{2}'.format(ka4, kb4, kc4))
-                self.write_line('tbdata,20,{0},{1},{2},{3},{4}'.format(stahl3, zm3, as3, dm3, psi3))
-                self.write_line('tbdata,25,{0},{1},{2},{3},{4}'.format(fsy3, fsu3, esu3, esv3, Es3))
-                self.write_line('tbdata,30,{0},{1},{2}'.format(ka3, kb3, kc3))
-                self.write_line('tbdata,33,{0},{1},{2},{3},{4}'.format(stahl2, zm2, as2, dm2, psi2))
-                self.write_line('tbdata,38,{0},{1},{2},{3},{4}'.format(fsy2, fsu2, esu2, esv2, Es2))
-                self.write_line('tbdata,43,{0},{1},{2}'.format(ka2, kb2, kc2))
-                self.write_line('tbdata,46,{0},{1},{2},{3},{4}'.format(stahl1, zm1, as1, dm1, psi1))
-                self.write_line('tbdata,51,{0},{1},{2},{3},{4}'.format(fsy1, fsu1, esu1, esv1, Es1))
-                self.write_line('tbdata,56,{0},{1},{2}'.format(ka1, kb1, kc1))                            
-                self.write_line('tbdata,59,{0},{1},{2},{3}'.format(beton, fcc, vc, ecu))            
-                self.write_line('tbdata,63,{0},{1},{2},{3}'.format(k_E, theta_b0, theta_b1, k_riss))  
-                self.write_line('tbdata,67,{0},{1},{2},{3},{4}'.format(lambdaTS, srmx, srmy, Begrenzung, Entfestigung))  
-                self.write_line('tbdata,72,{0},{1},{2},{3}'.format(winkelD, KritQ, k_vr, fswy)) 
-                self.write_line('tbdata,76,{0}'.format(R_Rohr)) 
-                self.write_line('tb,state,{0},,72'.format(count_mat))
-                self.write_line('mp,dens,{0},{1}'.format(count_mat, rho))
-                self.blank_line()
+                if mat not in written_materials:
+                    written_materials.add(mat)
+                    self.write_subsection(material.name)      
+                    self.blank_line()
+                    for line in self._material_lines(property, mat):
+                        self.write_line(line)
+                    self.blank_line()
 
                 self.write_line('allsel')  
                 self.write_line('cmsel,s, {0}, elem'.format(ele_set))  
-                self.write_line('mpchg,{0},all'.format(count_mat))                   
+                self.write_line('mpchg,{0},all'.format(mat))                   
 
             # ------------------------------------------------------------------------------------------------------
             # element properties schreiben
@@ -236,60 +76,225 @@ class Materials(object):
 
             self.blank_line()
 
-            # Shell
-            # -------
-            
-
-            if mtype in ['ElasticIsotropic', 'ElasticPlastic', 'Steel', 'Concrete', 'Stiff',
-                         'ConcreteSmearedCrack', 'ConcreteDamagedPlasticity', 'CMMUsermat']:
+            if sec is not None and sec not in written_sections:
+                written_sections.add(sec)
+                for line in self._section_lines(property, sec, mat):
+                    self.write_line(line)
 
+            self.blank_line()
 
-                self.write_line('sectype,{0} , shell'.format(count_mat))
-                self.write_line('seccontrols,{0},{1},{2},,1,1,1'.format(E111, E221, E121))
-                self.blank_line()
-                self.write_line('*do,j,1,{0}'.format(nn))
-                self.write_line('secdata,{0},{1},0,,,j'.format(delta_h,count_mat))
-                self.write_line('secoffset,{}'.format(section.offset['mode']))
-                self.write_line('*enddo')       
+        self.blank_line()
+        self.blank_line()
 
-            # MPC
-            # -------
+    def material_numbers(self):
+        """Returns the Ansys material and section number of every element property.
 
-            if mtype in ['MPCStiff']:
+        Returns
+        -------
+        dict
+            (material, section) numbers keyed by element property, None where no definition is written.
 
-                self.write_line('! No Element properties for MPCs are needed') 
+        Notes
+        -----
+        - Raises NotImplementedError for materials other than ElasticIsotropic, CMMUsermat and MPCStiff.
+        - Materials and sections are numbered once per unique definition, identified by their written content,
+          so element properties sharing a definition share its number.
 
-            # Compression
-            # -----------
+        """
 
-            if mtype in ['ElasticPlastic', 'Steel', 'Concrete', 'ConcreteSmearedCrack',
-                         'ConcreteDamagedPlasticity']:
+        if getattr(self, '_material_numbers', None) is not None:
+            return self._material_numbers
 
-                raise NotImplementedError
+        properties = self.structure.element_properties
+        materials = {}
+        sections = {}
+        numbers = {}
 
-            # Tension
-            # -------
+        for key in sorted(properties):
 
-            if mtype in ['Concrete', 'ConcreteSmearedCrack']:
+            property = properties[key]
+            mtype = self.structure.materials[property.material].__name__
+            mat = sec = None
 
-                raise NotImplementedError
+            if mtype in _shell_materials:
 
-            elif mtype == 'ConcreteDamagedPlasticity':
+                content = tuple(self._material_lines(property, 0))
+                mat = materials.setdefault(content, len(materials) + 1)
 
-                raise NotImplementedError
-            
+                content = tuple(self._section_lines(property, 0, mat))
+                sec = sections.setdefault(content, len(sections) + 1)
 
-            self.blank_line()
+            elif mtype != 'MPCStiff':
 
-        self.blank_line()
-        self.blank_line()
+                raise NotImplementedError
 
+            numbers[key] = (mat, sec)
 
+        self._material_numbers = numbers
 
+        return numbers
 
+    def _material_lines(self, property, number):
 
+        material = self.structure.materials[property.material]
+        section = self.structure.sections[property.section]
+        mtype = material.__name__
+        lines = []
 
+        if mtype == 'ElasticIsotropic':  
 
+            E = material.E['E']
+            v = material.v['v']
+            p = material.p   
 
+            lines.append('mp,ex,{0},{1}'.format(number, E))
+            lines.append('mp,ey,{0},{1}'.format(number, E))
+            lines.append('mp,prxy,{0},{1}'.format(number, v))
+            lines.append('mp,dens,{0},{1}'.format(number, p))
 
+        elif mtype == 'CMMUsermat':  
 
+            R_Rohr = material.R_Rohr['R_Rohr']
+            rho = material.rho['rho']
+            oo = material.oo['oo']
+            uu = material.uu['uu']
+                
+            beton = material.beton['beton']
+            fcc = material.fcc['fcc']                
+            vc = material.vc['vc']
+            ecu = material.ecu['ecu']
+            k_E = material.k_E['k_E']
+            theta_b0 = material.theta_b0['theta_b0']
+            theta_b1 = material.theta_b1['theta_b1']
+            k_riss = material.k_riss['k_riss']
+            Entfestigung = material.Entfestigung['Entfestigung']
+            lambdaTS = material.lambdaTS['lambdaTS']
+            srmx = material.srmx['srmx']
+            srmy = material.srmy['srmy']
+            Begrenzung = material.Begrenzung['Begrenzung']
+            KritQ = material.KritQ['KritQ']
+            winkelD = material.winkelD['winkelD']
+            k_vr = material.k_vr['k_vr']
+            fswy = material.fswy['fswy']
+
+
+            stahl1 = material.stahl1['stahl1']
+            zm1 = material.zm1['zm1']
+            fsy1 = material.fsy1['fsy1']
+            fsu1 = material.fsu1['fsu1']
+            esu1 = material.esu1['esu1']
+            esv1 = material.esv1['esv1']
+            Es1 = material.Es1['Es1']
+            ka1 = material.ka1['ka1']
+            kb1 = material.kb1['kb1']
+            kc1 = material.kc1['kc1']
+            as1 = material.as1['as1']
+            dm1 = material.dm1['dm1']
+            psi1 = material.psi1['psi1']
+
+            stahl2 = material.stahl2['stahl2']
+            zm2 = material.zm2['zm2']
+            fsy2 = material.fsy2['fsy2']
+            fsu2 = material.fsu2['fsu2']
+            esu2 = material.esu2['esu2']
+            esv2 = material.esv2['esv2']
+            Es2 = material.Es2['Es2']
+            ka2 = material.ka2['ka2']
+            kb2 = material.kb2['kb2']
+            kc2 = material.kc2['kc2']
+            as2 = material.as2['as2']
+            dm2 = material.dm2['dm2']
+            psi2 = material.psi2['psi2']
+
+            stahl3 = material.stahl3['stahl3']
+            zm3 = material.zm3['zm3']
+            fsy3 = material.fsy3['fsy3']
+            fsu3 = material.fsu3['fsu3']
+            esu3 = material.esu3['esu3']
+            esv3 = material.esv3['esv3']
+            Es3 = material.Es3['Es3']
+            ka3 = material.ka3['ka3']
+            kb3 = material.kb3['kb3']
+            kc3 = material.kc3['kc3']
+            as3 = material.as3['as3']
+            dm3 = material.dm3['dm3']
+            psi3 = material.psi3['psi3']
+
+            stahl4 = material.stahl4['stahl4']
+            zm4 = material.zm4['zm4']
+            fsy4 = material.fsy4['fsy4']
+            fsu4 = material.fsu4['fsu4']
+            esu4 = material.esu4['esu4']
+            esv4 = material.esv4['esv4']
+            Es4 = material.Es4['Es4']
+            ka4 = material.ka4['ka4']
+            kb4 = material.kb4['kb4']
+            kc4 = material.kc4['kc4']
+            as4 = material.as4['as4']
+            dm4 = material.dm4['dm4']
+            psi4 = material.psi4['psi4']
+
+            Dimens=2  # Shell181
+            Modell=1 #Cracked Membrane model!                                                
+
+            h = section.geometry.get('t', None)  
+            nn = section.nr_layers.get('nn', None)
+
+            lines.append('tb,user,{0},1,76'.format(number))
+            lines.append('tbtemp,0')
+            lines.append('tbdata,1,{0},{1}'.format(Dimens, Modell))
+            lines.append('tbdata,3,{0},{1},{2},{3}'.format(nn, h, oo, uu))
+            lines.append('tbdata,7,{0},{1},{2},{3},{4}'.format(stahl4, zm4, as4, dm4, psi4))
+            lines.append('tbdata,12,{0},{1},{2},{3},{4}'.format(fsy4, fsu4, esu4, esv4, Es4))
+            lines.append('tbdata,17,{0},{1},{2}'.format(ka4, kb4, kc4))
+            lines.append('tbdata,20,{0},{1},{2},{3},{4}'.format(stahl3, zm3, as3, dm3, psi3))
+            lines.append('tbdata,25,{0},{1},{2},{3},{4}'.format(fsy3, fsu3, esu3, esv3, Es3))
+            lines.append('tbdata,30,{0},{1},{2}'.format(ka3, kb3, kc3))
+            lines.append('tbdata,33,{0},{1},{2},{3},{4}'.format(stahl2, zm2, as2, dm2, psi2))
+            lines.append('tbdata,38,{0},{1},{2},{3},{4}'.format(fsy2, fsu2, esu2, esv2, Es2))
+            lines.append('tbdata,43,{0},{1},{2}'.format(ka2, kb2, kc2))
+            lines.append('tbdata,46,{0},{1},{2},{3},{4}'.format(stahl1, zm1, as1, dm1, psi1))
+            lines.append('tbdata,51,{0},{1},{2},{3},{4}'.format(fsy1, fsu1, esu1, esv1, Es1))
+            lines.append('tbdata,56,{0},{1},{2}'.format(ka1, kb1, kc1))                            
+            lines.append('tbdata,59,{0},{1},{2},{3}'.format(beton, fcc, vc, ecu))            
+            lines.append('tbdata,63,{0},{1},{2},{3}'.format(k_E, theta_b0, theta_b1, k_riss))  
+            lines.append('tbdata,67,{0},{1},{2},{3},{4}'.format(lambdaTS, srmx, srmy, Begrenzung, Entfestigung))  
+            lines.append('tbdata,72,{0},{1},{2},{3}'.format(winkelD, KritQ, k_vr, fswy)) 
+            lines.append('tbdata,76,{0}'.format(R_Rohr)) 
+            lines.append('tb,state,{0},,72'.format(number))
+            lines.append('mp,dens,{0},{1}'.format(number, rho))
+
+        return lines
+
+    def _section_lines(self, property, number, mat):
+
+        material = self.structure.materials[property.material]
+        section = self.structure.sections[property.section]
+        mtype = material.__name__
+
+        # Berechnete werte
+        if mtype == 'CMMUsermat':
+            E = material.k_E['k_E']*material.fcc['fcc']**(1/3)
+            v = material.vc['vc']
+        else:
+            E = material.E['E']
+            v = material.v['v']
+
+        t = section.geometry.get('t', None)  
+        nn = section.nr_layers.get('nn', None)
+        G=E/(2*(1+v))
+        E111=5/6*G*t    
+        E221=5/6*G*t                     
+        E121=0
+        delta_h=t/nn
+
+        lines = []
+        lines.append('sectype,{0} , shell'.format(number))
+        lines.append('seccontrols,{0},{1},{2},,1,1,1'.format(E111, E221, E121))
+        lines.append(self.comment)
+        lines.append('*do,j,1,{0}'.format(nn))
+        lines.append('secdata,{0},{1},0,,,j'.format(delta_h,mat))
+        lines.append('secoffset,{}'.format(section.offset['mode']))
+        lines.append('*enddo')       
+
+        return lines
@@ -4,6 +4,10 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 __all__ = [
@@ -20,23 +24,64 @@ class Nodes(object):
 
         header = {'ansys_sel':   '!'}
 
-        self.prefix = {'ansys_sel':   ''}
-
         self.write_section('Nodes')
         self.write_line(header[self.software])
 
-        for key in sorted(self.structure.nodes, key=int):
+        n = len(self.structure.nodes)
 
-            self.write_node(key)
+        if n:
+            self.write_node_block()
 
         self.blank_line()
         self.blank_line()
 
-    def write_node(self, key):
+    def write_node_block(self, chunk=50000):
+        """Writes all nodes as one fixed format NBLOCK.
+
+        Parameters
+        ----------
+        chunk : int
+            Number of node rows formatted at once.
+
+        Returns
+        -------
+        None
+
+        Notes
+        -----
+        - Co-ordinates are rounded to 3 decimals, or written with 17 significant digits if self.full_precision.
+        - Rows are formatted with one % per row, which is faster than np.savetxt or a single % over the chunk.
+
+        """
+
+        xyz = self.structure.nodes.xyz
+        n = len(xyz) // 3
+
+        if self.full_precision:
+            fmt, block = '%9d%24.16E%24.16E%24.16E', '(1i9,3e24.16)'
+            coordinates = xyz.tolist()
+        else:
+            fmt, block = '%9d%21.13E%21.13E%21.13E', '(1i9,3e21.13)'
+            if np is not None:
+                coordinates = np.round(self.structure.nodes.as_array(), 3).ravel().tolist()
+            else:
+                coordinates = [round(i, 3) for i in xyz]
+
+        self.write_line('nblock,3,,{0}'.format(n))
+        self.write_line(block)
+
+        for start in range(0, n, chunk):
+            stop = min(n, start + chunk)
+            values = coordinates[3 * start:3 * stop]
+            rows = zip(range(start + 1, stop + 1), values[0::3], values[1::3], values[2::3])
+            self.write_line('\n'.join([fmt % row for row in rows]))
+
+        self.write_line('%9d' % -1)
+
+    def write_node(self, key, xyz=None):
 
-        prefix = self.prefix[self.software]
         spacer = self.spacer[self.software]
-        x, y, z = self.structure.node_xyz(key)
+        x, y, z = xyz if xyz is not None else self.structure.node_xyz(key)
 
         line_1 = '{0}{1}{2}{3:.3f}{2}{4:.3f}{2}{5:.3f}'.format('n,', key + 1, spacer, x, y, z)
         self.write_line(line_1)
@@ -17,16 +17,419 @@ __all__ = [
 dofs = ['x', 'y', 'z', 'xx', 'yy', 'zz']
 
 
+def gp_columns(fields, step=True):
+    """Returns the columns of a GP results file for the requested fields.
+
+    Parameters
+    ----------
+    fields : list
+        Data field requests.
+    step : bool
+        Columns of the results of a step, or of the step invariant GP co-ordinates.
+
+    Returns
+    -------
+    list
+        Column names in file order, the node number followed by the state variables, empty if no GP field is
+        requested.
+
+    """
+
+    stresses = 's' in fields or 'all' in fields
+    strains = 'eps' in fields or 'all' in fields
+    steel = 'sig_sr' in fields or 'all' in fields
+
+    if not (stresses or strains or steel):
+        return []
+
+    columns = ['node']
+
+    for layer in ['top', 'bot']:
+        if not step and (stresses or strains):
+            columns += ['coor_intp_layer_{0}_{1}'.format(i, layer) for i in 'xyz']
+        if step and stresses:
+            columns += ['sig_x_' + layer, 'sig_y_' + layer, 'tau_xy_' + layer, 'fcc_eff_' + layer]
+        if step and strains:
+            columns += ['eps_1_' + layer, 'eps_3_' + layer]
+
+    if steel:
+        for layer in ['1L', '2L', '3L', '4L']:
+            if step:
+                columns += ['sig_sr_{0}_x'.format(layer), 'sig_sr_{0}_y'.format(layer)]
+            else:
+                columns += ['coor_{0}_sig_sr_{1}'.format(i, layer) for i in 'xyz']
+
+    return columns
+
+
+def results_region(structure, sets):
+    """Returns the nodes and elements the results are exported for.
+
+    Parameters
+    ----------
+    structure : obj
+        Structure object.
+    sets : list, str
+        Names of node and element sets, None for the whole structure.
+
+    Returns
+    -------
+    list
+        Node keys, None for all nodes.
+    list
+        Element keys, None for all elements.
+
+    Notes
+    -----
+    - Element sets add their elements and the nodes of these, node sets add their nodes only.
+
+    """
+
+    if not sets:
+        return None, None
+
+    if isinstance(sets, str):
+        sets = [sets]
+
+    nodes = set()
+    elements = set()
+
+    for name in sets:
+        selection = structure.sets[name].selection
+        if structure.sets[name].type == 'node':
+            nodes.update(selection)
+        else:
+            elements.update(selection)
+            for element in selection:
+                nodes.update(structure.elements.get_nodes(element))
+
+    return sorted(nodes), sorted(elements)
+
+
+def gp_groups(structure, elements=None):
+    """Returns the shell elements in groups whose state variables are read at once.
+
+    Parameters
+    ----------
+    structure : obj
+        Structure object.
+    elements : list
+        Element keys to restrict the groups to, None for all elements.
+
+    Returns
+    -------
+    list
+        (number of layers, element keys, node keys) of every group, keys in ascending order.
+
+    Notes
+    -----
+    - The elements of a group share their element property and no node, so the nodal state variables of the
+      selected group are the values of the single element at each node, as for one selected element.
+
+    """
+
+    properties = structure.element_properties
+    sections = structure.sections
+    sets = structure.sets
+    region = set(elements) if elements is not None else None
+    elements = structure.elements
+    groups = []
+
+    for key in sorted(properties):
+        property = properties[key]
+        section = sections[property.section]
+
+        if section.__name__ != 'ShellSection':
+            continue
+
+        selection = property.elements if property.elements else sets[property.elset].selection
+        if region is not None:
+            selection = [element for element in selection if element in region]
+        colours = {}
+        members = []
+
+        for element in sorted(selection):
+            nodes = elements.get_nodes(element)
+            used = set()
+            for node in nodes:
+                used.update(colours.get(node, ()))
+
+            colour = 0
+            while colour in used:
+                colour += 1
+
+            for node in nodes:
+                colours.setdefault(node, set()).add(colour)
+            if colour == len(members):
+                members.append([])
+            members[colour].append(element)
+
+        for group in members:
+            nodes = sorted(set([node for element in group for node in elements.get_nodes(element)]))
+            groups.append((section.nr_layers['nn'], group, nodes))
+
+    return groups
+
+
 class Results(object):
 
     def __init__(self):
         pass
 
-    def write_results(self,structure,fields, lstep, sbstep):
-        
-        sections = self.structure.sections
+    def write_element_infos(self, out_path):
+        """Writes the element type, number and local axes of every element to elem_infos.txt.
+
+        Parameters
+        ----------
+        out_path : str
+            Output folder of the analysis.
+
+        Returns
+        -------
+        int
+            Number of rows, one per element number.
+
+        Notes
+        -----
+        - Columns are the element type (shell=1, mpc and other=0), element number, local x-axis and local y-axis
+          in global co-ordinates, rows of unused element numbers are 0.
+        - The fixed (8E24.16) format is read by MAPDL with *VREAD and by extract_data.
+
+        """
+
         properties = self.structure.element_properties
+        sections = self.structure.sections
+        sets = self.structure.sets
+
+        rows = len(self.structure.elements.offsets) - 1
+        infos = [None] * rows
+
+        for key in sorted(properties):
+            property = properties[key]
+            section = sections[property.section]
+            selection = property.elements if property.elements else sets[property.elset].selection
+
+            if section.__name__ == 'ShellSection':
+                e_x = section.loc_coords_EV_XA.get('EV_XA', None)
+                e_y = section.loc_coords_EV_YA.get('EV_YA', None)
+                axes = [e_x[0], e_x[1], e_x[2], e_y[0], e_y[1], e_y[2]]
+                stype_number = 1
+            else:
+                axes = [0] * 6
+                stype_number = 0
 
+            for ele_num in selection:
+                infos[ele_num] = [stype_number, ele_num + 1] + axes
+
+        empty = [0] * 8
+        fmt = '%24.16E' * 8
+
+        with open(os.path.join(out_path, 'elem_infos.txt'), 'w') as f:
+            for start in range(0, rows, 50000):
+                f.write(''.join([fmt % tuple(row or empty) + '\n' for row in infos[start:start + 50000]]))
+
+        return rows
+
+    def write_gp_groups(self, groups):
+        """Defines an element component per group of gp_groups, leaving the last group selected.
+
+        Parameters
+        ----------
+        groups : list
+            Groups of gp_groups(structure).
+
+        Returns
+        -------
+        None
+
+        """
+
+        for i, (layers, elements, nodes) in enumerate(groups, 1):
+            self.write_line('esel,none')
+            self.write_ranges('esel,a,elem,,', elements)
+            self.write_line('cm,gp_{0},elem'.format(i))
+
+    def write_gp_results(self, fname, columns, out_path, groups):
+        """Writes the state variables at the GPs of all shell elements with array operations.
+
+        Parameters
+        ----------
+        fname : str
+            Name of the output file, e.g. '<step>_gp_results'.
+        columns : list
+            Columns of gp_columns(fields) to write.
+        out_path : str
+            Output folder of the analysis.
+        groups : list
+            Groups of gp_groups(structure), defined as components by write_gp_groups.
+
+        Returns
+        -------
+        None
+
+        Notes
+        -----
+        - The state variables of each group and layer are read for all nodes with *VGET, the used material model is
+          distinguished with *VMASK.
+        - One row per group and node with the given columns is written to fname.txt with *MWRITE in the fixed
+          (nE24.16) format, extract_data assigns the rows to the GPs of the elements.
+
+        """
+
+        col = dict((name, i) for i, name in enumerate(columns, 1))
+        rows = sum([len(nodes) for layers, elements, nodes in groups])
+
+        def vget(column, item):
+            self.write_line('*VGET,gp_nodal(1,{0}),NODE,1,SVAR,{1}'.format(col[column], item))
+
+        def vsum(column, items):
+            vget(column, items[0])
+            for item in items[1:]:
+                self.write_line('*VGET,gp_tmp(1),NODE,1,SVAR,{0}'.format(item))
+                self.write_line('*VOPER,gp_nodal(1,{0}),gp_nodal(1,{0}),ADD,gp_tmp(1)'.format(col[column]))
+
+        self.blank_line()
+        self.write_line('! Write results at the GPs of Shell Elements')
+        self.blank_line()
+
+        self.write_line('allsel')
+        self.write_line('*get,nnode,node,,num,max')
+        for name in ['gp_mask', 'gp_model', 'gp_tmp', 'gp_nodal', 'gp_res']:
+            self.write_line('*DEL,{0},,NOPR'.format(name))
+        self.write_line('*DIM,gp_mask,ARRAY,nnode')
+        self.write_line('*DIM,gp_model,ARRAY,nnode')
+        self.write_line('*DIM,gp_tmp,ARRAY,nnode')
+        self.write_line('*DIM,gp_nodal,ARRAY,nnode,{0}'.format(len(columns))) # Zeile = Knotennummer
+        self.write_line('*DIM,gp_res,ARRAY,{0},{1}'.format(rows, len(columns))) # Zeile = Gruppe und Knoten
+        self.write_line('*vfill,gp_nodal(1,1),ramp,1,1')
+
+        row = 1
+
+        for i, (layers, elements, nodes) in enumerate(groups, 1):
+
+            self.write_line('cmsel,s,gp_{0},elem'.format(i))
+            self.write_line('nsle,s')
+            self.write_line('*vget,gp_mask(1),node,1,nsel')
+
+            # Top Layer (nn) and Bot Layer (1)
+            for layer, number in [('top', layers), ('bot', 1)]:
+
+                if not [name for name in col if name.endswith('_' + layer)]:
+                    continue
+
+                self.write_line('LAYER,{0}'.format(number))
+                if 'coor_intp_layer_x_' + layer in col:
+                    for item, axis in enumerate('xyz', 63):
+                        vget('coor_intp_layer_{0}_{1}'.format(axis, layer), item)
+
+                if 'sig_x_' + layer in col:
+                    vget('sig_x_' + layer, 66)
+                    vget('sig_y_' + layer, 67)
+                    vget('tau_xy_' + layer, 68)
+                    self.write_line('*VGET,gp_model(1),NODE,1,SVAR,1')
+                    self.write_line('*VFILL,gp_nodal(1,{0}),RAMP,0,0'.format(col['fcc_eff_' + layer])) # linear elastisch und Zug Zug
+                    for model, item in [(1, 12), (2, 33), (4, 19)]:
+                        self.write_line('*VOPER,gp_tmp(1),gp_model(1),EQ,{0}'.format(model))
+                        self.write_line('*VMASK,gp_tmp(1)')
+                        vget('fcc_eff_' + layer, item)
+
+                if 'eps_1_' + layer in col:
+                    vget('eps_1_' + layer, 5)
+                    vget('eps_3_' + layer, 6)
+
+            # Reinforcement Layer 1-4, x- and y direction, the layer numbers are the same in the whole group
+            if 'sig_sr_1L_x' in col or 'coor_x_sig_sr_1L' in col:
+                for item, layer in enumerate(['1L', '2L', '3L', '4L'], 58):
+                    self.write_line('*GET,layer_nr_{0},NODE,{1},SVAR,{2}'.format(layer, nodes[0] + 1, item))
+
+                for layer in ['1L', '2L', '3L', '4L']:
+                    self.write_line('LAYER,layer_nr_' + layer)
+                    if 'sig_sr_1L_x' in col:
+                        vsum('sig_sr_{0}_x'.format(layer), [13, 20, 34, 40])
+                        vsum('sig_sr_{0}_y'.format(layer), [14, 21, 35, 41])
+                    if 'coor_x_sig_sr_1L' in col:
+                        for item, axis in enumerate('xyz', 63):
+                            vget('coor_{0}_sig_sr_{1}'.format(axis, layer), item)
+
+            # Nur Knoten der Gruppe, aufsteigend
+            for j in range(1, len(columns) + 1):
+                self.write_line('*VMASK,gp_mask(1)')
+                self.write_line('*VFUN,gp_res({0},{1}),COMP,gp_nodal(1,{1})'.format(row, j))
+
+            row += len(nodes)
+
+        self.write_line('allsel')
+        self.write_line('*MWRITE,gp_res(1,1),' + out_path + '/' + fname + ',txt,,JIK,{0},{1}'.format(len(columns), rows))
+        self.write_line('({0}E24.16)'.format(len(columns)))
+        self.write_line('!')
+        self.write_line('!')
+
+    def write_results_region(self, sets, nodes, elements):
+        """Defines the components res_node and res_elem of the nodes and elements the results are exported for.
+
+        Parameters
+        ----------
+        sets : list
+            Names of the node and element sets.
+        nodes : list
+            Node keys of results_region.
+        elements : list
+            Element keys of results_region.
+
+        Returns
+        -------
+        None
+
+        """
+
+        if isinstance(sets, str):
+            sets = [sets]
+
+        self.write_line('! Results region')
+        self.write_line('esel,none')
+        for name in sets:
+            if self.structure.sets[name].type != 'node':
+                self.write_line('cmsel,a,{0},elem'.format(name))
+        self.write_line('nsle,s')
+        for name in sets:
+            if self.structure.sets[name].type == 'node':
+                self.write_line('cmsel,a,{0},node'.format(name))
+
+        if nodes:
+            self.write_line('cm,res_node,node')
+        if elements:
+            self.write_line('cm,res_elem,elem')
+
+        self.write_line('allsel')
+
+    def write_results_selection(self, entity, keys):
+        """Selects the nodes or elements of the results region before an export block.
+
+        Parameters
+        ----------
+        entity : str
+            'node' or 'elem'.
+        keys : list
+            Node or element keys of results_region, None for all.
+
+        Returns
+        -------
+        None
+
+        """
+
+        self.write_line('allsel')
+
+        if keys is None:
+            return
+
+        if keys:
+            self.write_line('cmsel,s,res_{0},{0}'.format(entity))
+        else:
+            self.write_line('{0},none'.format({'node': 'nsel', 'elem': 'esel'}[entity]))
+
+    def write_results(self,structure,fields, lstep, sbstep, sets=None):
+        
         # Write part Results
         self.write_section('Results')
         self.blank_line()
@@ -35,7 +438,6 @@ class Results(object):
         # Delete existing (old) output files
         name = structure.name
         path = structure.path
-        filename = name + '_extract.txt'
         out_path = os.path.join(path, name + '_output')
         dir = out_path
         if not os.path.exists(out_path):
@@ -55,78 +457,29 @@ class Results(object):
 
         
         # ------------------------------------------------------------------
-        # Save general Element infos, ... (MAYBE TO REMOVE)
+        # Save general Element infos (written by Python, read with *VREAD)
         # ------------------------------------------------------------------
-        elements = self.structure.elements
-        num_elements = len(elements)
-        properties = self.structure.element_properties
-        sections = self.structure.sections
-        sets = self.structure.sets
-        
-        self.write_line('*DIM,elem_infos,ARRAY,{0},8'.format(num_elements))   
-        fname = 'elem_infos'
-        name_ = 'elem_infos'
-            
-        # Bestimmung der elementspezifischen Werte
-        for key in sorted(properties):
-            property = properties[key]
-            section = sections[property.section]
-            stype = section.__name__
-            elset = property.elset
-            element_set = sets[property.elset]
-            selection = property.elements if property.elements else sets[elset].selection # Zum elemeset zugehorige Elementnummern
-             
-            if stype == 'ShellSection':
-                stype_number=1 # Schalenelement
-            else:
-                stype_number=0 # MPC or Other
+        rows = self.write_element_infos(out_path)
+
+        self.write_line('*DIM,elem_infos,ARRAY,{0},8'.format(rows))   
+        self.write_line('*VREAD,elem_infos(1,1),' + out_path + '/elem_infos,txt,,JIK,8,{0}'.format(rows))
+        self.write_line('(8E24.16)')
+
+        # Nodes and elements the results are exported for
+        nodes, elements = results_region(structure, sets)
+        if sets:
+            self.write_results_region(sets, nodes, elements)
+
+        # Element groups for the GP results
+        groups = gp_groups(structure, elements) if gp_columns(fields) else []
+        if groups:
+            self.write_gp_groups(groups)
 
-            
-            for ele_num in sorted(selection):                    
-                ele_num_adj=ele_num+1
-
-                if stype_number == 1: # Schalenelement
-                    loc_coor_EV_XA= section.loc_coords_EV_XA
-                    loc_coor_EV_YA= section.loc_coords_EV_YA
-                    loc_coor_EV_ZA= section.loc_coords_EV_ZA
-                       
-
-                    if element_set.type != 'node':   
-                        e_x=loc_coor_EV_XA.get('EV_XA',None)
-                        e_y=loc_coor_EV_YA.get('EV_YA',None)
-                        e_z=loc_coor_EV_ZA.get('EV_ZA',None)
-                        
-                    self.write_line('elem_infos({0},1)={1} ! Elementyp e.g. shell=1, mpc and other =0'.format(ele_num_adj,stype_number))   # Elementype     
-                    self.write_line('elem_infos({0},2)={1} ! Elementnumber'.format(ele_num_adj,ele_num_adj))   # Elementnumber 
-                    self.write_line('elem_infos({0},3)={1}! loccal x-axis direction global x'.format(ele_num_adj,e_x[0]))     
-                    self.write_line('elem_infos({0},4)={1}! loccal x-axis direction global y'.format(ele_num_adj,e_x[1]))      
-                    self.write_line('elem_infos({0},5)={1}! loccal x-axis direction global z'.format(ele_num_adj,e_x[2]))    
-                    self.write_line('elem_infos({0},6)={1}! loccal y-axis direction global x'.format(ele_num_adj,e_y[0]))      
-                    self.write_line('elem_infos({0},7)={1}! loccal y-axis direction global y'.format(ele_num_adj,e_y[1])) 
-                    self.write_line('elem_infos({0},8)={1}! loccal y-axis direction global z'.format(ele_num_adj,e_y[2]))                              
-                
-                else:
-                    self.write_line('elem_infos({0},1)={1} ! Elementyp e.g. shell=0, mpc and other =1'.format(ele_num_adj,stype_number))   # Elementype     
-                    self.write_line('elem_infos({0},2)={1} ! Elementnumber'.format(ele_num_adj,ele_num_adj))   # Elementnumber 
-                    self.write_line('elem_infos({0},3)=0'.format(ele_num_adj))
-                    self.write_line('elem_infos({0},4)=0'.format(ele_num_adj))
-                    self.write_line('elem_infos({0},5)=0'.format(ele_num_adj)) 
-                    self.write_line('elem_infos({0},6)=0'.format(ele_num_adj)) 
-                    self.write_line('elem_infos({0},7)=0'.format(ele_num_adj)) 
-                    self.write_line('elem_infos({0},8)=0'.format(ele_num_adj))
-
-        cFile = open(os.path.join(path, filename), 'a')                                       
         self.write_line('allsel')
-        self.write_line('*get, nelem, elem,, count ')
-        self.write_line('*cfopen,' + out_path + '/' + fname + ',txt ')                
-        self.write_line('*do,i,1,nelem ')            
-        self.write_line('*CFWRITE, elem_infos, elem_infos(i,2), elem_infos(i,1), elem_infos(i,3), elem_infos(i,4), elem_infos(i,5), elem_infos(i,6), elem_infos(i,7), elem_infos(i,8)')
-        self.write_line('*Enddo ')
         self.write_line('ESEL, ALL ')
         self.write_line('ETABLE, ERAS ')
         self.write_line('! ')
-        cFile.close()
-        
+
         # ------------------------------------------------------------------
         # Schleife uber alle angegebenen lstep (e.g. 'step_3')
         # ------------------------------------------------------------------
@@ -143,6 +496,10 @@ class Results(object):
             
             step_name = structure.steps_order[lstep_index]
 
+            # GP co-ordinates, the same for all steps
+            if groups and single_lstep == lstep[0]:
+                self.write_gp_results('gp_infos', gp_columns(fields, step=False), out_path, groups)
+
             # ------------------------------------------------------------------
             # WRITE DATA AT NODES
             # ------------------------------------------------------------------
@@ -156,31 +513,33 @@ class Results(object):
                 name_y = 'dispY'
                 name_z = 'dispZ'
 
-                cFile = open(os.path.join(path, filename), 'a')
                 self.blank_line()
                 self.write_line('! Write Displacements')
                 self.blank_line()
-                self.write_line('nsel, all')
-                self.write_line('*get,numNodes,node,,count')
+                self.write_results_selection('node', nodes)
+                self.write_line('*get,numNodes,node,,num,max')
                 self.write_line('*set,' + name_x + ',')
                 self.write_line('*dim,' + name_x + ',array,numNodes,1')
                 self.write_line('*set,' + name_y + ',')
                 self.write_line('*dim,' + name_y + ',array,numNodes,1')
                 self.write_line('*set,' + name_z + ',')
                 self.write_line('*dim,' + name_z + ',array,numNodes,1')
+                self.write_line('*set,nmask,')
+                self.write_line('*dim,nmask,array,numNodes,1')
                 self.write_line('*dim,' + name_ + ', ,numNodes')
-                self.write_line('*VGET, ' + name_x + ', node, all, u, X,,,2') # Node displacement in x-direction
-                self.write_line('*VGET, ' + name_y + ', node, all, u, Y,,,2') # Node displacement in y-direction
-                self.write_line('*VGET, ' + name_z + ', node, all, u, Z,,,2') # Node displacement in z-direction
+                self.write_line('*VGET, ' + name_x + '(1), node, 1, u, X') # Node displacement in x-direction
+                self.write_line('*VGET, ' + name_y + '(1), node, 1, u, Y') # Node displacement in y-direction
+                self.write_line('*VGET, ' + name_z + '(1), node, 1, u, Z') # Node displacement in z-direction
+                self.write_line('*VGET, nmask(1), node, 1, nsel') # Nur selektierte Knoten schreiben
                 self.write_line('!')
                 self.write_line('*vfill,' + name_ + '(1),ramp,1,1')
                 self.write_line('*cfopen,' + out_path + '/' + fname + ',txt')
+                self.write_line('*vmask,nmask(1)')
                 self.write_line('*vwrite, ' + name_ + '(1) , \',\'  , ' + name_x + '(1) , \',\' , ' + name_y + '(1) , \',\' ,' + name_z + '(1)')
                 self.write_line('(          F100000.0,       A,       ES,           A,          ES,          A,      ES)')
                 self.write_line('*cfclose \n')
                 self.write_line('!')
                 self.write_line('!')
-                cFile.close()
 
             # ------------------------------------------------------------------
             # WRITE DATA AT SHELL MIDPOINT
@@ -194,787 +553,48 @@ class Results(object):
                 name_ = 'ele_sf'
 
                 # Abfuellen der Resultates
-                cFile = open(os.path.join(path, filename), 'a')
                 self.blank_line()
                 self.write_line('! Write Shell forces and moments')
                 self.blank_line()
-                self.write_line('allsel')
-
-                self.write_line('ETABLE, , SMISC, 1 ')  # N11 In-plane forces (per unit length)
-                self.write_line('ETABLE, , SMISC, 2 ')  # N22 In-plane forces (per unit length)
-                self.write_line('ETABLE, , SMISC, 3 ')  # N12 In-plane forces (per unit length)
+                self.write_results_selection('elem', elements)
+
+                labels = ['N11', 'N22', 'N12', 'Q13', 'Q23', 'M11', 'M22', 'M12'] # Order in the output file
+                items = {'N11': 1, 'N22': 2, 'N12': 3, 'M11': 4, 'M22': 5, 'M12': 6, 'Q13': 7, 'Q23': 8}
+
+                for label in labels:
+                    self.write_line('ETABLE,{0},SMISC,{1}'.format(label, items[label])) # Forces and moments (per unit length)
+
+                # Spalten: Elementnummer, N11, N22, N12, Q13, Q23, M11, M22, M12, Elementtyp; Zeile = Elementnummer
+                self.write_line('*get,nelem,elem,,num,max')
+                self.write_line('*del,eforces,,nopr')
+                self.write_line('*del,emask,,nopr')
+                self.write_line('*dim,eforces,array,nelem,10')
+                self.write_line('*dim,emask,array,nelem,1')
+                self.write_line('*vfill,eforces(1,1),ramp,1,1')
+                for column, label in enumerate(labels, 2):
+                    self.write_line('*vget,eforces(1,{0}),elem,1,etab,{1}'.format(column, label))
+                    self.write_line('*voper,eforces(1,{0}),eforces(1,{0}),mult,elem_infos(1,1)'.format(column)) # Nur Schalenelemente (Typ 1)
+                self.write_line('*vfun,eforces(1,10),copy,elem_infos(1,1)')
+                self.write_line('*vget,emask(1),elem,1,esel') # Nur vorhandene, selektierte Elemente schreiben
 
-                self.write_line('ETABLE, , SMISC, 4 ')  # M11 Out-of-plane moments (per unit length)
-                self.write_line('ETABLE, , SMISC, 5 ')  # M22 Out-of-plane moments (per unit length)
-                self.write_line('ETABLE, , SMISC, 6 ')  # M12 Out-of-plane moments (per unit length)
-
-                self.write_line('ETABLE, , SMISC, 7 ')  # Q13 Out-of-plane moments (per unit length)
-                self.write_line('ETABLE, , SMISC, 8 ')  # Q23 Out-of-plane moments (per unit length)
-
-                self.write_line('*get, nelem, elem,, count ')
-                self.write_line('*dim, enum, array, nelem, 1 ')
-                self.write_line('*dim, eforces, array, nelem, 9  ')
-                self.write_line('*vget, enum, ELEM, , ELIST ')
-            
-
-                self.write_line('*do,i,1,nelem ')
-                self.write_line('*if,elem_infos(i,1),EQ,1,THEN  ')             # Abfullen bei Schalenelemente
-                self.write_line('*get, eforces(i, 1), ETAB, 1, ELEM, enum(i) ') # N11 In-plane forces (per unit length)
-                self.write_line('*get, eforces(i, 2), ETAB, 2, ELEM, enum(i) ') # N22 In-plane forces (per unit length)
-                self.write_line('*get, eforces(i, 3), ETAB, 3, ELEM, enum(i) ') # N12 In-plane forces (per unit length)
-                self.write_line('*get, eforces(i, 4), ETAB, 7, ELEM, enum(i) ') # Q13 Out-of-plane moments (per unit length)
-                self.write_line('*get, eforces(i, 5), ETAB, 8, ELEM, enum(i) ') # Q23 Out-of-plane moments (per unit length)
-                self.write_line('*get, eforces(i, 6), ETAB, 4, ELEM, enum(i) ') # M11 Out-of-plane moments (per unit length)
-                self.write_line('*get, eforces(i, 7), ETAB, 5, ELEM, enum(i) ') # M22 Out-of-plane moments (per unit length)
-                self.write_line('*get, eforces(i, 8), ETAB, 6, ELEM, enum(i) ') # M12 Out-of-plane moments (per unit length)       
-                self.write_line('eforces(i, 9)=elem_infos(i,1)') 
-                self.write_line('*else')    
-                self.write_line('*endif')    
-                self.write_line('*Enddo ')
-
-                fname = str(step_name) + '_' + 'shell_forces_moments'
                 self.write_line('*cfopen,' + out_path + '/' + fname + ',txt ')
-                #self.write_line('*CFWRITE, stresses, E number, Sm11, Sm22, Sm12, Sb11 \n')
-                self.write_line('*do,i,1,nelem ')
-                #self.write_line('*CFWRITE, stresses, enum(i,1), eforces(i,1), eforces(i,2),eforces(i,3), eforces(i,2) \n')
-                self.write_line('*CFWRITE, shell_forces_moments, enum(i,1), eforces(i,1), eforces(i,2),eforces(i,3), eforces(i,4), eforces(i,5), eforces(i,6), eforces(i,7), eforces(i,8), eforces(i,9)   ')
-                self.write_line('*Enddo ')
+                self.write_line('*vmask,emask(1)')
+                self.write_line('*vwrite,' + ",',',".join(['eforces(1,{0})'.format(i) for i in range(1, 11)]))
+                self.write_line('(F100000.0' + ',A,ES' * 9 + ')')
+                self.write_line('*cfclose')
                 self.write_line('ESEL, ALL ')
                 self.write_line('ETABLE, ERAS ')
                 self.write_line('! ')
-                cFile.close()
 
 
             # ------------------------------------------------------------------
             # WRITE DATA AT GP
-            # ------------------------------------------------------------------    
-        
-            # Write Stresses at top and bottom Elementlayer at every GP 
-            # ------------------------------------------------------------------               
-            if 's' in fields or 'all' in fields:
-
-                # Benotigte Element infos abspeichern fur stresses (MAYBE TO REMOVE)
-                # --------------------------------------------
-                fname = str(step_name) + '_' + 'stresses_elem_infos'
-                name_ = 'e_info_GP'
-                name_loc_x_glob_x ='loc_x_glob_x'
-                name_loc_x_glob_y ='loc_x_glob_y'
-                name_loc_x_glob_z ='loc_x_glob_z'
-                name_loc_y_glob_x ='loc_y_glob_x'
-                name_loc_y_glob_y ='loc_y_glob_y'
-                name_loc_y_glob_z ='loc_y_glob_z'
-                name_elem_typ ='elem_typ'
-
-                cFile = open(os.path.join(path, filename), 'a')
-                self.blank_line()
-                self.write_line('! Write element infos for stresses in Shell Elements')
-                self.blank_line()
-                
-                # Liste mit allen Elementen aufbauen                 
-                self.write_line('allsel')
-                self.write_line('nsel,all')
-                self.write_line('*get,NrE,elem,0,count') # NrE=Anzahl Elemente
-                self.write_line('*dim,N_E,array,NrE,1')
-                self.write_line('*vget,N_E,elem,,elist') # N_E=Element liste
-
-                # Aufbau der Arrays
-                self.write_line('*DIM,loc_x_glob_x,ARRAY,4*NrE,1')
-                self.write_line('*DIM,loc_x_glob_y,ARRAY,4*NrE,1')
-                self.write_line('*DIM,loc_x_glob_z,ARRAY,4*NrE,1')
-                self.write_line('*DIM,loc_y_glob_x,ARRAY,4*NrE,1')
-                self.write_line('*DIM,loc_y_glob_y,ARRAY,4*NrE,1')
-                self.write_line('*DIM,loc_y_glob_z,ARRAY,4*NrE,1')
-                self.write_line('*DIM,elem_typ,ARRAY,4*NrE,1')
-
-                self.write_line('*DIM,elem_nr,ARRAY,4*NrE,1')
-                self.write_line('*dim,' + name_ + ', ,4*NrE')
-                
-                # Extract Principal stresses from usermat
-                self.write_line('aux=0')
-
-                self.write_line('*DO,ii,1,NrE') # Loop uber alle Elemente                
-                self.write_line('ESEL,S,ELEM, ,N_E(ii)')
-                
-                self.write_line('*if,elem_infos(ii,1),EQ,1,THEN  ')                             
-                            
-                self.write_line('NSLE,ALL')
-                self.write_line('*GET,NrN,NODE,0,COUNT ')
-                self.write_line('*DIM,N_N,ARRAY,NrN,1')
-                self.write_line('*VGET,N_N,NODE, ,NLIST')
-                self.write_line('*DO,kk,1,NrN')
-                self.write_line('aux = aux+1')
-
-
-                self.write_line('loc_x_glob_x(aux,1)=elem_infos(ii,3)') 
-                self.write_line('loc_x_glob_y(aux,1)=elem_infos(ii,4)') 
-                self.write_line('loc_x_glob_z(aux,1)=elem_infos(ii,5)') 
-                self.write_line('loc_y_glob_x(aux,1)=elem_infos(ii,6)') 
-                self.write_line('loc_y_glob_y(aux,1)=elem_infos(ii,7)') 
-                self.write_line('loc_y_glob_z(aux,1)=elem_infos(ii,8)') 
-                self.write_line('elem_typ(aux,1)=elem_infos(ii,1)') 
-           
-
-                self.write_line('*ENDDO')
-                self.write_line('*DEL,N_N,,NOPR')
-                self.write_line('*DEL,NrN,,NOPR')
-                self.write_line('*else')    
-                self.write_line('*endif')  
-                self.write_line('*ENDDO')
-                self.write_line('*DEL,NrE,,NOPR')
-                self.write_line('*DEL,N_E,,NOPR')
-
-                self.write_line('*vfill,' + name_ + '(1),ramp,1,1')
-
-                self.write_line('*cfopen,' + out_path + '/' + fname + ',txt')
-                self.write_line('*vwrite, ' + name_ + '(1) , \',\'  , ' + name_loc_x_glob_x + '(1) , \',\' , ' + name_loc_x_glob_y + '(1) , \',\' ,' + name_loc_x_glob_z + '(1) , \',\' ,'+ name_loc_y_glob_x + '(1) , \',\' ,' + name_loc_y_glob_y + '(1) , \',\' ,'+ name_loc_y_glob_z + '(1) , \',\' ,' + name_elem_typ + '(1) ')
-                self.write_line('(F100000.0,A,ES,A,ES,A,ES,A,ES,A,ES,A,ES,A,ES,A,ES,A,ES)')
-                self.write_line('*cfclose \n')
-
-                self.write_line('!')
-                self.write_line('!')
-                cFile.close()                   
-
-
-                # Top Layer (nn)
-                # --------------------------------------------
-                fname = str(step_name) + '_' + 'stresses_top'
-                name_ = 's_GP'
-                name_elem_nr = 'elem_nr'
-                name_sig_c1 = 'sig_c1'
-                name_sig_c3 = 'sig_c3'
-                name_sig_x = 'sig_x'
-                name_sig_y = 'sig_y'
-                name_tau_xy = 'tau_xy'
-                name_fcc_eff = 'fcc_eff'
-                name_coor_intp_layer_x ='coor_intp_layer_x'
-                name_coor_intp_layer_y ='coor_intp_layer_y'
-                name_coor_intp_layer_z ='coor_intp_layer_z'
-
-        
-                cFile = open(os.path.join(path, filename), 'a')
-                self.blank_line()
-                self.write_line('! Write stresses in Shell Elements')
-                self.blank_line()
-                
-                # Liste mit allen Elementen aufbauen                 
-                self.write_line('allsel')
-                self.write_line('nsel,all')
-                self.write_line('*get,NrE,elem,0,count') # NrE=Anzahl Elemente
-                self.write_line('*dim,N_E,array,NrE,1')
-                self.write_line('*vget,N_E,elem,,elist') # N_E=Element liste
-
-                # Aufbau der Arrays
-                self.write_line('*DIM,sig_c1,ARRAY,4*NrE,1')
-                self.write_line('*DIM,sig_c3,ARRAY,4*NrE,1')
-                self.write_line('*DIM,sig_x,ARRAY,4*NrE,1')
-                self.write_line('*DIM,sig_y,ARRAY,4*NrE,1')
-                self.write_line('*DIM,tau_xy,ARRAY,4*NrE,1')
-                self.write_line('*DIM,fcc_eff,ARRAY,4*NrE,1')
-
-                self.write_line('*DIM,elem_nr,ARRAY,4*NrE,1')
-                self.write_line('*dim,' + name_ + ', ,4*NrE')
-                self.write_line('*DIM,coor_intp_layer_x,ARRAY,4*NrE,1')
-                self.write_line('*DIM,coor_intp_layer_y,ARRAY,4*NrE,1')
-                self.write_line('*DIM,coor_intp_layer_z,ARRAY,4*NrE,1')               
-  
-                
-                # Extract Principal stresses from usermat
-                self.write_line('aux=0')
-
-                self.write_line('*DO,ii,1,NrE') # Loop uber alle Elemente                
-                self.write_line('ESEL,S,ELEM, ,N_E(ii)')
-                
-                self.write_line('*if,elem_infos(ii,1),EQ,1,THEN  ')          
-                
-                # (NrT: Shell ID, NrL=Numbers of Layer) 
-                self.write_line('*GET, NrT, ELEM,N_E(ii), attr, secn') # gibt zu einem Element zugehorgie secnum
-                self.write_line('*GET, NrL, SHEL, NrT, Prop,NLAY ') # NrT is equal to secnum (not Element number)
-                            
-
-                self.write_line('NSLE,ALL')
-                self.write_line('*GET,NrN,NODE,0,COUNT ')
-                self.write_line('*DIM,N_N,ARRAY,NrN,1')
-                self.write_line('*VGET,N_N,NODE, ,NLIST')
-                self.write_line('*DO,kk,1,NrN')
-                self.write_line('aux = aux+1')
-                self.write_line('*GET,s_GP(aux,1),NODE,N_N(kk),SVAR,1 ')
-                
-
-                self.write_line('LAYER,NrL')
-                self.write_line('elem_nr(aux,1)=N_E(ii)')
-                self.write_line('*GET,usedmodel_check,NODE,N_N(kk),SVAR,1 ')
-                
-                self.write_line('*IF,usedmodel_check,EQ,1,THEN ')                                
-                self.write_line('*GET,sig_c1(aux,1),NODE,N_N(kk),SVAR,8')                
-                self.write_line('*GET,sig_c3(aux,1),NODE,N_N(kk),SVAR,9')
-                self.write_line('*GET,sig_x(aux,1),NODE,N_N(kk),SVAR,66')                
-                self.write_line('*GET,sig_y(aux,1),NODE,N_N(kk),SVAR,67')                
-                self.write_line('*GET,tau_xy(aux,1),NODE,N_N(kk),SVAR,68') 
-                self.write_line('*GET,fcc_eff(aux,1),NODE,N_N(kk),SVAR,12') 
-
-                self.write_line('*ELSEIF,usedmodel_check,EQ,2,THEN')
-                self.write_line('*GET,sig_c1(aux,1),NODE,N_N(kk),SVAR,29 ')
-                self.write_line('*GET,sig_c3(aux,1),NODE,N_N(kk),SVAR,30 ')
-                self.write_line('*GET,sig_x(aux,1),NODE,N_N(kk),SVAR,66')                
-                self.write_line('*GET,sig_y(aux,1),NODE,N_N(kk),SVAR,67')                
-                self.write_line('*GET,tau_xy(aux,1),NODE,N_N(kk),SVAR,68')                 
-                self.write_line('*GET,fcc_eff(aux,1),NODE,N_N(kk),SVAR,33 ') 
-
-                self.write_line('*ELSEIF,usedmodel_check,EQ,3,THEN') # linear elastisch
-                self.write_line('*GET,sig_x,NODE,N_N(kk),SVAR,66')
-                self.write_line('*GET,sig_y,NODE,N_N(kk),SVAR,67')
-                self.write_line('*GET,sig_xy,NODE,N_N(kk),SVAR,68')
-                self.write_line('*GET,sig_x(aux,1),NODE,N_N(kk),SVAR,66')                
-                self.write_line('*GET,sig_y(aux,1),NODE,N_N(kk),SVAR,67')                
-                self.write_line('*GET,tau_xy(aux,1),NODE,N_N(kk),SVAR,68') 
-                self.write_line('sig_c1(aux,1)=(sig_x+sig_y)/2+SQRT((1/2)*((sig_x+sig_y)*(sig_x+sig_y)+(2*sig_xy)*(2*sig_xy)))')
-                self.write_line('sig_c3(aux,1)=(sig_x+sig_y)/2-SQRT((1/2)*((sig_x+sig_y)*(sig_x+sig_y)+(2*sig_xy)*(2*sig_xy)))')
-                self.write_line('fcc_eff(aux,1)=0')
-
-                self.write_line('*ELSEIF,usedmodel_check,EQ,4,THEN')
-                self.write_line('sig_c1(aux,1)=0')
-                self.write_line('*GET,sig_c3(aux,1),NODE,N_N(kk),SVAR,18 ')
-                self.write_line('*GET,sig_x(aux,1),NODE,N_N(kk),SVAR,66')                
-                self.write_line('*GET,sig_y(aux,1),NODE,N_N(kk),SVAR,67')                
-                self.write_line('*GET,tau_xy(aux,1),NODE,N_N(kk),SVAR,68')                
-                self.write_line('*GET,fcc_eff(aux,1),NODE,N_N(kk),SVAR,19') 
-
-                self.write_line('*ELSEIF,usedmodel_check,EQ,5,THEN') # Zug Zug
-                self.write_line('*GET,sig_c1(aux,1),NODE,N_N(kk),SVAR,39')
-                self.write_line('sig_c3(aux,1)=0')
-                self.write_line('*GET,sig_x(aux,1),NODE,N_N(kk),SVAR,66')                
-                self.write_line('*GET,sig_y(aux,1),NODE,N_N(kk),SVAR,67')                
-                self.write_line('*GET,tau_xy(aux,1),NODE,N_N(kk),SVAR,68')                
-                self.write_line('fcc_eff(aux,1)=0')
-                
-                self.write_line('*ENDIF')
-
-                self.write_line('*GET,coor_intp_layer_x(aux,1),NODE,N_N(kk),SVAR,63')
-                self.write_line('*GET,coor_intp_layer_y(aux,1),NODE,N_N(kk),SVAR,64')
-                self.write_line('*GET,coor_intp_layer_z(aux,1),NODE,N_N(kk),SVAR,65')               
-
-                self.write_line('*ENDDO')
-                self.write_line('*DEL,N_N,,NOPR')
-                self.write_line('*DEL,NrN,,NOPR')
-                self.write_line('*else')    
-                self.write_line('*endif')  
-                self.write_line('*ENDDO')
-                self.write_line('*DEL,NrE,,NOPR')
-                self.write_line('*DEL,N_E,,NOPR')
-
-                self.write_line('*vfill,' + name_ + '(1),ramp,1,1')
-                self.write_line('*cfopen,' + out_path + '/' + fname + ',txt')
-                self.write_line('*vwrite, ' + name_ + '(1) , \',\'  , ' + name_elem_nr + '(1) , \',\' , ' + name_sig_x + '(1) , \',\' ,' + name_sig_y + '(1) , \',\' ,'+ name_tau_xy + '(1) , \',\' ,' + name_fcc_eff + '(1) , \',\' ,'+ name_coor_intp_layer_x + '(1) , \',\' ,'  + name_coor_intp_layer_y + '(1) , \',\' ,' + name_coor_intp_layer_z + '(1)')
-                self.write_line('(F100000.0,A,ES,A,ES,A,ES,A,ES,A,ES,A,ES,A,ES,A,ES,A,ES,A,ES,A,ES,A,ES)')
-                self.write_line('*cfclose \n')
-
-                self.write_line('!')
-                self.write_line('!')
-                cFile.close()      
-
-                # Bot Layer (1)
-                # --------------------------------------------
-                fname = str(step_name) + '_' + 'stresses_bot'
-                name_ = 's_GP'
-                name_elem_nr = 'elem_nr'
-                name_sig_c1 = 'sig_c1'
-                name_sig_c3 = 'sig_c3'
-                name_sig_x = 'sig_x'
-                name_sig_y = 'sig_y'
-                name_tau_xy = 'tau_xy'
-                name_fcc_eff = 'fcc_eff'
-                name_coor_intp_layer_x ='coor_intp_layer_x'
-                name_coor_intp_layer_y ='coor_intp_layer_y'
-                name_coor_intp_layer_z ='coor_intp_layer_z'
-
-                cFile = open(os.path.join(path, filename), 'a')
-                self.blank_line()
-                self.write_line('! Write stresses')
-                self.blank_line()
-
-
-                
-                # Liste mit allen Elementen aufbauen                 
-                self.write_line('allsel')
-                self.write_line('nsel,all')
-                self.write_line('*get,NrE,elem,0,count') # NrE=Anzahl Elemente
-                self.write_line('*dim,N_E,array,NrE,1')
-                self.write_line('*vget,N_E,elem,,elist') # N_E=Element liste
-
-                # Aufbau der Arrays
-                self.write_line('*DIM,sig_c1,ARRAY,4*NrE,1')
-                self.write_line('*DIM,sig_c3,ARRAY,4*NrE,1')
-                self.write_line('*DIM,sig_x,ARRAY,4*NrE,1')
-                self.write_line('*DIM,sig_y,ARRAY,4*NrE,1')
-                self.write_line('*DIM,tau_xy,ARRAY,4*NrE,1')
-                self.write_line('*DIM,fcc_eff,ARRAY,4*NrE,1')
-
-                self.write_line('*DIM,elem_nr,ARRAY,4*NrE,1')
-                self.write_line('*dim,' + name_ + ', ,4*NrE')
-                self.write_line('*DIM,coor_intp_layer_x,ARRAY,4*NrE,1')
-                self.write_line('*DIM,coor_intp_layer_y,ARRAY,4*NrE,1')
-                self.write_line('*DIM,coor_intp_layer_z,ARRAY,4*NrE,1')
-                
-                # Extract Principal stresses from usermat
-                self.write_line('aux=0')
-
-                self.write_line('*DO,ii,1,NrE')
-                self.write_line('ESEL,S,ELEM, ,N_E(ii)')
-
-                self.write_line('*if,elem_infos(ii,1),EQ,1,THEN  ')                         
-                  
-                self.write_line('NSLE,ALL')
-                self.write_line('*GET,NrN,NODE,0,COUNT ')
-                self.write_line('*DIM,N_N,ARRAY,NrN,1')
-                self.write_line('*VGET,N_N,NODE, ,NLIST')
-                self.write_line('*DO,kk,1,NrN')
-                self.write_line('aux = aux+1')
-                self.write_line('*GET,s_GP(aux,1),NODE,N_N(kk),SVAR,1 ')
-                
-                self.write_line('LAYER,1')
-                self.write_line('elem_nr(aux,1)=N_E(ii) ')
-                self.write_line('*GET,usedmodel_check,NODE,N_N(kk),SVAR,1 ')
-                
-                self.write_line('*IF,usedmodel_check,EQ,1,THEN ')                
-                self.write_line('*GET,sig_c1(aux,1),NODE,N_N(kk),SVAR,8')                
-                self.write_line('*GET,sig_c3(aux,1),NODE,N_N(kk),SVAR,9')
-                self.write_line('*GET,sig_x(aux,1),NODE,N_N(kk),SVAR,66')                
-                self.write_line('*GET,sig_y(aux,1),NODE,N_N(kk),SVAR,67')                
-                self.write_line('*GET,tau_xy(aux,1),NODE,N_N(kk),SVAR,68') 
-                self.write_line('*GET,fcc_eff(aux,1),NODE,N_N(kk),SVAR,12') 
-
-                self.write_line('*ELSEIF,usedmodel_check,EQ,2,THEN')
-                self.write_line('*GET,sig_c1(aux,1),NODE,N_N(kk),SVAR,29 ')
-                self.write_line('*GET,sig_c3(aux,1),NODE,N_N(kk),SVAR,30 ')
-                self.write_line('*GET,sig_x(aux,1),NODE,N_N(kk),SVAR,66')                
-                self.write_line('*GET,sig_y(aux,1),NODE,N_N(kk),SVAR,67')                
-                self.write_line('*GET,tau_xy(aux,1),NODE,N_N(kk),SVAR,68')                 
-                self.write_line('*GET,fcc_eff(aux,1),NODE,N_N(kk),SVAR,33 ') 
-
-                self.write_line('*ELSEIF,usedmodel_check,EQ,3,THEN') # linear elastisch
-                self.write_line('*GET,sig_x,NODE,N_N(kk),SVAR,66')
-                self.write_line('*GET,sig_y,NODE,N_N(kk),SVAR,67')
-                self.write_line('*GET,sig_xy,NODE,N_N(kk),SVAR,68')
-                self.write_line('*GET,sig_x(aux,1),NODE,N_N(kk),SVAR,66')                
-                self.write_line('*GET,sig_y(aux,1),NODE,N_N(kk),SVAR,67')                
-                self.write_line('*GET,tau_xy(aux,1),NODE,N_N(kk),SVAR,68') 
-                self.write_line('sig_c1(aux,1)=(sig_x+sig_y)/2+SQRT((1/2)*((sig_x+sig_y)*(sig_x+sig_y)+(2*sig_xy)*(2*sig_xy)))')
-                self.write_line('sig_c3(aux,1)=(sig_x+sig_y)/2-SQRT((1/2)*((sig_x+sig_y)*(sig_x+sig_y)+(2*sig_xy)*(2*sig_xy)))')
-                self.write_line('fcc_eff(aux,1)=0')
-
-                self.write_line('*ELSEIF,usedmodel_check,EQ,4,THEN')
-                self.write_line('sig_c1(aux,1)=0')
-                self.write_line('*GET,sig_c3(aux,1),NODE,N_N(kk),SVAR,18 ')
-                self.write_line('*GET,sig_x(aux,1),NODE,N_N(kk),SVAR,66')                
-                self.write_line('*GET,sig_y(aux,1),NODE,N_N(kk),SVAR,67')                
-                self.write_line('*GET,tau_xy(aux,1),NODE,N_N(kk),SVAR,68')                
-                self.write_line('*GET,fcc_eff(aux,1),NODE,N_N(kk),SVAR,19') 
-
-                self.write_line('*ELSEIF,usedmodel_check,EQ,5,THEN') # Zug Zug
-                self.write_line('*GET,sig_c1(aux,1),NODE,N_N(kk),SVAR,39')
-                self.write_line('sig_c3(aux,1)=0')
-                self.write_line('*GET,sig_x(aux,1),NODE,N_N(kk),SVAR,66')                
-                self.write_line('*GET,sig_y(aux,1),NODE,N_N(kk),SVAR,67')                
-                self.write_line('*GET,tau_xy(aux,1),NODE,N_N(kk),SVAR,68')                
-                self.write_line('fcc_eff(aux,1)=0')
-                
-                self.write_line('*ENDIF')
-
-                self.write_line('*GET,coor_intp_layer_x(aux,1),NODE,N_N(kk),SVAR,63')
-                self.write_line('*GET,coor_intp_layer_y(aux,1),NODE,N_N(kk),SVAR,64')
-                self.write_line('*GET,coor_intp_layer_z(aux,1),NODE,N_N(kk),SVAR,65')
-
-                self.write_line('*ENDDO')
-                self.write_line('*DEL,N_N,,NOPR')
-                self.write_line('*DEL,NrN,,NOPR')
-                self.write_line('*else')    
-                self.write_line('*endif')                  
-                self.write_line('*ENDDO')
-                self.write_line('*DEL,NrE,,NOPR')
-                self.write_line('*DEL,N_E,,NOPR')
-
-                self.write_line('*vfill,' + name_ + '(1),ramp,1,1')
-
-                self.write_line('*cfopen,' + out_path + '/' + fname + ',txt')
-                self.write_line('*vwrite, ' + name_ + '(1) , \',\'  , ' + name_elem_nr + '(1) , \',\' , ' + name_sig_x + '(1) , \',\' ,' + name_sig_y + '(1) , \',\' ,'+ name_tau_xy + '(1) , \',\' ,' + name_fcc_eff + '(1) , \',\' ,'+ name_coor_intp_layer_x + '(1) , \',\' ,'  + name_coor_intp_layer_y + '(1) , \',\' ,' + name_coor_intp_layer_z + '(1)')
-                self.write_line('(F100000.0,A,ES,A,ES,A,ES,A,ES,A,ES,A,ES,A,ES,A,ES,A,ES,A,ES)')
-                self.write_line('*cfclose \n')
-
-                self.write_line('!')
-                self.write_line('!')
-                cFile.close()      
-          
-            else:
-                pass 
-
-            # Write strains at top and bottom Elementlayer at every GP
-            # ------------------------------------------------------------------               
-            if 'eps' in fields or 'all' in fields:
-
-                # Top Layer (nn)
-                # --------------------------------------------
-                fname = str(step_name) + '_' + 'strains_top'
-                name_ = 'eps_GP'
-                name_elem_nr = 'elem_nr'
-                name_eps_1 = 'eps_1'
-                name_eps_3 = 'eps_3'
-                name_coor_intp_layer_x ='coor_intp_layer_x'
-                name_coor_intp_layer_y ='coor_intp_layer_y'
-                name_coor_intp_layer_z ='coor_intp_layer_z'
-
-        
-                cFile = open(os.path.join(path, filename), 'a')
-                self.blank_line()
-                self.write_line('! Write strains in Shell Elements')
-                self.blank_line()
-                
-                # Liste mit allen Elementen aufbauen                 
-                self.write_line('allsel')
-                self.write_line('nsel,all')
-                self.write_line('*get,NrE,elem,0,count') # NrE=Anzahl Elemente
-                self.write_line('*dim,N_E,array,NrE,1')
-                self.write_line('*vget,N_E,elem,,elist') # N_E=Element liste
-
-                # Aufbau der Arrays
-                self.write_line('*DIM,eps_1,ARRAY,4*NrE,1')
-                self.write_line('*DIM,eps_3,ARRAY,4*NrE,1')
-
-                self.write_line('*DIM,elem_nr,ARRAY,4*NrE,1')
-                self.write_line('*dim,' + name_ + ', ,4*NrE')
-                self.write_line('*DIM,coor_intp_layer_x,ARRAY,4*NrE,1')
-                self.write_line('*DIM,coor_intp_layer_y,ARRAY,4*NrE,1')
-                self.write_line('*DIM,coor_intp_layer_z,ARRAY,4*NrE,1')               
-  
-                
-                # Extract Principal stresses from usermat
-                self.write_line('aux=0')
-
-                self.write_line('*DO,ii,1,NrE') # Loop uber alle Elemente                
-                self.write_line('ESEL,S,ELEM, ,N_E(ii)')
-                
-                self.write_line('*if,elem_infos(ii,1),EQ,1,THEN  ')          
-                
-                # (NrT: Shell ID, NrL=Numbers of Layer) 
-                self.write_line('*GET, NrT, ELEM,N_E(ii), attr, secn') # gibt zu einem Element zugehorgie secnum
-                self.write_line('*GET, NrL, SHEL, NrT, Prop,NLAY ') # NrT is equal to secnum (not Element number)
-                            
-
-                self.write_line('NSLE,ALL')
-                self.write_line('*GET,NrN,NODE,0,COUNT ')
-                self.write_line('*DIM,N_N,ARRAY,NrN,1')
-                self.write_line('*VGET,N_N,NODE, ,NLIST')
-                self.write_line('*DO,kk,1,NrN')
-                self.write_line('aux = aux+1')
-
-                self.write_line('LAYER,NrL')
-                self.write_line('elem_nr(aux,1)=N_E(ii)')                                
-                self.write_line('*GET,eps_1(aux,1),NODE,N_N(kk),SVAR,5')
-                self.write_line('*GET,eps_3(aux,1),NODE,N_N(kk),SVAR,6')
-                self.write_line('*GET,coor_intp_layer_x(aux,1),NODE,N_N(kk),SVAR,63')
-                self.write_line('*GET,coor_intp_layer_y(aux,1),NODE,N_N(kk),SVAR,64')
-                self.write_line('*GET,coor_intp_layer_z(aux,1),NODE,N_N(kk),SVAR,65')               
-
-                self.write_line('*ENDDO')
-                self.write_line('*DEL,N_N,,NOPR')
-                self.write_line('*DEL,NrN,,NOPR') 
-                self.write_line('*else')    
-                self.write_line('*endif')                      
-                self.write_line('*ENDDO')
-                self.write_line('*DEL,NrE,,NOPR')
-                self.write_line('*DEL,N_E,,NOPR')
-
-                self.write_line('*vfill,' + name_ + '(1),ramp,1,1')
-
-                self.write_line('*cfopen,' + out_path + '/' + fname + ',txt')
-                self.write_line('*vwrite, ' + name_ + '(1) , \',\'  , ' + name_elem_nr + '(1) , \',\' , ' + name_eps_1 + '(1) , \',\' ,' + name_eps_3 + '(1) , \',\' ,'+ name_coor_intp_layer_x + '(1) , \',\' ,'  + name_coor_intp_layer_y + '(1) , \',\' ,' + name_coor_intp_layer_z + '(1)')
-                self.write_line('(F100000.0,A,ES,A,ES,A,ES,A,ES,A,ES,A,ES,A,ES,A,ES)')
-                self.write_line('*cfclose \n')
-
-                self.write_line('!')
-                self.write_line('!')
-                cFile.close()      
-
-                # Bot Layer (1)
-                # --------------------------------------------
-                fname = str(step_name) + '_' + 'strains_bot'
-                name_ = 'eps_GP'
-                name_elem_nr = 'elem_nr'
-                name_eps_1 = 'eps_1'
-                name_eps_3 = 'eps_3'
-                name_coor_intp_layer_x ='coor_intp_layer_x'
-                name_coor_intp_layer_y ='coor_intp_layer_y'
-                name_coor_intp_layer_z ='coor_intp_layer_z'
-
-        
-                cFile = open(os.path.join(path, filename), 'a')
-                self.blank_line()
-                self.write_line('! Write strains in Shell Elements')
-                self.blank_line()
-                
-                # Liste mit allen Elementen aufbauen                 
-                self.write_line('allsel')
-                self.write_line('nsel,all')
-                self.write_line('*get,NrE,elem,0,count') # NrE=Anzahl Elemente
-                self.write_line('*dim,N_E,array,NrE,1')
-                self.write_line('*vget,N_E,elem,,elist') # N_E=Element liste
-
-                # Aufbau der Arrays
-                self.write_line('*DIM,eps_1,ARRAY,4*NrE,1')
-                self.write_line('*DIM,eps_3,ARRAY,4*NrE,1')
-
-                self.write_line('*DIM,elem_nr,ARRAY,4*NrE,1')
-                self.write_line('*dim,' + name_ + ', ,4*NrE')
-                self.write_line('*DIM,coor_intp_layer_x,ARRAY,4*NrE,1')
-                self.write_line('*DIM,coor_intp_layer_y,ARRAY,4*NrE,1')
-                self.write_line('*DIM,coor_intp_layer_z,ARRAY,4*NrE,1')               
-  
-                
-                # Extract Principal stresses from usermat
-                self.write_line('aux=0')
-
-                self.write_line('*DO,ii,1,NrE') # Loop uber alle Elemente                
-                self.write_line('ESEL,S,ELEM, ,N_E(ii)')
-                
-                self.write_line('*if,elem_infos(ii,1),EQ,1,THEN  ')          
-                
-                # (NrT: Shell ID, NrL=Numbers of Layer) 
-                self.write_line('*GET, NrT, ELEM,N_E(ii), attr, secn') # gibt zu einem Element zugehorgie secnum
-                self.write_line('*GET, NrL, SHEL, NrT, Prop,NLAY ') # NrT is equal to secnum (not Element number)
-                            
-
-                self.write_line('NSLE,ALL')
-                self.write_line('*GET,NrN,NODE,0,COUNT ')
-                self.write_line('*DIM,N_N,ARRAY,NrN,1')
-                self.write_line('*VGET,N_N,NODE, ,NLIST')
-                self.write_line('*DO,kk,1,NrN')
-                self.write_line('aux = aux+1')
-
-                self.write_line('LAYER,1')
-                self.write_line('elem_nr(aux,1)=N_E(ii)')                                
-                self.write_line('*GET,eps_1(aux,1),NODE,N_N(kk),SVAR,5')
-                self.write_line('*GET,eps_3(aux,1),NODE,N_N(kk),SVAR,6')
-                self.write_line('*GET,coor_intp_layer_x(aux,1),NODE,N_N(kk),SVAR,63')
-                self.write_line('*GET,coor_intp_layer_y(aux,1),NODE,N_N(kk),SVAR,64')
-                self.write_line('*GET,coor_intp_layer_z(aux,1),NODE,N_N(kk),SVAR,65')               
-
-                self.write_line('*ENDDO')
-                self.write_line('*DEL,N_N,,NOPR')
-                self.write_line('*DEL,NrN,,NOPR') 
-                self.write_line('*else')    
-                self.write_line('*endif')                      
-                self.write_line('*ENDDO')
-                self.write_line('*DEL,NrE,,NOPR')
-                self.write_line('*DEL,N_E,,NOPR')
-
-                self.write_line('*vfill,' + name_ + '(1),ramp,1,1')
-
-                self.write_line('*cfopen,' + out_path + '/' + fname + ',txt')
-                self.write_line('*vwrite, ' + name_ + '(1) , \',\'  , ' + name_elem_nr + '(1) , \',\' , ' + name_eps_1 + '(1) , \',\' ,' + name_eps_3 + '(1) , \',\' ,'+ name_coor_intp_layer_x + '(1) , \',\' ,'  + name_coor_intp_layer_y + '(1) , \',\' ,' + name_coor_intp_layer_z + '(1)')
-                self.write_line('(F100000.0,A,ES,A,ES,A,ES,A,ES,A,ES,A,ES,A,ES,A,ES)')
-                self.write_line('*cfclose \n')
-
-                self.write_line('!')
-                self.write_line('!')
-                cFile.close()    
-          
-            else:
-                pass 
-
-            # Write steel stresses at reinforcement Layer 1-4 at every GP
-            # ------------------------------------------------------------------               
-            if 'sig_sr' in fields or 'all' in fields:
-
-                # Reinforcement Layer 1
-                # --------------------------------------------
-                fname_1L = str(step_name) + '_' + 'sig_sr_1L'
-                fname_2L = str(step_name) + '_' + 'sig_sr_2L'
-                fname_3L = str(step_name) + '_' + 'sig_sr_3L'
-                fname_4L = str(step_name) + '_' + 'sig_sr_4L'
-                name_ = 'sig_sr_GP'
-                name_elem_nr = 'elem_nr'
-                name_sig_sr_1L = 'sig_sr_1L'                 
-                name_sig_sr_2L = 'sig_sr_2L'                 
-                name_sig_sr_3L = 'sig_sr_3L'                 
-                name_sig_sr_4L = 'sig_sr_4L'                 
-                
-                name_coor_x_sig_sr_1L ='coor_x_sig_sr_1L'
-                name_coor_y_sig_sr_1L ='coor_y_sig_sr_1L'
-                name_coor_z_sig_sr_1L ='coor_z_sig_sr_1L'
-                name_coor_x_sig_sr_2L ='coor_x_sig_sr_2L'
-                name_coor_y_sig_sr_2L ='coor_y_sig_sr_2L'
-                name_coor_z_sig_sr_2L ='coor_z_sig_sr_2L'
-                name_coor_x_sig_sr_3L ='coor_x_sig_sr_3L'
-                name_coor_y_sig_sr_3L ='coor_y_sig_sr_3L'
-                name_coor_z_sig_sr_3L ='coor_z_sig_sr_3L'    
-                name_coor_x_sig_sr_4L ='coor_x_sig_sr_4L'
-                name_coor_y_sig_sr_4L ='coor_y_sig_sr_4L'
-                name_coor_z_sig_sr_4L ='coor_z_sig_sr_4L'                              
-
-        
-                cFile = open(os.path.join(path, filename), 'a')
-                self.blank_line()
-                self.write_line('! Write steel stresses at crackes in Shell Elements')
-                self.blank_line()
-                
-                # Liste mit allen Elementen aufbauen                 
-                self.write_line('allsel')
-                self.write_line('nsel,all')
-                self.write_line('*get,NrE,elem,0,count') # NrE=Anzahl Elemente
-                self.write_line('*dim,N_E,array,NrE,1')
-                self.write_line('*vget,N_E,elem,,elist') # N_E=Element liste
-
-                # Aufbau der Arrays
-                self.write_line('*DIM,sig_sr_1L,ARRAY,4*NrE,1')
-                self.write_line('*DIM,sig_sr_2L,ARRAY,4*NrE,1')
-                self.write_line('*DIM,sig_sr_3L,ARRAY,4*NrE,1')
-                self.write_line('*DIM,sig_sr_4L,ARRAY,4*NrE,1')
-    
-                self.write_line('*DIM,elem_nr,ARRAY,4*NrE,1')
-                self.write_line('*dim,' + name_ + ', ,4*NrE')
-                self.write_line('*DIM,coor_x_sig_sr_1L,ARRAY,4*NrE,1')
-                self.write_line('*DIM,coor_y_sig_sr_1L,ARRAY,4*NrE,1')
-                self.write_line('*DIM,coor_z_sig_sr_1L,ARRAY,4*NrE,1')   
-                self.write_line('*DIM,coor_x_sig_sr_2L,ARRAY,4*NrE,1')
-                self.write_line('*DIM,coor_y_sig_sr_2L,ARRAY,4*NrE,1')
-                self.write_line('*DIM,coor_z_sig_sr_2L,ARRAY,4*NrE,1')    
-                self.write_line('*DIM,coor_x_sig_sr_3L,ARRAY,4*NrE,1')
-                self.write_line('*DIM,coor_y_sig_sr_3L,ARRAY,4*NrE,1')
-                self.write_line('*DIM,coor_z_sig_sr_3L,ARRAY,4*NrE,1') 
-                self.write_line('*DIM,coor_x_sig_sr_4L,ARRAY,4*NrE,1')
-                self.write_line('*DIM,coor_y_sig_sr_4L,ARRAY,4*NrE,1')
-                self.write_line('*DIM,coor_z_sig_sr_4L,ARRAY,4*NrE,1')                                                      
-  
-                
-                # Extract Principal stresses from usermat
-                self.write_line('aux=0')
-
-                self.write_line('*DO,ii,1,NrE') # Loop uber alle Elemente                
-                self.write_line('ESEL,S,ELEM, ,N_E(ii)')
-                
-                self.write_line('*if,elem_infos(ii,1),EQ,1,THEN  ')          
-                                           
-
-                self.write_line('NSLE,ALL')
-                self.write_line('*GET,NrN,NODE,0,COUNT ')
-                self.write_line('*DIM,N_N,ARRAY,NrN,1')
-                self.write_line('*VGET,N_N,NODE, ,NLIST')
-                self.write_line('*DO,kk,1,NrN')
-                self.write_line('aux = aux+1')
-
-                self.write_line('*GET,layer_nr_1L,NODE,N_N(kk),SVAR,58')
-                self.write_line('*GET,layer_nr_2L,NODE,N_N(kk),SVAR,59')
-                self.write_line('*GET,layer_nr_3L,NODE,N_N(kk),SVAR,60')
-                self.write_line('*GET,layer_nr_4L,NODE,N_N(kk),SVAR,61')
-                self.write_line('elem_nr(aux,1)=N_E(ii)') 
-
-                # Layer 1 for x- and y direction
-                self.write_line('LAYER,layer_nr_1L')
-                self.write_line('*GET,sig_sr_1L_Druck_x,NODE,N_N(kk),SVAR,13')
-                self.write_line('*GET,sig_sr_1L_Druckfeld_x,NODE,N_N(kk),SVAR,20')
-                self.write_line('*GET,sig_sr_1L_DruckZug_x,NODE,N_N(kk),SVAR,34')
-                self.write_line('*GET,sig_sr_1L_Zug_x,NODE,N_N(kk),SVAR,40')
-                self.write_line('sig_sr_1L_x=sig_sr_1L_Druck_x+sig_sr_1L_Druckfeld_x+sig_sr_1L_DruckZug_x+sig_sr_1L_Zug_x')
-                self.write_line('*GET,sig_sr_1L_Druck_y,NODE,N_N(kk),SVAR,14')
-                self.write_line('*GET,sig_sr_1L_Druckfeld_y,NODE,N_N(kk),SVAR,21')
-                self.write_line('*GET,sig_sr_1L_DruckZug_y,NODE,N_N(kk),SVAR,35')
-                self.write_line('*GET,sig_sr_1L_Zug_y,NODE,N_N(kk),SVAR,41')
-                self.write_line('sig_sr_1L_y=sig_sr_1L_Druck_y+sig_sr_1L_Druckfeld_y+sig_sr_1L_DruckZug_y+sig_sr_1L_Zug_y')
-                self.write_line('sig_sr_1L(aux,1)=sig_sr_1L_x+sig_sr_1L_y') # fiktive x und y Richtung zusammenzahlen
-                self.write_line('*GET,coor_x_sig_sr_1L(aux,1),NODE,N_N(kk),SVAR,63')
-                self.write_line('*GET,coor_y_sig_sr_1L(aux,1),NODE,N_N(kk),SVAR,64')
-                self.write_line('*GET,coor_z_sig_sr_1L(aux,1),NODE,N_N(kk),SVAR,65')                  
-                
-                # Layer 2 for x- and y direction
-                self.write_line('LAYER,layer_nr_2L')
-                self.write_line('*GET,sig_sr_2L_Druck_x,NODE,N_N(kk),SVAR,13')
-                self.write_line('*GET,sig_sr_2L_Druckfeld_x,NODE,N_N(kk),SVAR,20')
-                self.write_line('*GET,sig_sr_2L_DruckZug_x,NODE,N_N(kk),SVAR,34')
-                self.write_line('*GET,sig_sr_2L_Zug_x,NODE,N_N(kk),SVAR,40')
-                self.write_line('sig_sr_2L_x=sig_sr_2L_Druck_x+sig_sr_2L_Druckfeld_x+sig_sr_2L_DruckZug_x+sig_sr_2L_Zug_x')
-                self.write_line('*GET,sig_sr_2L_Druck_y,NODE,N_N(kk),SVAR,14')
-                self.write_line('*GET,sig_sr_2L_Druckfeld_y,NODE,N_N(kk),SVAR,21')
-                self.write_line('*GET,sig_sr_2L_DruckZug_y,NODE,N_N(kk),SVAR,35')
-                self.write_line('*GET,sig_sr_2L_Zug_y,NODE,N_N(kk),SVAR,41')
-                self.write_line('sig_sr_2L_y=sig_sr_2L_Druck_y+sig_sr_2L_Druckfeld_y+sig_sr_2L_DruckZug_y+sig_sr_2L_Zug_y')
-                self.write_line('sig_sr_2L(aux,1)=sig_sr_2L_x+sig_sr_2L_y') # fiktive x und y Richtung zusammenzahlen
-                self.write_line('*GET,coor_x_sig_sr_2L(aux,1),NODE,N_N(kk),SVAR,63')
-                self.write_line('*GET,coor_y_sig_sr_2L(aux,1),NODE,N_N(kk),SVAR,64')
-                self.write_line('*GET,coor_z_sig_sr_2L(aux,1),NODE,N_N(kk),SVAR,65')     
-
-                # Layer 3 for x- and y direction
-                self.write_line('LAYER,layer_nr_3L')
-                self.write_line('*GET,sig_sr_3L_Druck_x,NODE,N_N(kk),SVAR,13')
-                self.write_line('*GET,sig_sr_3L_Druckfeld_x,NODE,N_N(kk),SVAR,20')
-                self.write_line('*GET,sig_sr_3L_DruckZug_x,NODE,N_N(kk),SVAR,34')
-                self.write_line('*GET,sig_sr_3L_Zug_x,NODE,N_N(kk),SVAR,40')
-                self.write_line('sig_sr_3L_x=sig_sr_3L_Druck_x+sig_sr_3L_Druckfeld_x+sig_sr_3L_DruckZug_x+sig_sr_3L_Zug_x')
-                self.write_line('*GET,sig_sr_3L_Druck_y,NODE,N_N(kk),SVAR,14')
-                self.write_line('*GET,sig_sr_3L_Druckfeld_y,NODE,N_N(kk),SVAR,21')
-                self.write_line('*GET,sig_sr_3L_DruckZug_y,NODE,N_N(kk),SVAR,35')
-                self.write_line('*GET,sig_sr_3L_Zug_y,NODE,N_N(kk),SVAR,41')
-                self.write_line('sig_sr_3L_y=sig_sr_3L_Druck_y+sig_sr_3L_Druckfeld_y+sig_sr_3L_DruckZug_y+sig_sr_3L_Zug_y')
-                self.write_line('sig_sr_3L(aux,1)=sig_sr_3L_x+sig_sr_3L_y') # fiktive x und y Richtung zusammenzahlen
-                self.write_line('*GET,coor_x_sig_sr_3L(aux,1),NODE,N_N(kk),SVAR,63')
-                self.write_line('*GET,coor_y_sig_sr_3L(aux,1),NODE,N_N(kk),SVAR,64')
-                self.write_line('*GET,coor_z_sig_sr_3L(aux,1),NODE,N_N(kk),SVAR,65')     
-
-                # Layer 4 for x- and y direction
-                self.write_line('LAYER,layer_nr_4L')
-                self.write_line('*GET,sig_sr_4L_Druck_x,NODE,N_N(kk),SVAR,13')
-                self.write_line('*GET,sig_sr_4L_Druckfeld_x,NODE,N_N(kk),SVAR,20')
-                self.write_line('*GET,sig_sr_4L_DruckZug_x,NODE,N_N(kk),SVAR,34')
-                self.write_line('*GET,sig_sr_4L_Zug_x,NODE,N_N(kk),SVAR,40')
-                self.write_line('sig_sr_4L_x=sig_sr_4L_Druck_x+sig_sr_4L_Druckfeld_x+sig_sr_4L_DruckZug_x+sig_sr_4L_Zug_x')
-                self.write_line('*GET,sig_sr_4L_Druck_y,NODE,N_N(kk),SVAR,14')
-                self.write_line('*GET,sig_sr_4L_Druckfeld_y,NODE,N_N(kk),SVAR,21')
-                self.write_line('*GET,sig_sr_4L_DruckZug_y,NODE,N_N(kk),SVAR,35')
-                self.write_line('*GET,sig_sr_4L_Zug_y,NODE,N_N(kk),SVAR,41')
-                self.write_line('sig_sr_4L_y=sig_sr_4L_Druck_y+sig_sr_4L_Druckfeld_y+sig_sr_4L_DruckZug_y+sig_sr_4L_Zug_y')
-                self.write_line('sig_sr_4L(aux,1)=sig_sr_4L_x+sig_sr_4L_y') # fiktive x und y Richtung zusammenzahlen
-                self.write_line('*GET,coor_x_sig_sr_4L(aux,1),NODE,N_N(kk),SVAR,63')
-                self.write_line('*GET,coor_y_sig_sr_4L(aux,1),NODE,N_N(kk),SVAR,64')
-                self.write_line('*GET,coor_z_sig_sr_4L(aux,1),NODE,N_N(kk),SVAR,65')          
-
-                self.write_line('*ENDDO')
-                self.write_line('*DEL,N_N,,NOPR')
-                self.write_line('*DEL,NrN,,NOPR') 
-                self.write_line('*else')    
-                self.write_line('*endif')                      
-                self.write_line('*ENDDO')
-                self.write_line('*DEL,NrE,,NOPR')
-                self.write_line('*DEL,N_E,,NOPR')
-
-                self.write_line('*vfill,' + name_ + '(1),ramp,1,1')
-                self.write_line('*cfopen,' + out_path + '/' + fname_1L + ',txt')
-                self.write_line('*vwrite, ' + name_ + '(1) , \',\'  , ' + name_elem_nr + '(1) , \',\' , ' + name_sig_sr_1L + '(1) , \',\' , ' + name_coor_x_sig_sr_1L + '(1) , \',\' ,'+ name_coor_y_sig_sr_1L + '(1) , \',\' ,'  + name_coor_z_sig_sr_1L + '(1)')
-                self.write_line('(F100000.0,A,ES,A,ES,A,ES,A,ES,A,ES,A,ES,A,ES)')
-                self.write_line('*cfclose \n')
-
-                self.write_line('*vfill,' + name_ + '(1),ramp,1,1')
-                self.write_line('*cfopen,' + out_path + '/' + fname_2L + ',txt')
-                self.write_line('*vwrite, ' + name_ + '(1) , \',\'  , ' + name_elem_nr + '(1) , \',\' , ' + name_sig_sr_2L + '(1) , \',\' ,' + name_coor_x_sig_sr_2L + '(1) , \',\' ,'+ name_coor_y_sig_sr_2L + '(1) , \',\' ,'  + name_coor_z_sig_sr_2L + '(1)')
-                self.write_line('(F100000.0,A,ES,A,ES,A,ES,A,ES,A,ES,A,ES,A,ES)')
-                self.write_line('*cfclose \n')                
-
-                self.write_line('*vfill,' + name_ + '(1),ramp,1,1')
-                self.write_line('*cfopen,' + out_path + '/' + fname_3L + ',txt')
-                self.write_line('*vwrite, ' + name_ + '(1) , \',\'  , ' + name_elem_nr + '(1) , \',\' , ' + name_sig_sr_3L + '(1) , \',\' , ' + name_coor_x_sig_sr_3L + '(1) , \',\' ,'+ name_coor_y_sig_sr_3L + '(1) , \',\' ,'  + name_coor_z_sig_sr_3L + '(1)')
-                self.write_line('(F100000.0,A,ES,A,ES,A,ES,A,ES,A,ES,A,ES,A,ES)')
-                self.write_line('*cfclose \n')   
-
-                self.write_line('*vfill,' + name_ + '(1),ramp,1,1')
-                self.write_line('*cfopen,' + out_path + '/' + fname_4L + ',txt')
-                self.write_line('*vwrite, ' + name_ + '(1) , \',\'  , ' + name_elem_nr + '(1) , \',\' , ' + name_sig_sr_4L + '(1) , \',\' , '  + name_coor_x_sig_sr_4L + '(1) , \',\' ,'+ name_coor_y_sig_sr_4L + '(1) , \',\' ,'  + name_coor_z_sig_sr_4L + '(1)')
-                self.write_line('(F100000.0,A,ES,A,ES,A,ES,A,ES,A,ES,A,ES,A,ES)')
-                self.write_line('*cfclose \n')   
-
-
-                self.write_line('!')
-                self.write_line('!')
-                cFile.close()      
+            # ------------------------------------------------------------------
 
-            else:
-                pass             
+            # Write stresses, strains and steel stresses at every GP in one pass
+            # ------------------------------------------------------------------
+            if groups:
+                self.write_gp_results(str(step_name) + '_gp_results', gp_columns(fields), out_path, groups)
 
         self.blank_line()
         self.blank_line()
@@ -4,7 +4,7 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
-
+from compas_fea.utilities import identify_ranges
 
 
 __all__ = [
@@ -41,15 +41,9 @@ class Sets(object):
         self.write_line(header[self.software])
         self.blank_line()
 
-        nodes = [i + 1 for i in node_set.selection]
-        
-        for i in range(0, len(nodes), 1):
-            
-            for j in nodes[i:i + 1]:
-                node_string=str(j) 
-                self.write_line('nsel,u,node,, {0}'.format(node_string))
+        self.write_line('nsel,none')
+        self.write_ranges('nsel,a,node,,', node_set.selection)
         self.blank_line()
-        self.write_line('nsel,inve')  
         self.write_line('CM, {0},node'.format(key))
 
 
@@ -83,19 +77,74 @@ class Sets(object):
 
             self.blank_line()
 
-            selection = [i + 1 for i in sorted(element_set.selection)]
-
-            # Set for elements
-            for i in range(0, len(selection), 1):
-
-                for j in selection[i:i + 1]:
-                    element_string=str(j) 
-                    self.write_line('esel,u,elem,, {0}'.format(element_string))
+            self.write_line('esel,none')
+            self.write_ranges('esel,a,elem,,', element_set.selection)
             self.blank_line()
-            self.write_line('esel,inve')  
             self.write_line('CM, {0},elem'.format(key))     
 
 
         if stype == 'surface_element':
 
             raise NotImplementedError
+
+    def write_ranges(self, command, keys):
+        """Writes a selection command per contiguous range of keys.
+
+        Parameters
+        ----------
+        command : str
+            Selection command the range is appended to, e.g. 'nsel,a,node,,'.
+        keys : list
+            Node or element keys (starting from 0).
+
+        Returns
+        -------
+        None
+
+        """
+
+        lines = []
+
+        for item in identify_ranges([i + 1 for i in keys]):
+            if isinstance(item, tuple):
+                lines.append('{0}{1},{2}'.format(command, item[0], item[1]))
+            else:
+                lines.append('{0}{1}'.format(command, item))
+
+        if lines:
+            self.write_line('\n'.join(lines))
+
+    def write_selection(self, entity, keys):
+        """Selects nodes or elements given by set names and/or keys.
+
+        Parameters
+        ----------
+        entity : str
+            'node' or 'elem'.
+        keys : list
+            Set names and/or node or element keys (starting from 0).
+
+        Returns
+        -------
+        None
+
+        Notes
+        -----
+        - A single set is selected with one cmsel of its component, keys with one command per contiguous range.
+
+        """
+
+        command = {'node': 'nsel', 'elem': 'esel'}[entity]
+        names = [i for i in keys if isinstance(i, str)]
+        keys = [i for i in keys if not isinstance(i, str)]
+
+        if len(names) == 1 and not keys:
+            self.write_line('cmsel,s,{0},{1}'.format(names[0], entity))
+            return
+
+        self.write_line('{0},none'.format(command))
+
+        for name in names:
+            self.write_line('cmsel,a,{0},{1}'.format(name, entity))
+
+        self.write_ranges('{0},a,{1},,'.format(command, entity), keys)
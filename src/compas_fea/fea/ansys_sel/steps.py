@@ -118,70 +118,48 @@ class Steps(object):
                         #self.write_line('*CLOAD, OP={0}'.format(op))
                         #self.blank_line()
 
-                        for node in nodes:
+                        self.write_selection('node', nodes)
+                        self.blank_line()
 
-                            ni = node if isinstance(node, str) else node + 1
-                    
-                            self.write_line('nsel,s,,,{0}'.format(ni))                            
-                            self.blank_line()
-
-                            for c, dof in enumerate(dofs, 1):
-                                if c == 1:
-                                    dof_ansys='fx' 
-                                elif c == 2:
-                                    dof_ansys='fy' 
-                                elif c == 3:
-                                    dof_ansys='fz' 
-                                elif c == 4:
-                                    dof_ansys='mx' 
-                                elif c == 5:
-                                    dof_ansys='my' 
-                                elif c == 6:
-                                    dof_ansys='mz'   
-
-                                if com[dof]:                                                                                                                            
-                                    self.write_line('F,all,{0},{1}'.format(dof_ansys, com[dof] * fact))
-                            
-                            self.write_line('allsel')
+                        for c, dof in enumerate(dofs, 1):
+                            if c == 1:
+                                dof_ansys='fx' 
+                            elif c == 2:
+                                dof_ansys='fy' 
+                            elif c == 3:
+                                dof_ansys='fz' 
+                            elif c == 4:
+                                dof_ansys='mx' 
+                            elif c == 5:
+                                dof_ansys='my' 
+                            elif c == 6:
+                                dof_ansys='mz'   
+
+                            if com[dof]:                                                                                                                            
+                                self.write_line('F,all,{0},{1}'.format(dof_ansys, com[dof] * fact))
+                        
+                        self.write_line('allsel')
 
                         # AreaLoad
                         # --------
 
                     elif ltype == 'AreaLoad':
 
-                        for k in elements:
-
-                            if com['z']:
-                                
-                                self.write_line('allsel')  
-                                #self.write_line('cmsel,s, {0}, elem'.format(k))  
-                                self.write_line('esel,s,elem,,{0}'.format(k))  
-                                self.write_line('sfcum,pres,add,,,')
-                                self.write_line('sfe,all,2,pres,1,{0}'.format(fact * com['z']))
-                                self.write_line('allsel')  
-                                self.blank_line()
-
-                            elif com['x']:
-                                
-                                self.write_line('allsel')  
-                                #self.write_line('cmsel,s, {0}, elem'.format(k))  
-                                self.write_line('esel,s,elem,,{0}'.format(k))  
-                                self.write_line('sfcum,pres,add,,,')
-                                self.write_line('sfe,all,6,pres,1,{0}'.format(fact * com['x']))
-                                self.write_line('allsel')  
-                                self.blank_line()
-                            
-                            elif com['y']:
-                                
-                                self.write_line('allsel')  
-                                #self.write_line('cmsel,s, {0}, elem'.format(k))  
-                                self.write_line('esel,s,elem,,{0}'.format(k))  
-                                self.write_line('sfcum,pres,add,,,')
-                                self.write_line('sfe,all,3,pres,1,{0}'.format(fact * com['y']))
-                                self.write_line('allsel')  
-                                self.blank_line()                                
-                            else:
-                                raise NotImplementedError                                                                
+                        if com['z']:
+                            face, value = 2, com['z']
+                        elif com['x']:
+                            face, value = 6, com['x']
+                        elif com['y']:
+                            face, value = 3, com['y']
+                        else:
+                            raise NotImplementedError                                                                
+
+                        self.write_line('allsel')  
+                        self.write_selection('elem', elements)
+                        self.write_line('sfcum,pres,add,,,')
+                        self.write_line('sfe,all,{0},pres,1,{1}'.format(face, fact * value))
+                        self.write_line('allsel')  
+                        self.blank_line()
 
 
                     # PointLoads
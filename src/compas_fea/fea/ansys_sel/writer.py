@@ -4,6 +4,33 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+from array import array
+from io import StringIO
+from io import TextIOBase
+
+from functools import partial
+
+import hashlib
+import os
+import sys
+
+try:
+    from concurrent.futures import ProcessPoolExecutor
+except ImportError:
+    ProcessPoolExecutor = None
+
+if sys.version_info < (3, 7):
+    # the mp_context and initializer arguments of the pool need Python 3.7
+    ProcessPoolExecutor = None
+
+try:
+    from multiprocessing import get_context
+    fork = get_context('fork')
+except (ImportError, ValueError):
+    fork = None
+
+import compas_fea
+
 from compas_fea.fea.ansys_sel.heading import Heading
 from compas_fea.fea.ansys_sel.nodes import Nodes
 from compas_fea.fea.ansys_sel.elements import Elements
@@ -14,9 +41,11 @@ from compas_fea.fea.ansys_sel.steps import Steps
 from compas_fea.fea.ansys_sel.results import Results
 
 
-
 __all__ = [
     'Writer',
+    'FileSink',
+    'MemorySink',
+    'PipeSink',
 ]
 
 
@@ -29,12 +58,175 @@ comments = {
 }
 
 
+_scalars = set([int, float, bool, str, type(None)])
+
+
+def _update(md5, item):
+
+    if isinstance(item, array):
+        md5.update(item.typecode.encode('ascii'))
+        md5.update(item.tobytes() if hasattr(item, 'tobytes') else item.tostring())
+
+    elif isinstance(item, dict):
+        md5.update(b'{')
+        for key in sorted(item, key=repr):
+            _update(md5, key)
+            _update(md5, item[key])
+        md5.update(b'}')
+
+    elif isinstance(item, (list, tuple)) and set(map(type, item)) <= _scalars:
+        md5.update(repr(item).encode('utf-8'))
+
+    elif isinstance(item, (list, tuple, set, frozenset)):
+        md5.update(b'[')
+        for i in (sorted(item, key=repr) if isinstance(item, (set, frozenset)) else item):
+            _update(md5, i)
+        md5.update(b']')
+
+    elif hasattr(item, '__dict__'):
+        md5.update(type(item).__name__.encode('utf-8'))
+        _update(md5, vars(item))
+
+    else:
+        md5.update(repr(item).encode('utf-8'))
+        md5.update(b',')
+
+
+def _digest(*data):
+    """Returns the md5 content hash of nested containers, arrays and objects."""
+
+    md5 = hashlib.md5()
+
+    for item in data:
+        _update(md5, item)
+
+    return md5.hexdigest()
+
+
+class FileSink(object):
+    """Writes the input file to a path on disk through a large buffer.
+
+    Parameters
+    ----------
+    filename : str
+        Path of the input file.
+    buffering : int
+        Size of the file buffer in bytes.
+
+    Returns
+    -------
+    None
+
+    """
+
+    def __init__(self, filename, buffering=2**20):
+        self.filename = filename
+        self.buffering = buffering
+        self.file = None
+
+    def open(self):
+        self.file = open(self.filename, 'w', buffering=self.buffering)
+
+    def write(self, text):
+        self.file.write(text)
+
+    def close(self):
+        self.file.close()
+
+
+class MemorySink(object):
+    """Keeps the input file in memory, e.g. for tests and caching.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+
+    """
+
+    def __init__(self):
+        self.file = StringIO()
+
+    def open(self):
+        self.file.seek(0)
+        self.file.truncate()
+
+    def write(self, text):
+        self.file.write(text)
+
+    def close(self):
+        pass
+
+    def getvalue(self):
+        """Returns the written input file as a string."""
+
+        return self.file.getvalue()
+
+
+class PipeSink(object):
+    """Streams the input file into the stdin of a running solver process.
+
+    Parameters
+    ----------
+    process : obj
+        subprocess.Popen object started with stdin=PIPE.
+    encoding : str
+        Encoding for binary pipes.
+    close_stdin : bool
+        Close the stdin of the process once the input file is written.
+
+    Returns
+    -------
+    None
+
+    """
+
+    def __init__(self, process, encoding='utf-8', close_stdin=True):
+        self.process = process
+        self.encoding = encoding
+        self.close_stdin = close_stdin
+        self.binary = not isinstance(process.stdin, TextIOBase)
+
+    def open(self):
+        pass
+
+    def write(self, text):
+        if self.binary:
+            text = text.encode(self.encoding)
+        self.process.stdin.write(text)
+
+    def close(self):
+        self.process.stdin.flush()
+        if self.close_stdin:
+            self.process.stdin.close()
+
+
 class Writer(Steps, Materials, BCs, Sets, Elements, Nodes, Heading, Results):
     """ Initialises base file writer.
 
     Parameters
     ----------
-    None
+    structure : obj
+        The Structure object to write.
+    software : str
+        Analysis software, 'ansys_sel'.
+    filename : str
+        Path of the input file, used when no sink is given.
+    fields : list
+        Data field requests.
+    ndof : int
+        Number of degrees of freedom per node.
+    full_precision : bool
+        Write node co-ordinates with full double precision instead of 3 decimals.
+    sink : obj
+        FileSink, MemorySink or PipeSink the input file is written to, defaults to a FileSink of filename.
+    buffer_lines : int
+        Number of lines collected before they are passed to the sink at once.
+    cache : str
+        Folder of the section include files, None to write all sections into the input file.
 
     Returns
     -------
@@ -42,30 +234,45 @@ class Writer(Steps, Materials, BCs, Sets, Elements, Nodes, Heading, Results):
 
     """
 
-    def __init__(self, structure, software, filename, fields, ndof=6):
+    def __init__(self, structure, software, filename, fields, ndof=6, full_precision=False, sink=None,
+                 buffer_lines=10000, cache=None):
         self.comment = comments[software]
         self.filename = filename
+        self.full_precision = full_precision
         self.ndof = ndof
         self.software = software
         self.structure = structure
         self.fields = fields
         self.spacer = {'abaqus': ', ', 'ansys_sel': ', ', 'opensees': ' ', 'ansys':    ' '}
+        self.sink = sink if sink is not None else FileSink(filename)
+        self.buffer_lines = buffer_lines
+        self.buffer = []
+        self.cache = cache
 
     def __enter__(self):
-        self.file = open(self.filename, 'w')
+        self.sink.open()
         return self
 
     def __exit__(self, type, value, traceback):
-        self.file.close()
+        self.flush()
+        self.sink.close()
+
+    def flush(self):
+        if self.buffer:
+            self.buffer.append('')
+            self.sink.write('\n'.join(self.buffer))
+            self.buffer = []
 
     def blank_line(self):
-        self.file.write('{0}\n'.format(self.comment))
+        self.write_line(self.comment)
 
     def divider_line(self):
-        self.file.write('{0}------------------------------------------------------------------\n'.format(self.comment))
+        self.write_line('{0}------------------------------------------------------------------'.format(self.comment))
 
     def write_line(self, line):
-        self.file.write('{0}\n'.format(line))
+        self.buffer.append(line)
+        if len(self.buffer) >= self.buffer_lines:
+            self.flush()
 
     def write_section(self, section):
         self.divider_line()
@@ -76,3 +283,166 @@ class Writer(Steps, Materials, BCs, Sets, Elements, Nodes, Heading, Results):
         self.write_line('{0} {1}'.format(self.comment, subsection))
         self.write_line('{0}-{1}'.format(self.comment, '-' * len(subsection)))
         self.blank_line()
+
+    def write_cached(self, name, write, *dependencies):
+        """Writes a section through an include file that is reused while its dependencies do not change.
+
+        Parameters
+        ----------
+        name : str
+            Name of the section, e.g. 'nodes'.
+        write : function
+            Writer method that writes the section.
+        dependencies : obj
+            Data the section is rendered from, hashed to key the include file.
+
+        Returns
+        -------
+        None
+
+        Notes
+        -----
+        - Without self.cache the section is written into the input file directly.
+        - The include file is named after the section and the content hash, and read with /INPUT.
+
+        """
+
+        cached = self._cache_file(name, dependencies)
+
+        if not cached:
+            write()
+            return
+
+        fname, path = cached
+
+        if not os.path.exists(path):
+
+            if not os.path.exists(self.cache):
+                os.makedirs(self.cache)
+
+            self.flush()
+            sink, self.sink = self.sink, FileSink(path)
+            self.sink.open()
+
+            try:
+                write()
+                self.flush()
+            except Exception:
+                self.buffer = []
+                self.sink.close()
+                os.remove(path)
+                raise
+            finally:
+                self.sink, sink = sink, self.sink
+
+            sink.close()
+
+        self.write_line('/input,{0},inp,{1}'.format(fname, self.cache))
+
+    def _cache_file(self, name, dependencies):
+
+        if not self.cache:
+            return None
+
+        digest = _digest(compas_fea.__version__, self.software, self.ndof, self.full_precision, name, *dependencies)
+        fname = '{0}_{1}'.format(name, digest)
+
+        return fname, os.path.join(self.cache, fname + '.inp')
+
+    def render(self, write):
+        """Returns the text a writer method writes instead of writing it.
+
+        Parameters
+        ----------
+        write : function
+            Writer method that writes a section.
+
+        Returns
+        -------
+        str
+            The written text.
+
+        """
+
+        self.flush()
+        sink, self.sink = self.sink, MemorySink()
+
+        try:
+            write()
+            self.flush()
+            return self.sink.getvalue()
+        finally:
+            self.buffer = []
+            self.sink = sink
+
+    def write_sections(self, sections, workers=None):
+        """Writes independent sections in order, rendering them in a process pool if workers are given.
+
+        Parameters
+        ----------
+        sections : list
+            (name, dependencies) of each section, written by the method write_[name].
+        workers : int
+            Number of processes, None or 1 to render in this process, forking platforms with Python 3.7+ only.
+
+        Returns
+        -------
+        None
+
+        Notes
+        -----
+        - Each process renders whole sections into its own buffer, the texts are written in the given order so
+          the input file is identical to the serial one.
+        - The processes are forked and inherit the structure, where fork is not available (Windows) or before
+          Python 3.7 the sections are rendered serially, so scripts need no if __name__ == '__main__' guard.
+        - Sections found in the cache are not rendered.
+
+        """
+
+        texts = {}
+        pending = []
+
+        for name, dependencies in sections:
+            cached = self._cache_file(name, dependencies)
+            if not cached or not os.path.exists(cached[1]):
+                pending.append(name)
+
+        if workers and workers > 1 and ProcessPoolExecutor is not None and fork is not None and len(pending) > 1:
+
+            # forked processes inherit the options, the structure is not pickled
+
+            _worker['options'] = (self.structure, self.software, self.fields, self.ndof, self.full_precision)
+            pool = ProcessPoolExecutor(min(workers, len(pending)), mp_context=fork, initializer=_init_worker)
+
+            try:
+                texts = dict(zip(pending, pool.map(_render_section, pending)))
+            finally:
+                pool.shutdown()
+                _worker.clear()
+
+        for name, dependencies in sections:
+            if name not in texts:
+                write = getattr(self, 'write_' + name)
+            elif texts[name]:
+                write = partial(self.write_line, texts[name][:-1])
+            else:
+                write = _write_nothing
+            self.write_cached(name, write, *dependencies)
+
+
+_worker = {}
+
+
+def _init_worker():
+    structure, software, fields, ndof, full_precision = _worker['options']
+    _worker['writer'] = Writer(structure=structure, software=software, filename=None, fields=fields, ndof=ndof,
+                               full_precision=full_precision, sink=MemorySink())
+
+
+def _render_section(name):
+    writer = _worker['writer']
+    return writer.render(getattr(writer, 'write_' + name))
+
+
+def _write_nothing():
+    pass
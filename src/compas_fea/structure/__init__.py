@@ -52,6 +52,17 @@ node
     :toctree: generated/
 
     Node
+    NodeTable
+
+
+locator
+=======
+
+.. autosummary::
+    :toctree: generated/
+
+    GridLocator
+    KDTreeLocator
 
 
 set
@@ -70,6 +81,7 @@ element
     :toctree: generated/
 
     Element
+    ElementTable
     MPCElement
     BeamElement
     SpringElement
@@ -200,6 +212,7 @@ from .displacement import (
 )
 from .element import (
     Element,
+    ElementTable,
     MPCElement,
     BeamElement,
     SpringElement,
@@ -249,7 +262,8 @@ from .misc import (
     Amplitude,
     Temperatures
 )
-from .node import Node
+from .node import Node, NodeTable
+from .locator import GridLocator, KDTreeLocator
 from .section import (
     Section,
     AngleSection,
@@ -300,6 +314,7 @@ __all__ = [
     'RollerDisplacementXZ',
 
     'Element',
+    'ElementTable',
     'MPCElement'
     'BeamElement',
     'SpringElement',
@@ -346,6 +361,9 @@ __all__ = [
     'CMMUsermat',
 
     'Node',
+    'NodeTable',
+    'GridLocator',
+    'KDTreeLocator',
 
     'Misc',
     'Amplitude',
@@ -4,10 +4,23 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from scipy.sparse import csr_matrix
+except ImportError:
+    pass
+
 
 __all__ = [
     'Element',
-    'MPCElement'
+    'ElementTable',
+    'MPCElement',
     'BeamElement',
     'SpringElement',
     'TrussElement',
@@ -55,16 +68,128 @@ class Element(object):
     element_property : str
         Element property name
 
+    Notes
+    -----
+    - An Element is a view on one row of an ElementTable, reading and writing its attributes goes through the table.
+    - An Element created directly owns a single row table of its own.
+    - Other attributes set on an Element are kept by the table, in ElementTable.attributes.
+
     """
 
-    def __init__(self, nodes=None, number=None, thermal=None, axes={}):
+    __name__ = 'Element'
+    __slots__ = ('number', '_table', '_row')
+
+    def __init__(self, nodes=None, number=None, thermal=None, axes=None):
 
-        self.__name__ = 'Element'
-        self.nodes = nodes
         self.number = number
-        self.thermal = thermal
-        self.axes = axes
-        self.element_property = None
+        self._table = ElementTable()
+        self._row = 0
+        self._table.append(0, type=self.__name__, nodes=nodes or [], thermal=thermal, axes=axes)
+
+    @classmethod
+    def from_table(cls, table, key):
+        """Returns an Element view on an existing row of an ElementTable.
+
+        Parameters
+        ----------
+        table : obj
+            ElementTable object.
+        key : int
+            Element key number, equal to the row of the table.
+
+        Returns
+        -------
+        obj
+            Element view.
+
+        """
+
+        element = cls.__new__(cls)
+        object.__setattr__(element, 'number', key)
+        object.__setattr__(element, '_table', table)
+        object.__setattr__(element, '_row', key)
+        return element
+
+    def __getstate__(self):
+        return self.number, self._table, self._row
+
+    def __setstate__(self, state):
+        if isinstance(state, dict):
+            # An Element pickled before ElementTable, keeping its attributes in __dict__
+            state = dict(state)
+            state.pop('__name__', None)
+            table = ElementTable()
+            table.append(0, type=self.__name__, nodes=state.pop('nodes', None) or [], thermal=state.pop('thermal', None),
+                         axes=state.pop('axes', None), mass=state.pop('mass', None))
+            table.set_property([0], state.pop('element_property', None))
+            number = state.pop('number', None)
+            if state:
+                table.attributes[0] = state
+            state = number, table, 0
+        self.number, self._table, self._row = state
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return self._table.attributes[self._row][name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        try:
+            object.__setattr__(self, name, value)
+        except AttributeError:
+            self._table.unshare()
+            self._table.attributes.setdefault(self._row, {})[name] = value
+
+    def _get_nodes(self):
+        return self._table.get_nodes(self._row)
+
+    def _set_nodes(self, value):
+        self._table.set_nodes(self._row, value or [])
+
+    def _get_thermal(self):
+        return self._row in self._table.thermal
+
+    def _set_thermal(self, value):
+        self._table.unshare()
+        if value:
+            self._table.thermal.add(self._row)
+        else:
+            self._table.thermal.discard(self._row)
+
+    def _get_axes(self):
+        return self._table.axes.get(self._row, {})
+
+    def _set_axes(self, value):
+        self._table.unshare()
+        if value:
+            self._table.axes[self._row] = dict(value)
+        else:
+            self._table.axes.pop(self._row, None)
+
+    def _get_mass(self):
+        return self._table.mass.get(self._row)
+
+    def _set_mass(self, value):
+        self._table.unshare()
+        if value is not None:
+            self._table.mass[self._row] = value
+        else:
+            self._table.mass.pop(self._row, None)
+
+    def _get_element_property(self):
+        return self._table.get_property(self._row)
+
+    def _set_element_property(self, value):
+        self._table.set_property([self._row], value)
+
+    nodes = property(_get_nodes, _set_nodes)
+    thermal = property(_get_thermal, _set_thermal)
+    axes = property(_get_axes, _set_axes)
+    mass = property(_get_mass, _set_mass)
+    element_property = property(_get_element_property, _set_element_property)
 
     def __str__(self):
         print('\n')
@@ -94,11 +219,12 @@ class MassElement(Element):
 
     """
 
+    __name__ = 'MassElement'
+    __slots__ = ()
+
     def __init__(self):
         Element.__init__(self)
 
-        self.__name__ = 'MassElement'
-
 
 # ==============================================================================
 # 1D elements
@@ -114,11 +240,12 @@ class MPCElement(Element):
 
     """
 
+    __name__ = 'MPCElement'
+    __slots__ = ()
+
     def __init__(self):
         Element.__init__(self)
 
-        self.__name__ = 'MPCElement'
-
 class BeamElement(Element):
 
     """A 1D element that resists axial, shear, bending and torsion.
@@ -129,11 +256,12 @@ class BeamElement(Element):
 
     """
 
+    __name__ = 'BeamElement'
+    __slots__ = ()
+
     def __init__(self):
         Element.__init__(self)
 
-        self.__name__ = 'BeamElement'
-
 
 class SpringElement(Element):
 
@@ -145,11 +273,12 @@ class SpringElement(Element):
 
     """
 
+    __name__ = 'SpringElement'
+    __slots__ = ()
+
     def __init__(self):
         Element.__init__(self)
 
-        self.__name__ = 'SpringElement'
-
 
 class TrussElement(Element):
 
@@ -161,11 +290,12 @@ class TrussElement(Element):
 
     """
 
+    __name__ = 'TrussElement'
+    __slots__ = ()
+
     def __init__(self):
         Element.__init__(self)
 
-        self.__name__ = 'TrussElement'
-
 
 class StrutElement(TrussElement):
 
@@ -177,11 +307,12 @@ class StrutElement(TrussElement):
 
     """
 
+    __name__ = 'StrutElement'
+    __slots__ = ()
+
     def __init__(self):
         TrussElement.__init__(self)
 
-        self.__name__ = 'StrutElement'
-
 
 class TieElement(TrussElement):
 
@@ -193,11 +324,12 @@ class TieElement(TrussElement):
 
     """
 
+    __name__ = 'TieElement'
+    __slots__ = ()
+
     def __init__(self):
         TrussElement.__init__(self)
 
-        self.__name__ = 'TieElement'
-
 
 # ==============================================================================
 # 2D elements
@@ -213,11 +345,12 @@ class ShellElement(Element):
 
     """
 
+    __name__ = 'ShellElement'
+    __slots__ = ()
+
     def __init__(self):
         Element.__init__(self)
 
-        self.__name__ = 'ShellElement'
-
 
 class FaceElement(Element):
 
@@ -229,11 +362,12 @@ class FaceElement(Element):
 
     """
 
+    __name__ = 'FaceElement'
+    __slots__ = ()
+
     def __init__(self):
         Element.__init__(self)
 
-        self.__name__ = 'FaceElement'
-
 
 class MembraneElement(ShellElement):
 
@@ -245,11 +379,12 @@ class MembraneElement(ShellElement):
 
     """
 
+    __name__ = 'MembraneElement'
+    __slots__ = ()
+
     def __init__(self):
         ShellElement.__init__(self)
 
-        self.__name__ = 'MembraneElement'
-
 
 # ==============================================================================
 # 3D elements
@@ -265,11 +400,12 @@ class SolidElement(Element):
 
     """
 
+    __name__ = 'SolidElement'
+    __slots__ = ()
+
     def __init__(self):
         Element.__init__(self)
 
-        self.__name__ = 'SolidElement'
-
 
 class PentahedronElement(SolidElement):
 
@@ -281,11 +417,12 @@ class PentahedronElement(SolidElement):
 
     """
 
+    __name__ = 'PentahedronElement'
+    __slots__ = ()
+
     def __init__(self):
         SolidElement.__init__(self)
 
-        self.__name__ = 'PentahedronElement'
-
 
 class TetrahedronElement(SolidElement):
 
@@ -297,11 +434,12 @@ class TetrahedronElement(SolidElement):
 
     """
 
+    __name__ = 'TetrahedronElement'
+    __slots__ = ()
+
     def __init__(self):
         SolidElement.__init__(self)
 
-        self.__name__ = 'TetrahedronElement'
-
 
 class HexahedronElement(SolidElement):
 
@@ -313,7 +451,470 @@ class HexahedronElement(SolidElement):
 
     """
 
+    __name__ = 'HexahedronElement'
+    __slots__ = ()
+
     def __init__(self):
         SolidElement.__init__(self)
 
-        self.__name__ = 'HexahedronElement'
+
+# ==============================================================================
+# Storage
+# ==============================================================================
+
+ELEMENT_TYPES = [
+    'Element',
+    'MassElement',
+    'MPCElement',
+    'BeamElement',
+    'SpringElement',
+    'TrussElement',
+    'StrutElement',
+    'TieElement',
+    'ShellElement',
+    'FaceElement',
+    'MembraneElement',
+    'SolidElement',
+    'PentahedronElement',
+    'TetrahedronElement',
+    'HexahedronElement',
+]
+
+_type_codes = {name: code for code, name in enumerate(ELEMENT_TYPES)}
+
+
+def _int_dtype(a):
+    return np.dtype('i{0}'.format(a.itemsize))
+
+
+def _extend_bytes(a, data):
+    if hasattr(a, 'frombytes'):
+        a.frombytes(data)
+    else:
+        a.fromstring(data)
+
+
+class ElementTable(object):
+    """Initialises the compressed sparse row element storage of a Structure.
+
+    Parameters
+    ----------
+    None
+
+    Attributes
+    ----------
+    offsets : array
+        Start of each element's nodes in connectivity, with a final entry closing the last element.
+    connectivity : array
+        Node keys of all elements, stored one element after the other.
+    types : array
+        int8 element type code per element, the position in ELEMENT_TYPES, -1 for unused keys.
+    properties : array
+        Element property index per element, the position in property_names, -1 for none.
+    property_names : list
+        Names of the element properties referenced by properties.
+    thermal : set
+        Keys of the elements with thermal properties on.
+    axes : dict
+        Local element axes by element key, for elements with axes only.
+    mass : dict
+        Element masses by element key, for elements with a mass only.
+    attributes : dict
+        Any further attributes set on the elements, by element key.
+    version : int
+        Incremented whenever the connectivity changes, invalidates the cached node to element incidence.
+    shared : bool
+        The columns are shared with another table made by share().
+
+    Notes
+    -----
+    - Element keys are the row numbers of the table, keys used by the virtual elements are left as empty rows.
+    - Indexing the table returns an Element view, so structure.elements[key].nodes keeps working.
+    - A table made by share() uses the same columns, which are copied on the first change to either table.
+
+    """
+
+    def __init__(self):
+
+        self.__name__ = 'ElementTable'
+        self.offsets = array('l', [0])
+        self.connectivity = array('l')
+        self.types = array('b')
+        self.properties = array('l')
+        self.property_names = []
+        self.thermal = set()
+        self.axes = {}
+        self.mass = {}
+        self.attributes = {}
+        self.count = 0
+        self.version = 0
+        self.shared = False
+        self._incidence = {}
+
+    def __len__(self):
+        return self.count
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_incidence'] = {}
+        return state
+
+    def __contains__(self, key):
+        try:
+            key = int(key)
+        except (TypeError, ValueError):
+            return False
+        return 0 <= key < len(self.types) and self.types[key] >= 0
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __getitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        return _element_classes[ELEMENT_TYPES[self.types[int(key)]]].from_table(self, int(key))
+
+    def __setitem__(self, key, element):
+        key = int(key)
+        table, row = element._table, element._row
+        self.append(key, type=element.__name__, nodes=table.get_nodes(row), thermal=row in table.thermal,
+                    axes=table.axes.get(row), mass=table.mass.get(row))
+        self.set_property([key], table.get_property(row))
+        if row in table.attributes:
+            self.attributes[key] = dict(table.attributes[row])
+
+    def __repr__(self):
+        return '{0}({1})'.format(self.__name__, len(self))
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def keys(self):
+        types = self.types
+        if len(types) == self.count:
+            return list(range(self.count))
+        return [key for key in range(len(types)) if types[key] >= 0]
+
+    def values(self):
+        return [self[key] for key in self.keys()]
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def _pad(self, key):
+        n = key - len(self.types)
+        if n > 0:
+            self.offsets.extend(array('l', [self.offsets[-1]]) * n)
+            self.types.extend(array('b', [-1]) * n)
+            self.properties.extend(array('l', [-1]) * n)
+
+    def append(self, key, type, nodes, thermal=False, axes=None, mass=None):
+        """Adds an element row to the table.
+
+        Parameters
+        ----------
+        key : int
+            Element key, keys between the last row and key are left empty.
+        type : str
+            Element type: 'HexahedronElement', 'BeamElement, 'TrussElement' etc.
+        nodes : list
+            Node keys the element connects to.
+        thermal : bool
+            Thermal properties on or off.
+        axes : dict
+            The local element axes.
+        mass : float
+            Element mass.
+
+        Returns
+        -------
+        int
+            Key of the element.
+
+        """
+
+        code = _type_codes[type]
+        nodes = array('l', nodes)
+        key = int(key)
+        self.unshare()
+        self.version += 1
+
+        if key < len(self.types):
+            if self.types[key] < 0:
+                self.count += 1
+            self.types[key] = code
+            self.set_nodes(key, nodes)
+        else:
+            self._pad(key)
+            self.connectivity.extend(nodes)
+            self.offsets.append(len(self.connectivity))
+            self.types.append(code)
+            self.properties.append(-1)
+            self.count += 1
+
+        if thermal:
+            self.thermal.add(key)
+        if axes:
+            self.axes[key] = dict(axes)
+        if mass is not None:
+            self.mass[key] = mass
+
+        return key
+
+    def extend(self, key, type, connectivity, thermal=False, axes=None):
+        """Adds many element rows of the same type and number of nodes to the table.
+
+        Parameters
+        ----------
+        key : int
+            Key of the first element, the others follow sequentially.
+        type : str
+            Element type: 'HexahedronElement', 'BeamElement, 'TrussElement' etc.
+        connectivity : array
+            (m x k) node keys the elements connect to.
+        thermal : bool
+            Thermal properties on or off for all elements.
+        axes : dict
+            The local element axes for all elements.
+
+        Returns
+        -------
+        list
+            [start, stop) range of the added element keys.
+
+        """
+
+        code = _type_codes[type]
+        connectivity = np.asarray(connectivity).reshape(len(connectivity), -1)
+        m, k = connectivity.shape
+        start = int(key)
+
+        if start < len(self.types):
+            raise KeyError('***** Element keys must increase, next key is {0} not {1} *****'.format(len(self.types), start))
+
+        self.unshare()
+        self._pad(start)
+        self.version += 1
+        end = self.offsets[-1]
+        _extend_bytes(self.connectivity, connectivity.astype(_int_dtype(self.connectivity)).tobytes())
+        _extend_bytes(self.offsets, np.arange(end + k, end + k * m + 1, k, dtype=_int_dtype(self.offsets)).tobytes())
+        self.types.extend(array('b', [code]) * m)
+        self.properties.extend(array('l', [-1]) * m)
+        self.count += m
+        stop = start + m
+
+        if thermal:
+            self.thermal.update(range(start, stop))
+        if axes:
+            for i in range(start, stop):
+                self.axes[i] = dict(axes)
+
+        return [start, stop]
+
+    def copy(self):
+        """Returns an independent copy of the table."""
+
+        table = ElementTable()
+        table.offsets = array('l', self.offsets)
+        table.connectivity = array('l', self.connectivity)
+        table.types = array('b', self.types)
+        table.properties = array('l', self.properties)
+        table.property_names = list(self.property_names)
+        table.thermal = set(self.thermal)
+        table.axes = {key: dict(axes) for key, axes in self.axes.items()}
+        table.mass = dict(self.mass)
+        table.attributes = {key: dict(attributes) for key, attributes in self.attributes.items()}
+        table.count = self.count
+        table.version = self.version
+        table._incidence = dict(self._incidence)
+        return table
+
+    def share(self):
+        """Returns a table using the same columns, copied on the first change to either table."""
+
+        table = ElementTable()
+        table.__dict__.update(self.__dict__)
+        table._incidence = dict(self._incidence)
+        self.shared = table.shared = True
+        return table
+
+    def unshare(self):
+        """Copies the columns if they are shared with another table, before changing them."""
+
+        if getattr(self, 'shared', False):
+            copy = self.copy()
+            copy._incidence = self._incidence
+            self.__dict__.update(copy.__dict__)
+
+    def get_nodes(self, key):
+        """Returns the node keys of an element."""
+
+        return self.connectivity[self.offsets[key]:self.offsets[key + 1]].tolist()
+
+    def set_nodes(self, key, nodes):
+        """Sets the node keys of an element, shifting the following elements if their number changes."""
+
+        self.unshare()
+        a, b = self.offsets[key], self.offsets[key + 1]
+        self.connectivity[a:b] = array('l', nodes)
+        self.version += 1
+        shift = len(nodes) - (b - a)
+
+        if shift:
+            offsets = self.offsets
+            for i in range(key + 1, len(offsets)):
+                offsets[i] += shift
+
+    def get_property(self, key):
+        """Returns the element property name of an element, None if not assigned."""
+
+        index = self.properties[key]
+        return self.property_names[index] if index >= 0 else None
+
+    def set_property(self, keys, name):
+        """Sets the element property name of many elements, None removes it."""
+
+        self.unshare()
+
+        if name is None:
+            index = -1
+        elif name in self.property_names:
+            index = self.property_names.index(name)
+        else:
+            index = len(self.property_names)
+            self.property_names.append(name)
+
+        properties = self.properties
+        for key in keys:
+            properties[key] = index
+
+    def csr(self):
+        """Returns the offsets and connectivity as NumPy arrays sharing memory with the table.
+
+        Returns
+        -------
+        array
+            Offsets, element key i connects to connectivity[offsets[i]:offsets[i + 1]].
+        array
+            Node keys of all elements.
+
+        Notes
+        -----
+        - Release the arrays before adding elements, the table cannot be resized while the memory is exported.
+
+        """
+
+        offsets = np.frombuffer(self.offsets, dtype=_int_dtype(self.offsets))
+
+        if not len(self.connectivity):
+            return offsets, np.zeros(0, dtype=np.int64)
+
+        return offsets, np.frombuffer(self.connectivity, dtype=_int_dtype(self.connectivity))
+
+    def node_elements(self, n):
+        """Returns the elements connected to each node, cached until the connectivity changes.
+
+        Parameters
+        ----------
+        n : int
+            Number of nodes.
+
+        Returns
+        -------
+        list
+            Offsets, node key i is connected to elements[offsets[i]:offsets[i + 1]].
+        list
+            Element keys, in ascending order for each node.
+
+        Notes
+        -----
+        - Works without NumPy, returning arrays instead of lists when NumPy is available.
+
+        """
+
+        cached = self._incidence.get('node_elements')
+
+        if cached and cached[0] == (self.version, n):
+            return cached[1], cached[2]
+
+        if np is not None:
+            transpose = self.incidence(n, transpose=True)
+            offsets, elements = transpose.indptr, transpose.indices
+
+        else:
+            offsets = [0] * (n + 1)
+            for node in self.connectivity:
+                offsets[node + 1] += 1
+            for i in range(n):
+                offsets[i + 1] += offsets[i]
+
+            elements = [0] * offsets[-1]
+            position = offsets[:-1]
+            bounds = self.offsets
+            for key in range(len(self.types)):
+                for node in self.connectivity[bounds[key]:bounds[key + 1]]:
+                    elements[position[node]] = key
+                    position[node] += 1
+
+        self._incidence['node_elements'] = ((self.version, n), offsets, elements)
+
+        return offsets, elements
+
+    def incidence(self, n, transpose=False):
+        """Returns the sparse element to node incidence matrix, cached until the connectivity changes.
+
+        Parameters
+        ----------
+        n : int
+            Number of nodes.
+        transpose : bool
+            Return the node to element matrix instead.
+
+        Returns
+        -------
+        obj
+            SciPy csr_matrix of shape (rows, n), or (n, rows) if transposed, with ones at connections.
+
+        Notes
+        -----
+        - Requires SciPy, rows are the element keys including empty rows.
+
+        """
+
+        name = 'transpose' if transpose else 'incidence'
+        cached = self._incidence.get(name)
+
+        if cached and cached[0] == (self.version, n):
+            return cached[1]
+
+        if transpose:
+            matrix = self.incidence(n).transpose().tocsr()
+            matrix.sort_indices()
+        else:
+            offsets, connectivity = self.csr()
+            offsets = offsets.astype(np.int64)
+            matrix = csr_matrix((np.ones(len(connectivity)), connectivity.astype(np.int64), offsets),
+                                shape=(len(offsets) - 1, n))
+
+        self._incidence[name] = ((self.version, n), matrix)
+
+        return matrix
+
+
+_element_classes = {
+    'Element':            Element,
+    'MassElement':        MassElement,
+    'MPCElement':         MPCElement,
+    'BeamElement':        BeamElement,
+    'SpringElement':      SpringElement,
+    'TrussElement':       TrussElement,
+    'StrutElement':       StrutElement,
+    'TieElement':         TieElement,
+    'ShellElement':       ShellElement,
+    'FaceElement':        FaceElement,
+    'MembraneElement':    MembraneElement,
+    'SolidElement':       SolidElement,
+    'PentahedronElement': PentahedronElement,
+    'TetrahedronElement': TetrahedronElement,
+    'HexahedronElement':  HexahedronElement,
+}
@@ -0,0 +1,532 @@
+# Author(s): Compas/Compas FEA Team, Marius  Weber (ETHZ, HSLU T&A)
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from math import floor
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
+
+__all__ = [
+    'GridLocator',
+    'KDTreeLocator',
+]
+
+
+_P1, _P2, _P3 = 73856093, 19349663, 83492791
+_MASK = 2**64 - 1
+
+
+def _hash(i, j, k):
+    return ((i * _P1) ^ (j * _P2) ^ (k * _P3)) & _MASK
+
+
+def _hash_array(ijk):
+    u = np.ascontiguousarray(ijk, dtype=np.int64).view(np.uint64)
+    return (u[:, 0] * np.uint64(_P1)) ^ (u[:, 1] * np.uint64(_P2)) ^ (u[:, 2] * np.uint64(_P3))
+
+
+class GridLocator(object):
+    """Initialises a spatial hash grid for locating nodes within a distance tolerance.
+
+    Parameters
+    ----------
+    nodes : obj
+        NodeTable holding the co-ordinates of the nodes to locate.
+    tol : float
+        Distance tolerance, nodes closer than tol to a query point are found.
+    cell : float
+        Edge length of the grid cells, defaults to 10 * tol.
+
+    Attributes
+    ----------
+    nodes : obj
+        NodeTable holding the co-ordinates of the nodes to locate.
+    tol : float
+        Distance tolerance.
+    cell : float
+        Edge length of the grid cells.
+    cells : dict
+        Node key, or list of node keys, by hash of the integer (i, j, k) cell index.
+    version : int
+        Incremented whenever nodes are added or removed.
+    shared : bool
+        The located nodes are shared with another locator made by share().
+
+    Notes
+    -----
+    - Only the cells overlapped by the tolerance sphere are probed, usually a single one.
+    - Cells sharing a hash share a bucket, candidates are always checked by distance.
+    - Works without NumPy, so it can be used inside Rhino, batches are hashed with NumPy when available.
+
+    """
+
+    def __init__(self, nodes, tol, cell=None):
+
+        self.__name__ = 'GridLocator'
+        self.nodes = nodes
+        self.tol = float(tol)
+        self.cell = float(cell) if cell else 10 * self.tol
+        self.cells = {}
+        self.version = 0
+        self.shared = False
+
+    def __len__(self):
+        return sum(len(keys) if isinstance(keys, list) else 1 for keys in self.cells.values())
+
+    def _index(self, xyz):
+        inv = 1. / self.cell
+        return _hash(int(floor(xyz[0] * inv)), int(floor(xyz[1] * inv)), int(floor(xyz[2] * inv)))
+
+    def copy(self, nodes):
+        """Returns a copy of the grid locating nodes in another NodeTable with the same rows."""
+
+        locator = GridLocator(nodes, tol=self.tol, cell=self.cell)
+        locator.cells = {index: list(item) if isinstance(item, list) else item for index, item in self.cells.items()}
+        return locator
+
+    def share(self, nodes):
+        """Returns a grid using the same cells for another NodeTable sharing its columns, copied on the first change."""
+
+        locator = GridLocator(nodes, tol=self.tol, cell=self.cell)
+        locator.cells = self.cells
+        locator.version = self.version
+        self.shared = locator.shared = True
+        return locator
+
+    def unshare(self):
+        """Copies the cells if they are shared with another grid, before changing them."""
+
+        if getattr(self, 'shared', False):
+            self.cells = {index: list(item) if isinstance(item, list) else item for index, item in self.cells.items()}
+            self.shared = False
+
+    def keys(self):
+        """Returns the keys of all located nodes."""
+
+        keys = []
+
+        for item in self.cells.values():
+            if isinstance(item, list):
+                keys.extend(item)
+            else:
+                keys.append(item)
+
+        return keys
+
+    def add(self, key, xyz):
+        """Adds a node to the grid.
+
+        Parameters
+        ----------
+        key : int
+            Node key.
+        xyz : list
+            [x, y, z] co-ordinates of the node.
+
+        Returns
+        -------
+        None
+
+        """
+
+        self.unshare()
+        index = self._index(xyz)
+        item = self.cells.get(index)
+        self.version += 1
+
+        if item is None:
+            self.cells[index] = key
+        elif isinstance(item, list):
+            item.append(key)
+        else:
+            self.cells[index] = [item, key]
+
+    def add_many(self, keys, points):
+        """Adds many nodes to the grid.
+
+        Parameters
+        ----------
+        keys : list, array
+            Node keys.
+        points : list, array
+            [[x, y, z], ..] co-ordinates of the nodes.
+
+        Returns
+        -------
+        None
+
+        """
+
+        if np is None:
+            for key, xyz in zip(keys, points):
+                self.add(key, xyz)
+            return
+
+        self.unshare()
+        self.version += 1
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        index = _hash_array(np.floor(points * (1. / self.cell))).tolist()
+        keys = np.asarray(keys, dtype=np.int64).tolist()
+        unique = set(index)
+
+        if len(unique) == len(index) and unique.isdisjoint(self.cells):
+            self.cells.update(zip(index, keys))
+            return
+
+        cells = self.cells
+
+        for index, key in zip(index, keys):
+            item = cells.get(index)
+            if item is None:
+                cells[index] = key
+            elif isinstance(item, list):
+                item.append(key)
+            else:
+                cells[index] = [item, key]
+
+    def remove(self, key, xyz):
+        """Removes a node from the grid.
+
+        Parameters
+        ----------
+        key : int
+            Node key.
+        xyz : list
+            [x, y, z] co-ordinates the node was added with.
+
+        Returns
+        -------
+        bool
+            True if the node was found and removed.
+
+        """
+
+        self.unshare()
+        index = self._index(xyz)
+        item = self.cells.get(index)
+
+        if isinstance(item, list):
+            if key in item:
+                item.remove(key)
+                if len(item) == 1:
+                    self.cells[index] = item[0]
+                self.version += 1
+                return True
+        elif item == key:
+            del self.cells[index]
+            self.version += 1
+            return True
+
+        return False
+
+    def locate(self, xyz):
+        """Returns the key of the nearest node within tolerance of a point.
+
+        Parameters
+        ----------
+        xyz : list
+            [x, y, z] co-ordinates of the point.
+
+        Returns
+        -------
+        int
+            Node key, None if no node lies within tolerance.
+
+        """
+
+        if not self.cells:
+            return None
+
+        x, y, z = float(xyz[0]), float(xyz[1]), float(xyz[2])
+        tol = self.tol
+        inv = 1. / self.cell
+        i0, i1 = int(floor((x - tol) * inv)), int(floor((x + tol) * inv))
+        j0, j1 = int(floor((y - tol) * inv)), int(floor((y + tol) * inv))
+        k0, k1 = int(floor((z - tol) * inv)), int(floor((z + tol) * inv))
+
+        coords = self.nodes.xyz
+        cells = self.cells
+        found = None
+        dmin = tol * tol
+
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                for k in range(k0, k1 + 1):
+
+                    item = cells.get(_hash(i, j, k))
+
+                    if item is None:
+                        continue
+
+                    for key in (item if isinstance(item, list) else (item,)):
+                        a = 3 * key
+                        dx = coords[a] - x
+                        dy = coords[a + 1] - y
+                        dz = coords[a + 2] - z
+                        d = dx * dx + dy * dy + dz * dz
+                        if d <= dmin:
+                            found, dmin = key, d
+
+        return found
+
+    def locate_many(self, points):
+        """Returns the keys of the nearest nodes within tolerance of many points.
+
+        Parameters
+        ----------
+        points : list
+            [[x, y, z], ..] co-ordinates of the points.
+
+        Returns
+        -------
+        list
+            Node key, or None, for each point.
+
+        """
+
+        if np is None:
+            locate = self.locate
+            return [locate(xyz) for xyz in points]
+
+        return [None if key < 0 else key for key in self.locate_array(points).tolist()]
+
+    def locate_array(self, points):
+        """Returns the keys of the nearest nodes within tolerance of many points as an array.
+
+        Parameters
+        ----------
+        points : list, array
+            [[x, y, z], ..] co-ordinates of the points.
+
+        Returns
+        -------
+        array
+            Node key, or -1, for each point.
+
+        Notes
+        -----
+        - Requires NumPy.
+
+        """
+
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        found = np.full(len(points), -1, dtype=np.int64)
+
+        if not self.cells or not len(points):
+            return found
+
+        tol = self.tol
+        inv = 1. / self.cell
+        lo = np.floor((points - tol) * inv)
+        hi = np.floor((points + tol) * inv)
+        split = lo != hi
+
+        coords = self.nodes.as_array()
+        cells = self.cells
+        dmin = np.full(len(points), tol * tol)
+        fallback = np.zeros(len(points), dtype=bool)
+
+        # Probe the up to 8 cells overlapped by each tolerance sphere, buckets holding several nodes fall back to locate
+
+        for corner in range(8):
+            upper = [bool(corner & 1), bool(corner & 2), bool(corner & 4)]
+            rows = np.flatnonzero(split[:, upper].all(axis=1)) if corner else np.arange(len(points))
+
+            if not len(rows):
+                continue
+
+            index = np.where(upper, hi[rows], lo[rows])
+            items = list(map(cells.get, _hash_array(index).tolist()))
+            keys = np.array([-1 if item is None else -2 if item.__class__ is list else item for item in items], dtype=np.int64)
+            fallback[rows[keys == -2]] = True
+
+            hit = keys >= 0
+            rows, keys = rows[hit], keys[hit]
+            d = ((coords[keys] - points[rows])**2).sum(axis=1)
+            closer = d <= dmin[rows]
+            found[rows[closer]] = keys[closer]
+            dmin[rows[closer]] = d[closer]
+
+        locate = self.locate
+
+        for i in np.flatnonzero(fallback).tolist():
+            key = locate(points[i])
+            found[i] = -1 if key is None else key
+
+        return found
+
+
+class KDTreeLocator(object):
+    """Initialises a KD-tree for locating nodes within a distance tolerance.
+
+    Parameters
+    ----------
+    nodes : obj
+        NodeTable holding the co-ordinates of the nodes to locate.
+    tol : float
+        Distance tolerance, nodes closer than tol to a query point are found.
+
+    Attributes
+    ----------
+    nodes : obj
+        NodeTable holding the co-ordinates of the nodes to locate.
+    tol : float
+        Distance tolerance.
+    located : set
+        Keys of the located nodes.
+    version : int
+        Incremented whenever nodes are added or removed.
+    shared : bool
+        The located nodes are shared with another locator made by share().
+
+    Notes
+    -----
+    - Requires SciPy, the tree is rebuilt lazily on the first query after nodes were added or removed.
+    - Best suited to batched queries on a finished model, use GridLocator while adding nodes one by one.
+
+    """
+
+    def __init__(self, nodes, tol):
+
+        if cKDTree is None:
+            raise ImportError('***** KDTreeLocator requires SciPy, use the grid locator instead *****')
+
+        self.__name__ = 'KDTreeLocator'
+        self.nodes = nodes
+        self.tol = float(tol)
+        self.located = set()
+        self.version = 0
+        self.shared = False
+        self._tree = None
+        self._keys = None
+
+    def __len__(self):
+        return len(self.located)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_tree'] = None
+        state['_keys'] = None
+        return state
+
+    def copy(self, nodes):
+        """Returns a copy of the tree locating nodes in another NodeTable with the same rows."""
+
+        locator = KDTreeLocator(nodes, tol=self.tol)
+        locator.located = set(self.located)
+        return locator
+
+    def share(self, nodes):
+        """Returns a tree using the same located keys for another NodeTable sharing its columns, copied on the first change."""
+
+        locator = KDTreeLocator(nodes, tol=self.tol)
+        locator.located = self.located
+        locator.version = self.version
+        self.shared = locator.shared = True
+        return locator
+
+    def unshare(self):
+        """Copies the located keys if they are shared with another tree, before changing them."""
+
+        if getattr(self, 'shared', False):
+            self.located = set(self.located)
+            self.shared = False
+
+    def keys(self):
+        """Returns the keys of all located nodes."""
+
+        return sorted(self.located)
+
+    def add(self, key, xyz):
+        """Adds a node to the tree."""
+
+        self.unshare()
+        self.located.add(key)
+        self.version += 1
+        self._tree = None
+
+    def add_many(self, keys, points):
+        """Adds many nodes to the tree."""
+
+        self.unshare()
+        self.located.update(int(key) for key in keys)
+        self.version += 1
+        self._tree = None
+
+    def remove(self, key, xyz):
+        """Removes a node from the tree, returns True if it was located."""
+
+        if key not in self.located:
+            return False
+
+        self.unshare()
+        self.located.discard(key)
+        self.version += 1
+        self._tree = None
+
+        return True
+
+    def _build(self):
+        self._keys = np.array(sorted(self.located), dtype=np.int64)
+        self._tree = cKDTree(self.nodes.as_array()[self._keys])
+
+    def locate(self, xyz):
+        """Returns the key of the nearest node within tolerance of a point."""
+
+        return self.locate_many([xyz])[0]
+
+    def locate_many(self, points):
+        """Returns the keys of the nearest nodes within tolerance of many points.
+
+        Parameters
+        ----------
+        points : list, array
+            [[x, y, z], ..] co-ordinates of the points.
+
+        Returns
+        -------
+        list
+            Node key, or None, for each point.
+
+        """
+
+        return [None if key < 0 else key for key in self.locate_array(points).tolist()]
+
+    def locate_array(self, points):
+        """Returns the keys of the nearest nodes within tolerance of many points as an array.
+
+        Parameters
+        ----------
+        points : list, array
+            [[x, y, z], ..] co-ordinates of the points.
+
+        Returns
+        -------
+        array
+            Node key, or -1, for each point.
+
+        """
+
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+
+        if not self.located or not len(points):
+            return np.full(len(points), -1, dtype=np.int64)
+
+        if self._tree is None:
+            self._build()
+
+        d, i = self._tree.query(points, distance_upper_bound=self.tol)
+        found = np.isfinite(d)
+
+        return np.where(found, self._keys[np.where(found, i, 0)], -1)
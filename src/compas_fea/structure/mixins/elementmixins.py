@@ -7,49 +7,23 @@ from __future__ import print_function
 from compas.geometry import centroid_points
 from compas.utilities import geometric_key
 
-from compas_fea.structure.element import MPCElement
-from compas_fea.structure.element import BeamElement
-from compas_fea.structure.element import SpringElement
-from compas_fea.structure.element import TrussElement
-from compas_fea.structure.element import StrutElement
-from compas_fea.structure.element import TieElement
-from compas_fea.structure.element import ShellElement
-from compas_fea.structure.element import MembraneElement
-from compas_fea.structure.element import FaceElement
-from compas_fea.structure.element import SolidElement
-from compas_fea.structure.element import TetrahedronElement
-from compas_fea.structure.element import PentahedronElement
-from compas_fea.structure.element import HexahedronElement
-from compas_fea.structure.element import MassElement
+from compas_fea.structure.element import ELEMENT_TYPES
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 __all__ = [
     'ElementMixins',
 ]
 
-func_dict = {
-    'MPCElement':         MPCElement,
-    'BeamElement':        BeamElement,
-    'SpringElement':      SpringElement,
-    'TrussElement':       TrussElement,
-    'StrutElement':       StrutElement,
-    'TieElement':         TieElement,
-    'ShellElement':       ShellElement,
-    'MembraneElement':    MembraneElement,
-    'FaceElement':        FaceElement,
-    'SolidElement':       SolidElement,
-    'TetrahedronElement': TetrahedronElement,
-    'PentahedronElement': PentahedronElement,
-    'HexahedronElement':  HexahedronElement,
-    'MassElement':        MassElement
-}
-
 
 class ElementMixins(object):
 
     def add_element(self, nodes, type, thermal=False, axes={}, mass=None):
-        """Adds an element to structure.elements with centroid geometric key.
+        """Adds an element to structure.elements, indexed by its sorted node keys.
 
         Parameters
         ----------
@@ -81,15 +55,9 @@ class ElementMixins(object):
 
             if ekey is None:
 
-                ekey = self.element_count()
-                element = func_dict[type]()
-                element.axes = axes
-                element.nodes = nodes
-                element.number = ekey
-                element.thermal = thermal
-                element.mass = mass
-                self.elements[ekey] = element
-
+                self._unshare('elements')
+                ekey = self.elements.append(self.element_count(), type=type, nodes=nodes, thermal=thermal, axes=axes,
+                                            mass=mass)
                 self.add_element_to_element_index(ekey, nodes)
 
             return ekey
@@ -103,8 +71,8 @@ class ElementMixins(object):
 
         Parameters
         ----------
-        elements : list
-            List of lists of the nodes the elements are connected to.
+        elements : list, array
+            List of lists, or (m x k) array, of the nodes the elements are connected to.
         type : str
             Element type: 'HexahedronElement', 'BeamElement, 'TrussElement' etc.
         thermal : bool
@@ -120,12 +88,91 @@ class ElementMixins(object):
         Notes
         -----
         - Elements are numbered sequentially starting from 0.
+        - With NumPy, elements with equal numbers of nodes are indexed in one batch, see add_elements_array.
 
         """
 
+        if np is not None and len(elements):
+            try:
+                connectivity = np.asarray(elements, dtype=np.int64)
+            except ValueError:
+                connectivity = None
+            if connectivity is not None and connectivity.ndim == 2:
+                return self.add_elements_array(connectivity, type=type, thermal=thermal, axes=axes)
+
         return [self.add_element(nodes=nodes, type=type, thermal=thermal, axes=axes) for nodes in elements]
 
-    def add_element_to_element_index(self, key, nodes, virtual=False):
+    def add_elements_array(self, connectivity, type, thermal=False, axes={}):
+        """Adds an array of elements of the same type to structure.elements in one batch.
+
+        Parameters
+        ----------
+        connectivity : array
+            (m x k) nodes the elements are connected to.
+        type : str
+            Element type: 'HexahedronElement', 'BeamElement, 'TrussElement' etc.
+        thermal : bool
+            Thermal properties on or off.
+        axes : dict
+            The local element axes 'ex', 'ey' and 'ez' for all elements.
+
+        Returns
+        -------
+        list
+            Keys of the added or existing elements, None for elements with repeated nodes.
+
+        Notes
+        -----
+        - Requires NumPy.
+        - Rows are sorted in one go to give the element_index keys.
+        - With an active centroid index, all centroids are computed with one gather and mean over the node co-ordinates.
+
+        """
+
+        if type not in ELEMENT_TYPES:
+            raise KeyError(type)
+
+        self._unshare('elements')
+        connectivity = np.asarray(connectivity, dtype=np.int64)
+        ordered = np.sort(connectivity, axis=1)
+        valid = (np.diff(ordered, axis=1) != 0).all(axis=1).tolist()
+        ckeys = list(map(tuple, ordered.tolist()))
+
+        centroid_index = self.element_centroid_index
+
+        if centroid_index is not None:
+            gkeys = _geometric_keys(self.nodes.as_array()[connectivity].mean(axis=1), self.tol)
+        else:
+            gkeys = ckeys
+
+        index = self.element_index
+        ekey = start = self.element_count()
+        new = []
+        keys = []
+
+        for row, (ckey, gkey, ok) in enumerate(zip(ckeys, gkeys, valid)):
+
+            if not ok:
+                keys.append(None)
+                continue
+
+            key = index.get(ckey)
+
+            if key is None:
+                key = index[ckey] = ekey
+                if centroid_index is not None:
+                    centroid_index.setdefault(gkey, key)
+                new.append(row)
+                ekey += 1
+
+            keys.append(key)
+
+        if new:
+            self.elements.extend(start, type=type, connectivity=connectivity[new], thermal=thermal, axes=axes)
+
+        return keys
+
+    def add_element_to_element_index(self, key, nodes, virtual=False, xyz=None):
         """Adds the element to the element_index dictionary.
 
         Parameters
@@ -136,6 +183,8 @@ class ElementMixins(object):
             Node numbers the element is connected to.
         virtual: bool
             If true, adds element to the virtual_element_index dictionary.
+        xyz : list
+            Co-ordinates of the element centroid, only used by an active centroid index.
 
         Returns
         -------
@@ -143,13 +192,85 @@ class ElementMixins(object):
 
         """
 
-        centroid = centroid_points([self.node_xyz(node) for node in nodes])
-        gkey = geometric_key(centroid, '{0}f'.format(self.tol))
+        self._unshare('elements')
+
+        if virtual:
+            self.virtual_element_index[tuple(sorted(nodes))] = key
+            centroid_index = self.virtual_element_centroid_index
+        else:
+            self.element_index[tuple(sorted(nodes))] = key
+            centroid_index = self.element_centroid_index
+
+        if centroid_index is not None:
+            if not xyz:
+                xyz = centroid_points([self.node_xyz(node) for node in nodes])
+            centroid_index.setdefault(geometric_key(xyz, '{0}f'.format(self.tol)), key)
+
+    def build_element_centroid_index(self, virtual=False):
+        """Builds the secondary index of elements by centroid geometric key, kept up to date afterwards.
+
+        Parameters
+        ----------
+        virtual: bool
+            Build the index of the virtual elements instead.
+
+        Returns
+        -------
+        dict
+            Element keys by centroid geometric key.
+
+        Notes
+        -----
+        - Built on the first centroid query of check_element_exists, not needed for node based queries.
+
+        """
+
+        elements = self.virtual_elements if virtual else self.elements
+        precision = '{0}f'.format(self.tol)
+        centroid_index = {}
+
+        for key in sorted(elements):
+            xyz = centroid_points([self.node_xyz(node) for node in elements[key].nodes])
+            centroid_index.setdefault(geometric_key(xyz, precision), key)
 
         if virtual:
-            self.virtual_element_index[gkey] = key
+            self.virtual_element_centroid_index = centroid_index
         else:
-            self.element_index[gkey] = key
+            self.element_centroid_index = centroid_index
+
+        return centroid_index
+
+    def remove_element_centroids(self, keys, virtual=False):
+        """Removes elements from the centroid index, before their nodes move.
+
+        Parameters
+        ----------
+        keys : list
+            Keys of the elements to remove.
+        virtual: bool
+            Remove virtual elements from the virtual element centroid index.
+
+        Returns
+        -------
+        None
+
+        """
+
+        centroid_index = self.virtual_element_centroid_index if virtual else self.element_centroid_index
+
+        if centroid_index is None:
+            return
+
+        self._unshare('elements')
+        centroid_index = self.virtual_element_centroid_index if virtual else self.element_centroid_index
+        elements = self.virtual_elements if virtual else self.elements
+        precision = '{0}f'.format(self.tol)
+
+        for key in keys:
+            xyz = centroid_points(self.nodes_xyz(elements.get_nodes(key)))
+            gkey = geometric_key(xyz, precision)
+            if centroid_index.get(gkey) == key:
+                del centroid_index[gkey]
 
     def check_element_exists(self, nodes=None, xyz=None, virtual=False):
         """Check if an element already exists based on nodes or centroid.
@@ -170,19 +291,23 @@ class ElementMixins(object):
 
         Notes
         -----
-        - Geometric key check is made according to self.tol [m] tolerance.
+        - Nodes are matched on the sorted node key tuple, regardless of their order.
+        - A centroid is matched by geometric key according to self.tol [m] tolerance, using the centroid index.
 
         """
 
-        if not xyz:
-            xyz = centroid_points([self.node_xyz(node) for node in nodes])
+        if nodes is not None:
+            if None in nodes:
+                return None
+            index = self.virtual_element_index if virtual else self.element_index
+            return index.get(tuple(sorted(nodes)), None)
 
-        gkey = geometric_key(xyz, '{0}f'.format(self.tol))
+        centroid_index = self.virtual_element_centroid_index if virtual else self.element_centroid_index
 
-        if virtual:
-            return self.virtual_element_index.get(gkey, None)
-        else:
-            return self.element_index.get(gkey, None)
+        if centroid_index is None:
+            centroid_index = self.build_element_centroid_index(virtual=virtual)
+
+        return centroid_index.get(geometric_key(xyz, '{0}f'.format(self.tol)), None)
 
     def edit_element(self):
         raise NotImplementedError
@@ -219,6 +344,49 @@ class ElementMixins(object):
         """
         return centroid_points(self.nodes_xyz(nodes=self.elements[element].nodes))
 
+    def node_elements(self, node):
+        """Return the elements connected to a node.
+
+        Parameters
+        ----------
+        node : int
+            Node number.
+
+        Returns
+        -------
+        list
+            Keys of the elements connected to the node, in ascending order.
+
+        Notes
+        -----
+        - Uses the node to element incidence cached by structure.elements until the elements change.
+
+        """
+
+        offsets, elements = self.elements.node_elements(self.node_count())
+        return [int(i) for i in elements[offsets[node]:offsets[node + 1]]]
+
+    def incidence(self, transpose=False):
+        """Return the sparse element to node incidence matrix.
+
+        Parameters
+        ----------
+        transpose : bool
+            Return the node to element matrix instead.
+
+        Returns
+        -------
+        obj
+            SciPy csr_matrix with a row per element key and a column per node, or its transpose.
+
+        Notes
+        -----
+        - The matrix is cached by structure.elements until the elements change, do not modify it in place.
+
+        """
+
+        return self.elements.incidence(self.node_count(), transpose=transpose)
+
     def add_nodal_element(self, node, type, virtual_node=False):
         """Adds a nodal element to structure.elements with the possibility of
         adding a coincident virtual node. Virtual nodes are added to a node
@@ -243,6 +411,8 @@ class ElementMixins(object):
         - Elements are numbered sequentially starting from 0.
 
         """
+        self._unshare('nodes', 'elements')
+
         if virtual_node:
             xyz = self.node_xyz(node)
             key = self.virtual_nodes.setdefault(node, self.node_count())
@@ -256,16 +426,10 @@ class ElementMixins(object):
         else:
             nodes = [node]
 
-        func_dict = {
-            'SpringElement': SpringElement,
-        }
+        if type != 'SpringElement':
+            raise NotImplementedError
 
-        ekey = self.element_count()
-        element = func_dict[type]()
-        element.nodes = nodes
-        element.number = ekey
-        self.elements[ekey] = element
-        return ekey
+        return self.elements.append(self.element_count(), type=type, nodes=nodes)
 
     def add_virtual_element(self, nodes, type, thermal=False, axes={}):
         """Adds a virtual element to structure.elements and to element set 'virtual_elements'.
@@ -295,14 +459,8 @@ class ElementMixins(object):
 
         if ekey is None:
 
-            ekey = self.element_count()
-            element = func_dict[type]()
-            element.axes = axes
-            element.nodes = nodes
-            element.number = ekey
-            element.thermal = thermal
-
-            self.virtual_elements[ekey] = element
+            self._unshare('elements')
+            ekey = self.virtual_elements.append(self.element_count(), type=type, nodes=nodes, thermal=thermal, axes=axes)
             self.add_element_to_element_index(ekey, nodes, virtual=True)
 
             if 'virtual_elements' in self.sets:
@@ -331,5 +489,20 @@ class ElementMixins(object):
         else:
             elements = element_property.elements
 
-        for element in elements:
-            self.elements[element].element_property = element_property.name
+        self._unshare('elements')
+        self.elements.set_property(elements, element_property.name)
+
+
+def _geometric_keys(points, tol):
+    """Returns the geometric keys of many points, equal to geometric_key for each point."""
+
+    fmt = '{{0:.{0}f}},{{1:.{0}f}},{{2:.{0}f}}'.format(tol)
+    minzero = '-{0:.{1}f}'.format(0., tol)
+    precision = '{0}f'.format(tol)
+    gkeys = []
+
+    for xyz in points.tolist():
+        gkey = fmt.format(*xyz)
+        gkeys.append(geometric_key(xyz, precision) if minzero in gkey else gkey)
+
+    return gkeys
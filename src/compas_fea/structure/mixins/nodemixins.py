@@ -4,15 +4,32 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
-from compas_fea.structure import Node
+from math import floor
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
 
 from compas.utilities import geometric_key
 
+from compas_fea.structure.locator import GridLocator
+from compas_fea.structure.locator import KDTreeLocator
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
 
 
 __all__ = [
     'NodeMixins',
+    'NodeIndex',
 ]
 
 
@@ -51,8 +68,8 @@ class NodeMixins(object):
 
         if key is None:
 
-            key = self.node_count()
-            self.nodes[key] = Node(key=key, xyz=xyz, ex=ex, ey=ey, ez=ez, mass=mass)
+            self._unshare('nodes')
+            key = self.nodes.append(xyz=xyz, ex=ex, ey=ey, ez=ez, mass=mass)
 
             if virtual:
                 self.add_node_to_node_index(key=key, xyz=xyz, virtual=True)
@@ -83,13 +100,121 @@ class NodeMixins(object):
         Notes
         -----
         - Nodes are numbered sequentially starting from 0.
+        - Uses the vectorised add_nodes_array when NumPy is available.
+
+        """
+
+        if np is None:
+            return [self.add_node(xyz=node, ex=ex, ey=ey, ez=ez) for node in nodes]
+
+        return self.add_nodes_array(nodes, ex=ex, ey=ey, ez=ez).tolist()
+
+    def add_nodes_array(self, xyz, ex=[1, 0, 0], ey=[0, 1, 0], ez=[0, 0, 1]):
+        """ Adds an array of nodes to structure.nodes in one batch, all with local frame [ex, ey, ez].
+
+        Parameters
+        ----------
+        xyz : array
+            (n x 3) co-ordinates of the nodes.
+        ex : list
+            Nodes' local x axis.
+        ey : list
+            Nodes' local y axis.
+        ez : list
+            Nodes' local z axis.
+
+        Returns
+        -------
+        array
+            Keys of the added or pre-existing nodes, one per row of xyz.
+
+        Notes
+        -----
+        - Requires NumPy.
+        - Rows are merged with the node locator's distance tolerance exactly as successive add_node calls would,
+          each row takes the nearest existing or earlier added node within tolerance, new nodes are numbered by
+          first appearance.
 
         """
 
-        return [self.add_node(xyz=node, ex=ex, ey=ey, ez=ez) for node in nodes]
+        xyz = np.asarray(xyz, dtype=np.float64).reshape(-1, 3)
+
+        if not len(xyz):
+            return np.zeros(0, dtype=np.int64)
+
+        first, inverse = _unique_rows(xyz + 0.)
+        unique = xyz[first]
+
+        keys = self.node_locator.locate_array(unique)
+        new = keys < 0
+        merged = _merge_near_rows(unique, self.node_locator.tol, keys, self.nodes.as_array())
+
+        if len(merged):
+            new[merged[:, 0]] = False
+
+        if new.any():
+            self._unshare('nodes')
+            start, stop = self.nodes.extend(unique[new], ex=ex, ey=ey, ez=ez)
+            keys[new] = np.arange(start, stop)
+            self.node_locator.add_many(keys[new], unique[new])
+
+        if len(merged):
+            keys[merged[:, 0]] = keys[merged[:, 1]]
+
+        return keys[inverse]
+
+    def set_node_locator(self, locator='grid', tol=None):
+        """ Sets the spatial index used to find existing nodes and indexes all non-virtual nodes.
+
+        Parameters
+        ----------
+        locator : str
+            'grid' for a GridLocator or 'kdtree' for a KDTreeLocator (requires SciPy).
+        tol : float
+            Distance tolerance, defaults to half the rounding step of self.tol decimals.
+
+        Returns
+        -------
+        None
+
+        Notes
+        -----
+        - 'grid' suits adding nodes one by one, 'kdtree' suits batched queries on a finished model.
+
+        """
+
+        if tol is None:
+            tol = 0.5 * 10**-int(self.tol)
+
+        located = self.node_locator.keys() if getattr(self, 'node_locator', None) else []
+
+        if locator == 'grid':
+            self.node_locator = GridLocator(self.nodes, tol=tol)
+        elif locator == 'kdtree':
+            self.node_locator = KDTreeLocator(self.nodes, tol=tol)
+        else:
+            raise NotImplementedError
+
+        if located:
+            self.node_locator.add_many(located, self.nodes_xyz(located))
+
+    @property
+    def node_index(self):
+        """ Read-only geometric key index of the located nodes, cached until the node locator changes.
+        """
+
+        locator = self.node_locator
+        cache = getattr(self, '_node_index', None)
+
+        if cache is None or cache[0] is not locator or cache[1] != locator.version:
+            precision = '{0}f'.format(self.tol)
+            index = {geometric_key(self.node_xyz(key), precision): key for key in locator.keys()}
+            cache = self._node_index = (locator, locator.version, NodeIndex(index))
+
+        return cache[2]
 
     def add_node_to_node_index(self, key, xyz, virtual=False):
-        """ Adds the node to the node_index dictionary.
+        """ Adds the node to the node locator, or to the virtual_node_index dictionary.
 
         Parameters
         ----------
@@ -106,11 +231,10 @@ class NodeMixins(object):
 
         """
 
-        gkey = geometric_key(xyz, '{0}f'.format(self.tol))
         if virtual:
-            self.virtual_node_index[gkey] = key
+            self.virtual_node_index[geometric_key(xyz, '{0}f'.format(self.tol))] = key
         else:
-            self.node_index[gkey] = key
+            self.node_locator.add(key, xyz)
 
     def check_node_exists(self, xyz):
         """ Check if a node already exists at given x, y, z co-ordinates.
@@ -127,12 +251,28 @@ class NodeMixins(object):
 
         Notes
         -----
-        - Geometric key check is made according to self.tol [m] tolerance.
+        - The nearest node within the node locator's distance tolerance is returned.
 
         """
 
-        xyz = [float(i) for i in xyz]
-        return self.node_index.get(geometric_key(xyz, '{0}f'.format(self.tol)), None)
+        return self.node_locator.locate(xyz)
+
+    def check_nodes_exist(self, points):
+        """ Check if nodes already exist at many given x, y, z co-ordinates.
+
+        Parameters
+        ----------
+        points : list
+            [[x, y, z], ..] co-ordinates of the nodes to check.
+
+        Returns
+        -------
+        list
+            The node index, or None, for each point.
+
+        """
+
+        return self.node_locator.locate_many(points)
 
     def edit_node(self, key, attr_dict):
         """ Edit a node's data.
@@ -148,15 +288,77 @@ class NodeMixins(object):
         -------
         None
 
+        Notes
+        -----
+        - Changes to 'x', 'y' or 'z' go through move_nodes, so all indices stay up to date.
+
         """
 
-        gkey = geometric_key(self.node_xyz(key), '{0}f'.format(self.tol))
-        del self.node_index[gkey]
+        self._unshare('nodes')
+        attr_dict = dict(attr_dict)
+        xyz = self.node_xyz(key)
+
+        if any(i in attr_dict for i in 'xyz'):
+            self.move_nodes([key], [[attr_dict.pop(i, j) for i, j in zip('xyz', xyz)]])
 
         for attr, item in attr_dict.items():
             setattr(self.nodes[key], attr, item)
 
-        self.add_node_to_node_index(key, self.node_xyz(key))
+    def move_nodes(self, keys, xyz):
+        """ Moves nodes to new co-ordinates, updating only the indices of the moved nodes and their elements.
+
+        Parameters
+        ----------
+        keys : list
+            Keys of the nodes to move.
+        xyz : list, array
+            [[x, y, z], ..] new co-ordinates of each node.
+
+        Returns
+        -------
+        None
+
+        Notes
+        -----
+        - The element_index is keyed on node keys and is unaffected, active centroid indices are re-keyed for
+          the elements connected to the moved nodes, found with the cached node to element incidence.
+        - Moved nodes are not merged with nodes they come to coincide with.
+
+        """
+
+        keys = [int(key) for key in keys]
+        xyz = [[float(i) for i in point] for point in xyz]
+
+        if len(keys) != len(xyz):
+            raise ValueError('***** The number of keys and co-ordinates must match *****')
+
+        self._unshare('nodes', 'elements')
+
+        affected = []
+
+        for table, virtual in [(self.elements, False), (self.virtual_elements, True)]:
+            if (self.virtual_element_centroid_index if virtual else self.element_centroid_index) is not None:
+                offsets, members = table.node_elements(self.node_count())
+                ekeys = sorted({int(i) for key in keys for i in members[offsets[key]:offsets[key + 1]]})
+                affected.append((table, ekeys, virtual))
+                self.remove_element_centroids(ekeys, virtual=virtual)
+
+        located = [key for key in keys if self.node_locator.remove(key, self.node_xyz(key))]
+
+        if np is not None and len(keys) > 1:
+            coordinates = self.nodes.as_array()
+            coordinates[keys] = xyz
+            del coordinates
+        else:
+            for key, point in zip(keys, xyz):
+                self.nodes.set_xyz(key, point)
+
+        if located:
+            self.node_locator.add_many(located, self.nodes_xyz(located))
+
+        for table, ekeys, virtual in affected:
+            for ekey in ekeys:
+                self.add_element_to_element_index(ekey, table.get_nodes(ekey), virtual=virtual)
 
     def node_bounds(self):
         """ Return the bounds formed by the Structure's nodal co-ordinates.
@@ -176,21 +378,9 @@ class NodeMixins(object):
 
         """
 
-        n = self.node_count()
-        x = [0] * n
-        y = [0] * n
-        z = [0] * n
-
-        for c, node in self.nodes.items():
-            x[c] = node.x
-            y[c] = node.y
-            z[c] = node.z
+        xbounds, ybounds, zbounds = self.nodes.bounds()
 
-        xmin, xmax = min(x), max(x)
-        ymin, ymax = min(y), max(y)
-        zmin, zmax = min(z), max(z)
-
-        return [xmin, xmax], [ymin, ymax], [zmin, zmax]
+        return xbounds, ybounds, zbounds
 
     def node_count(self):
         """ Return the number of nodes in the Structure.
@@ -204,9 +394,13 @@ class NodeMixins(object):
         int
             Number of nodes stored in the Structure object.
 
+        Notes
+        -----
+        - Virtual nodes are rows of structure.nodes and are included in the count.
+
         """
 
-        return len(self.nodes) + len(self.virtual_nodes)
+        return len(self.nodes)
 
     def node_xyz(self, node):
         """ Return the xyz co-ordinates of a node.
@@ -223,7 +417,7 @@ class NodeMixins(object):
 
         """
 
-        return [getattr(self.nodes[node], i) for i in 'xyz']
+        return self.nodes.get_xyz(node)
 
     def nodes_xyz(self, nodes=None):
         """ Return the xyz co-ordinates of given or all nodes.
@@ -240,7 +434,112 @@ class NodeMixins(object):
 
         """
 
-        if nodes is None:
-            nodes = sorted(self.nodes, key=int)
+        return self.nodes.xyz_list(keys=nodes)
+
+
+class NodeIndex(Mapping):
+    """ Read-only geometric key to node key index, see NodeMixins.node_index.
+
+    Parameters
+    ----------
+    index : dict
+        Node key by geometric key.
+
+    """
+
+    def __init__(self, index):
+
+        self.__name__ = 'NodeIndex'
+        self._index = index
+
+    def __getitem__(self, key):
+        return self._index[key]
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __repr__(self):
+        return '{0}({1})'.format(self.__name__, self._index)
+
+
+def _unique_rows(xyz):
+    """ Returns the first row index of each unique row, in order of appearance, and the unique row number of
+    every row.
+    """
+
+    order = np.lexsort(xyz.T[::-1])
+    rows = xyz[order]
+    start = np.ones(len(rows), dtype=bool)
+    start[1:] = (rows[1:] != rows[:-1]).any(axis=1)
+
+    first = order[start]
+    inverse = np.empty(len(rows), dtype=np.int64)
+    inverse[order] = np.cumsum(start) - 1
+
+    order = np.argsort(first)
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+
+    return first[order], rank[inverse]
+
+
+def _near_pairs(xyz, tol):
+    """ Returns the (i, j) row pairs, i < j, of the points lying within tol of each other.
+    """
+
+    if cKDTree is not None:
+        pairs = cKDTree(xyz).query_pairs(tol, output_type='ndarray').reshape(-1, 2)
+        return np.sort(pairs, axis=1)
+
+    cells = {}
+    pairs = []
+    inv = 1. / tol
+    tol2 = tol * tol
+    points = xyz.tolist()
+
+    for j, (x, y, z) in enumerate(points):
+        i0, j0, k0 = int(floor(x * inv)), int(floor(y * inv)), int(floor(z * inv))
+        for a in (i0 - 1, i0, i0 + 1):
+            for b in (j0 - 1, j0, j0 + 1):
+                for c in (k0 - 1, k0, k0 + 1):
+                    for i in cells.get((a, b, c), ()):
+                        u, v, w = points[i]
+                        if (u - x)**2 + (v - y)**2 + (w - z)**2 <= tol2:
+                            pairs.append((i, j))
+        cells.setdefault((i0, j0, k0), []).append(j)
+
+    return np.array(pairs, dtype=np.int64).reshape(-1, 2)
+
+
+def _merge_near_rows(xyz, tol, keys, coordinates):
+    """ Returns the (row, earlier row) pairs of the batch rows that take the node of an earlier row.
+
+    Replays successive add_node calls: in order of appearance a row takes the nearest within tol of its located
+    node, keys >= 0 at coordinates, and the earlier rows that add a node, while the other rows add a node.
+    """
+
+    pairs = _near_pairs(xyz, tol)
+
+    if not len(pairs):
+        return np.zeros((0, 2), dtype=np.int64)
+
+    pairs = pairs[np.lexsort((pairs[:, 0], pairs[:, 1]))]
+    d = ((xyz[pairs[:, 0]] - xyz[pairs[:, 1]])**2).sum(axis=1)
+
+    located = keys >= 0
+    dmin = np.full(len(xyz), np.inf)
+    dmin[located] = ((coordinates[keys[located]] - xyz[located])**2).sum(axis=1)
+
+    adds = ~located
+    source = {}
+
+    for i, j, dij in zip(pairs[:, 0].tolist(), pairs[:, 1].tolist(), d.tolist()):
+        if adds[i] and dij <= dmin[j]:
+            dmin[j] = dij
+            source[j] = i
+            adds[j] = False
 
-        return [self.node_xyz(node=node) for node in nodes]
+    return np.array(sorted(source.items()), dtype=np.int64).reshape(-1, 2)
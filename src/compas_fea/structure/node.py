@@ -4,12 +4,23 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 __all__ = [
     'Node',
+    'NodeTable',
 ]
 
 
+DEFAULT_FRAME = (1., 0., 0., 0., 1., 0., 0., 0., 1.)
+
+
 class Node(object):
     """Initialises base Node object.
 
@@ -47,19 +58,114 @@ class Node(object):
     mass : float
         Mass in kg associated with the node.
 
+    Notes
+    -----
+    - A Node is a view on one row of a NodeTable, reading and writing its attributes goes through the table.
+    - A Node created directly owns a single row table of its own.
+
     """
 
+    __name__ = 'Node'
+    __slots__ = ('key', '_table', '_row')
+
     def __init__(self, key, xyz, ex, ey, ez, mass):
 
-        self.__name__ = 'Node'
         self.key = key
-        self.x = xyz[0]
-        self.y = xyz[1]
-        self.z = xyz[2]
-        self.ex = ex
-        self.ey = ey
-        self.ez = ez
-        self.mass = mass
+        self._table = NodeTable()
+        self._row = self._table.append(xyz=xyz, ex=ex, ey=ey, ez=ez, mass=mass)
+
+    @classmethod
+    def from_table(cls, table, key):
+        """Returns a Node view on an existing row of a NodeTable.
+
+        Parameters
+        ----------
+        table : obj
+            NodeTable object.
+        key : int
+            Node key number, equal to the row of the table.
+
+        Returns
+        -------
+        obj
+            Node view.
+
+        """
+
+        node = cls.__new__(cls)
+        node.key = key
+        node._table = table
+        node._row = key
+        return node
+
+    def __getstate__(self):
+        return self.key, self._table, self._row
+
+    def __setstate__(self, state):
+        if isinstance(state, dict):
+            # A Node pickled before NodeTable, keeping its attributes in __dict__
+            self.key = state['key']
+            self._table = NodeTable()
+            self._row = self._table.append(xyz=[state['x'], state['y'], state['z']], ex=state.get('ex'),
+                                           ey=state.get('ey'), ez=state.get('ez'), mass=state.get('mass') or 0)
+            return
+        self.key, self._table, self._row = state
+
+    def _get_x(self):
+        return self._table.xyz[3 * self._row]
+
+    def _set_x(self, value):
+        self._table.unshare()
+        self._table.xyz[3 * self._row] = float(value)
+
+    def _get_y(self):
+        return self._table.xyz[3 * self._row + 1]
+
+    def _set_y(self, value):
+        self._table.unshare()
+        self._table.xyz[3 * self._row + 1] = float(value)
+
+    def _get_z(self):
+        return self._table.xyz[3 * self._row + 2]
+
+    def _set_z(self, value):
+        self._table.unshare()
+        self._table.xyz[3 * self._row + 2] = float(value)
+
+    def _get_ex(self):
+        return self._table.get_frame(self._row)[0]
+
+    def _set_ex(self, value):
+        ex, ey, ez = self._table.get_frame(self._row)
+        self._table.set_frame(self._row, value, ey, ez)
+
+    def _get_ey(self):
+        return self._table.get_frame(self._row)[1]
+
+    def _set_ey(self, value):
+        ex, ey, ez = self._table.get_frame(self._row)
+        self._table.set_frame(self._row, ex, value, ez)
+
+    def _get_ez(self):
+        return self._table.get_frame(self._row)[2]
+
+    def _set_ez(self, value):
+        ex, ey, ez = self._table.get_frame(self._row)
+        self._table.set_frame(self._row, ex, ey, value)
+
+    def _get_mass(self):
+        return self._table.mass.get(self._row, 0)
+
+    def _set_mass(self, value):
+        self._table.set_mass(self._row, value)
+
+    x = property(_get_x, _set_x)
+    y = property(_get_y, _set_y)
+    z = property(_get_z, _set_z)
+    ex = property(_get_ex, _set_ex)
+    ey = property(_get_ey, _set_ey)
+    ez = property(_get_ez, _set_ez)
+    mass = property(_get_mass, _set_mass)
 
     def __str__(self):
         print('\n')
@@ -73,3 +179,290 @@ class Node(object):
 
     def __repr__(self):
         return '{0}({1})'.format(self.__name__, self.key)
+
+
+class NodeTable(object):
+    """Initialises the columnar node storage of a Structure.
+
+    Parameters
+    ----------
+    None
+
+    Attributes
+    ----------
+    xyz : array
+        Contiguous float64 [x0, y0, z0, x1, y1, z1, ..] co-ordinates, three per node.
+    frames : array
+        Contiguous float64 [ex, ey, ez] local frames, nine per node, None while all nodes use the global frame.
+    mass : dict
+        Lumped nodal masses by node key, for nodes with a non-zero mass only.
+    shared : bool
+        The columns are shared with another table made by share().
+
+    Notes
+    -----
+    - Node keys are the row numbers of the table, numbered sequentially starting from 0.
+    - Indexing the table returns a Node view, so structure.nodes[key].x keeps working.
+    - as_array() exposes the co-ordinates to NumPy without a copy, while such a view is alive the table cannot grow.
+    - A table made by share() uses the same columns, which are copied on the first change to either table.
+
+    """
+
+    def __init__(self):
+
+        self.__name__ = 'NodeTable'
+        self.xyz = array('d')
+        self.frames = None
+        self.mass = {}
+        self.shared = False
+
+    def __len__(self):
+        return len(self.xyz) // 3
+
+    def __contains__(self, key):
+        try:
+            return 0 <= int(key) < len(self)
+        except (TypeError, ValueError):
+            return False
+
+    def __iter__(self):
+        return iter(range(len(self)))
+
+    def __getitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        return Node.from_table(self, int(key))
+
+    def __setitem__(self, key, node):
+        if isinstance(node, dict):
+            xyz = [node['x'], node['y'], node['z']]
+            ex, ey, ez = node.get('ex'), node.get('ey'), node.get('ez')
+            mass = node.get('mass', 0)
+        else:
+            xyz = [node.x, node.y, node.z]
+            ex, ey, ez = node.ex, node.ey, node.ez
+            mass = node.mass
+
+        n = len(self)
+        key = int(key)
+
+        if key == n:
+            self.append(xyz=xyz, ex=ex, ey=ey, ez=ez, mass=mass)
+        elif 0 <= key < n:
+            self.set_xyz(key, xyz)
+            self.set_frame(key, ex, ey, ez)
+            self.set_mass(key, mass)
+        else:
+            raise KeyError('***** Node keys must be sequential, next key is {0} not {1} *****'.format(n, key))
+
+    def __repr__(self):
+        return '{0}({1})'.format(self.__name__, len(self))
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def keys(self):
+        return list(range(len(self)))
+
+    def values(self):
+        return [Node.from_table(self, key) for key in range(len(self))]
+
+    def items(self):
+        return [(key, Node.from_table(self, key)) for key in range(len(self))]
+
+    def append(self, xyz, ex=None, ey=None, ez=None, mass=0):
+        """Appends a node row to the table.
+
+        Parameters
+        ----------
+        xyz : list
+            [x, y, z] co-ordinates of the node.
+        ex : list
+            Node's local x axis.
+        ey : list
+            Node's local y axis.
+        ez : list
+            Node's local z axis.
+        mass : float
+            Lumped mass at node.
+
+        Returns
+        -------
+        int
+            Key of the appended node.
+
+        """
+
+        self.unshare()
+        key = len(self)
+        self.xyz.extend([float(xyz[0]), float(xyz[1]), float(xyz[2])])
+
+        if self.frames is not None:
+            self.frames.extend(DEFAULT_FRAME)
+
+        self.set_frame(key, ex, ey, ez)
+        self.set_mass(key, mass)
+
+        return key
+
+    def extend(self, xyz, ex=None, ey=None, ez=None):
+        """Appends many node rows to the table, all with the same local frame.
+
+        Parameters
+        ----------
+        xyz : array
+            (n x 3) co-ordinates of the nodes.
+        ex : list
+            Nodes' local x axis.
+        ey : list
+            Nodes' local y axis.
+        ez : list
+            Nodes' local z axis.
+
+        Returns
+        -------
+        list
+            [start, stop) range of the appended node keys.
+
+        """
+
+        self.unshare()
+        start = len(self)
+        xyz = np.ascontiguousarray(xyz, dtype=np.float64).reshape(-1, 3)
+
+        if hasattr(self.xyz, 'frombytes'):
+            self.xyz.frombytes(xyz.tobytes())
+        else:
+            self.xyz.fromstring(xyz.tobytes())
+
+        stop = len(self)
+
+        if self.frames is not None:
+            self.frames.extend(array('d', DEFAULT_FRAME) * (stop - start))
+
+        if stop > start:
+            self.set_frame(start, ex, ey, ez)
+            if self.frames is not None:
+                self.frames[9 * start:] = self.frames[9 * start:9 * start + 9] * (stop - start)
+
+        return [start, stop]
+
+    def copy(self):
+        """Returns an independent copy of the table."""
+
+        table = NodeTable()
+        table.xyz = array('d', self.xyz)
+        table.frames = array('d', self.frames) if self.frames is not None else None
+        table.mass = dict(self.mass)
+        return table
+
+    def share(self):
+        """Returns a table using the same columns, copied on the first change to either table."""
+
+        table = NodeTable()
+        table.__dict__.update(self.__dict__)
+        self.shared = table.shared = True
+        return table
+
+    def unshare(self):
+        """Copies the columns if they are shared with another table, before changing them."""
+
+        if getattr(self, 'shared', False):
+            self.xyz = array('d', self.xyz)
+            self.frames = array('d', self.frames) if self.frames is not None else None
+            self.mass = dict(self.mass)
+            self.shared = False
+
+    def get_xyz(self, key):
+        """Returns the [x, y, z] co-ordinates of a node."""
+
+        i = 3 * key
+        return self.xyz[i:i + 3].tolist()
+
+    def set_xyz(self, key, xyz):
+        """Sets the [x, y, z] co-ordinates of a node."""
+
+        self.unshare()
+        i = 3 * key
+        self.xyz[i:i + 3] = array('d', [float(xyz[0]), float(xyz[1]), float(xyz[2])])
+
+    def xyz_list(self, keys=None):
+        """Returns the [[x, y, z], ..] co-ordinates of given or all nodes."""
+
+        if keys is None:
+            if np is not None and len(self):
+                return np.frombuffer(self.xyz, dtype=np.float64).reshape(-1, 3).tolist()
+            xyz = self.xyz
+            return [xyz[i:i + 3].tolist() for i in range(0, len(xyz), 3)]
+
+        return [self.get_xyz(key) for key in keys]
+
+    def get_frame(self, key):
+        """Returns the [ex, ey, ez] local axes of a node."""
+
+        if self.frames is None:
+            f = DEFAULT_FRAME
+        else:
+            i = 9 * key
+            f = self.frames[i:i + 9].tolist()
+
+        return [list(f[0:3]), list(f[3:6]), list(f[6:9])]
+
+    def set_frame(self, key, ex=None, ey=None, ez=None):
+        """Sets the local axes of a node, None keeps the global axis."""
+
+        f = list(DEFAULT_FRAME)
+
+        for i, axis in enumerate([ex, ey, ez]):
+            if axis is not None:
+                f[3 * i:3 * i + 3] = [float(j) for j in axis]
+
+        if self.frames is None and tuple(f) == DEFAULT_FRAME:
+            return
+
+        self.unshare()
+
+        if self.frames is None:
+            self.frames = array('d', DEFAULT_FRAME) * len(self)
+
+        i = 9 * key
+        self.frames[i:i + 9] = array('d', f)
+
+    def set_mass(self, key, mass):
+        """Sets the lumped mass of a node."""
+
+        self.unshare()
+
+        if mass != 0:
+            self.mass[key] = mass
+        else:
+            self.mass.pop(key, None)
+
+    def bounds(self):
+        """Returns the [xmin, xmax], [ymin, ymax], [zmin, zmax] bounds of the nodes."""
+
+        xyz = self.xyz
+        return [[min(xyz[i::3]), max(xyz[i::3])] for i in range(3)]
+
+    def as_array(self):
+        """Returns an (n x 3) NumPy array sharing memory with the co-ordinates.
+
+        Returns
+        -------
+        array
+            Co-ordinates of all nodes, writes to the array update the table.
+
+        Notes
+        -----
+        - Release the array before adding nodes, the table cannot be resized while the memory is exported.
+        - The array is read-only while the columns are shared, call unshare() first to write to it.
+
+        """
+
+        if not len(self):
+            return np.zeros((0, 3))
+
+        coordinates = np.frombuffer(self.xyz, dtype=np.float64).reshape(-1, 3)
+        coordinates.flags.writeable = not getattr(self, 'shared', False)
+
+        return coordinates
@@ -4,9 +4,12 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+from copy import deepcopy
+
 
 __all__ = [
     'Set',
+    'SetTable',
 ]
 
 
@@ -56,3 +59,74 @@ class Set(object):
 
     def __repr__(self):
         return '{0}({1})'.format(self.__name__, self.name)
+
+
+class SetTable(dict):
+    """Initialises the sets of a Structure, a dictionary of Set objects by name.
+
+    Parameters
+    ----------
+    None
+
+    Attributes
+    ----------
+    shared : set
+        Names of the sets shared with another table made by share().
+
+    Notes
+    -----
+    - The virtual node and element sets are dictionaries instead of Set objects.
+    - A shared set is copied the first time it is looked up, so edits to its selection affect this table only.
+
+    """
+
+    def __init__(self, *args, **kwargs):
+        dict.__init__(self, *args, **kwargs)
+        self.shared = set()
+
+    def _own(self, name):
+        if name in self.shared:
+            self.shared.discard(name)
+            item = dict.__getitem__(self, name)
+            if isinstance(item, Set):
+                item = Set(name=item.name, type=item.type, selection=deepcopy(item.selection), index=item.index)
+            else:
+                item = deepcopy(item)
+            dict.__setitem__(self, name, item)
+
+    def __getitem__(self, name):
+        self._own(name)
+        return dict.__getitem__(self, name)
+
+    def __setitem__(self, name, item):
+        self.shared.discard(name)
+        dict.__setitem__(self, name, item)
+
+    def __reduce__(self):
+        return SetTable, (dict(self),), self.__dict__
+
+    def __delitem__(self, name):
+        self.shared.discard(name)
+        dict.__delitem__(self, name)
+
+    def get(self, name, default=None):
+        return self[name] if name in self else default
+
+    def setdefault(self, name, default=None):
+        if name not in self:
+            self[name] = default
+        return self[name]
+
+    def values(self):
+        return [self[name] for name in self]
+
+    def items(self):
+        return [(name, self[name]) for name in self]
+
+    def share(self):
+        """Returns a table with the same sets, each copied the first time either table looks it up."""
+
+        table = SetTable(self)
+        self.shared.update(self)
+        table.shared.update(self)
+        return table
@@ -16,7 +16,12 @@ from compas_fea.structure.mixins.nodemixins import NodeMixins
 from compas_fea.structure.mixins.elementmixins import ElementMixins
 from compas_fea.structure.mixins.objectmixins import ObjectMixins
 # from compas_fea.structure.displacement import *
+from compas_fea.structure.element import ElementTable
+from compas_fea.structure.node import NodeTable
 from compas_fea.structure.set import Set
+from compas_fea.structure.set import SetTable
+
+from copy import deepcopy
 
 import pickle
 import os
@@ -46,10 +51,12 @@ class Structure(ObjectMixins, ElementMixins, NodeMixins):
         Constraint objects.
     displacements : dict
         Displacement objects.
-    elements : dict
-        Element objects.
+    elements : ElementTable
+        Compressed sparse row element storage, indexing it by key returns Element objects.
     element_index : dict
-        Index of elements (element centroid geometric keys).
+        Index of elements (sorted node key tuples).
+    element_centroid_index : dict
+        Secondary index of elements (element centroid geometric keys), None until first needed.
     element_properties : dict
         ElementProperties objects.
     interactions : dict
@@ -62,10 +69,12 @@ class Structure(ObjectMixins, ElementMixins, NodeMixins):
         Misc objects.
     name : str
         Structure name.
-    nodes : dict
-        Node objects.
-    node_index : dict
-        Index of nodes (node geometric keys).
+    nodes : NodeTable
+        Columnar node storage, indexing it by key returns Node objects.
+    node_index : NodeIndex
+        Read-only index of nodes (node geometric keys), cached from node_locator until it changes.
+    node_locator : obj
+        Spatial index of the non-virtual nodes, see set_node_locator().
     path : str
         Path to save files.
     results : dict
@@ -82,10 +91,12 @@ class Structure(ObjectMixins, ElementMixins, NodeMixins):
         Geometric key tolerance.
     virtual_nodes : dict
         Node objects for virtual nodes.
-    virtual_elements : dict
-        Element objects for virtual elements.
+    virtual_elements : ElementTable
+        Element storage for virtual elements.
     virtual_element_index : dict
-        Index of virtual elements (element centroid geometric keys).
+        Index of virtual elements (sorted node key tuples).
+    virtual_element_centroid_index : dict
+        Secondary index of virtual elements (element centroid geometric keys), None until first needed.
 
     """
 
@@ -108,28 +119,31 @@ class Structure(ObjectMixins, ElementMixins, NodeMixins):
     def __init__(self, path, name='compas_fea-Structure'):
         self.constraints = {}
         self.displacements = {}
-        self.elements = {}
+        self.elements = ElementTable()
         self.element_index = {}
+        self.element_centroid_index = None
         self.element_properties = {}
         self.interactions = {}
         self.loads = {}
         self.materials = {}
         self.misc = {}
         self.name = name
-        self.nodes = {}
-        self.node_index = {}
+        self.nodes = NodeTable()
         self.path = path
         self.results = {}
         self.sections = {}
-        self.sets = {}
+        self.sets = SetTable()
         self.steps = {}
         self.loc_coor={}
         self.steps_order = []
         self.tol = '3'
         self.virtual_nodes = {}
         self.virtual_node_index = {}
-        self.virtual_elements = {}
+        self.virtual_elements = ElementTable()
         self.virtual_element_index = {}
+        self.virtual_element_centroid_index = None
+        self._shared = set()
+        self.set_node_locator('grid')
 
     def __str__(self):
         n = self.node_count()
@@ -212,6 +226,44 @@ loc coor
 
 """.format(self.name, n, m, d[0], d[1], d[2], d[3], d[4], d[5], d[6], d[7], d[8], d[9])
 
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+        # Structures pickled before NodeTable hold a dict of Node objects and a node_index dictionary
+
+        if isinstance(self.nodes, dict):
+            nodes = self.nodes
+            self.__dict__.pop('node_index', None)
+            self.nodes = NodeTable()
+            for key in sorted(nodes):
+                self.nodes[key] = nodes[key]
+            self.set_node_locator('grid')
+            virtual = set(self.virtual_node_index.values())
+            located = [key for key in self.nodes if key not in virtual]
+            self.node_locator.add_many(located, self.nodes_xyz(located))
+
+        if not hasattr(self, '_shared'):
+            self._shared = set()
+
+        if not isinstance(self.sets, SetTable):
+            self.sets = SetTable(self.sets)
+
+        for attr in ['element_centroid_index', 'virtual_element_centroid_index']:
+            if not hasattr(self, attr):
+                setattr(self, attr, None)
+
+        # Structures pickled before ElementTable hold dicts of Element objects and element indices keyed on centroids
+
+        for attr, index, virtual in [('elements', 'element_index', False),
+                                     ('virtual_elements', 'virtual_element_index', True)]:
+            elements = getattr(self, attr)
+            if isinstance(elements, dict):
+                setattr(self, attr, ElementTable())
+                setattr(self, index, {})
+                for key in sorted(elements):
+                    getattr(self, attr)[key] = elements[key]
+                    self.add_element_to_element_index(key, elements[key].nodes, virtual=virtual)
+
     # ==============================================================================
     # Sets
     # ==============================================================================
@@ -355,14 +407,10 @@ loc coor
 
         """
 
-        for key in sorted(list(mesh.vertices()), key=int):
-            self.add_node(mesh.vertex_coordinates(key))
-
-        ekeys = []
-
-        for fkey in list(mesh.faces()):
-            face = [self.check_node_exists(mesh.vertex_coordinates(i)) for i in mesh.face[fkey]]
-            ekeys.append(self.add_element(nodes=face, type=element_type, thermal=thermal))
+        vertices = sorted(list(mesh.vertices()), key=int)
+        node = dict(zip(vertices, self.add_nodes(mesh.vertices_attributes('xyz', keys=vertices))))
+        faces = [[node[i] for i in mesh.face[fkey]] for fkey in mesh.faces()]
+        ekeys = self.add_elements(faces, type=element_type, thermal=thermal)
 
         if elset:
             self.add_set(name=elset, type='element', selection=ekeys)
@@ -392,15 +440,10 @@ loc coor
 
         """
 
-        for key in sorted(list(network.nodes()), key=int):
-            self.add_node(network.node_coordinates(key))
-
-        ekeys = []
-
-        for u, v in list(network.edges()):
-            sp = self.check_node_exists(network.node_coordinates(u))
-            ep = self.check_node_exists(network.node_coordinates(v))
-            ekeys.append(self.add_element(nodes=[sp, ep], type=element_type, thermal=thermal, axes=axes))
+        vertices = sorted(list(network.nodes()), key=int)
+        node = dict(zip(vertices, self.add_nodes(network.nodes_attributes('xyz', keys=vertices))))
+        edges = [[node[u], node[v]] for u, v in network.edges()]
+        ekeys = self.add_elements(edges, type=element_type, thermal=thermal, axes=axes)
 
         if elset:
             self.add_set(name=elset, type='element', selection=ekeys)
@@ -417,7 +460,7 @@ loc coor
         element_type : str
             Element type: 'SolidElement' or ....
         acoustic : bool
-            Acoustic properties on or off.
+            Acoustic properties on or off, not stored by the elements.
         thermal : bool
             Thermal properties on or off.
         elset : str
@@ -432,16 +475,11 @@ loc coor
 
         """
 
-        for key in sorted(list(volmesh.vertices()), key=int):
-            self.add_node(volmesh.vertex_coordinates(key))
+        vertices = sorted(list(volmesh.vertices()), key=int)
+        node = dict(zip(vertices, self.add_nodes(volmesh.vertices_attributes('xyz', keys=vertices))))
+        cells = [[node[i] for i in volmesh.cell_vertices(ckey)] for ckey in volmesh.cells()]
+        ekeys = self.add_elements(cells, type=element_type, thermal=thermal, axes=axes)
 
-        ekeys = []
-
-        for ckey in volmesh.cell:
-            cell_vertices = volmesh.cell_vertices(ckey)
-            nkeys = [self.check_node_exists(volmesh.vertex_coordinates(nk)) for nk in cell_vertices]
-            ekeys.append(self.add_element(nodes=nkeys, type=element_type, acoustic=acoustic, thermal=thermal,
-                                          axes=axes))
         if elset:
             self.add_set(name=elset, type='element', selection=ekeys)
 
@@ -525,11 +563,86 @@ loc coor
 
         self.steps_order = order
 
+    # ==============================================================================
+    # Variants
+    # ==============================================================================
+
+    def variant(self, name=None):
+        """Returns a variant of the Structure that shares its nodes, elements and sets copy-on-write.
+
+        Parameters
+        ----------
+        name : str
+            Name of the variant, defaults to the name of the Structure.
+
+        Returns
+        -------
+        obj
+            Structure variant.
+
+        Notes
+        -----
+        - Loads, displacements, materials, sections, element properties, steps and the other objects are copied.
+        - The node and element tables and their indices are copied on the first change, by the variant or the
+          original, so that the other is never affected, also when changed through Node and Element views.
+        - Each set is copied the first time the variant or the original looks it up.
+        - Results are not carried over.
+
+        """
+
+        variant = type(self).__new__(type(self))
+        variant.__dict__.update(self.__dict__)
+
+        for attr in ['constraints', 'displacements', 'element_properties', 'interactions', 'loads', 'loc_coor',
+                     'materials', 'misc', 'sections', 'steps', 'steps_order']:
+            setattr(variant, attr, deepcopy(getattr(self, attr)))
+
+        variant.nodes = self.nodes.share()
+        variant.node_locator = self.node_locator.share(variant.nodes)
+        variant.elements = self.elements.share()
+        variant.virtual_elements = self.virtual_elements.share()
+        variant.sets = self.sets.share()
+        variant.results = {}
+        variant.name = name or self.name
+
+        shared = set(['nodes', 'elements'])
+        self._shared = getattr(self, '_shared', set()) | shared
+        variant._shared = set(shared)
+
+        return variant
+
+    def _unshare(self, *tables):
+        """Copies the given tables ('nodes' or 'elements') and their indices if they are shared with a variant."""
+
+        shared = getattr(self, '_shared', None)
+
+        if not shared:
+            return
+
+        if 'nodes' in tables and 'nodes' in shared:
+            self.nodes.unshare()
+            self.node_locator.unshare()
+            self.virtual_nodes = dict(self.virtual_nodes)
+            self.virtual_node_index = dict(self.virtual_node_index)
+            shared.discard('nodes')
+
+        if 'elements' in tables and 'elements' in shared:
+            self.elements.unshare()
+            self.virtual_elements.unshare()
+            self.element_index = dict(self.element_index)
+            self.virtual_element_index = dict(self.virtual_element_index)
+            if self.element_centroid_index is not None:
+                self.element_centroid_index = dict(self.element_centroid_index)
+            if self.virtual_element_centroid_index is not None:
+                self.virtual_element_centroid_index = dict(self.virtual_element_centroid_index)
+            shared.discard('elements')
+
     # ==============================================================================
     # Analysis
     # ==============================================================================
 
-    def write_input_file(self, software, fields='u', output=True, save=False, ndof=6, lstep = 'last', sbstep = 'last'):
+    def write_input_file(self, software, fields='u', output=True, save=False, ndof=6, lstep = 'last', sbstep = 'last',
+                         full_precision=False, sink=None, cache=False, workers=None, sets=None):
         """Writes the FE software's input file.
 
         Parameters
@@ -542,6 +655,18 @@ loc coor
             Print terminal output.
         save : bool
             Save structure to .obj before file writing.
+        full_precision : bool
+            Write node co-ordinates with full double precision instead of 3 decimals.
+        sink : obj
+            FileSink, MemorySink or PipeSink from compas_fea.fea.ansys_sel to write to, defaults to the .inp file.
+        cache : bool, str
+            Write the model sections as include files keyed by content hash and reuse unchanged ones on the
+            next call, True for the folder [name]_cache in path or the path of a folder.
+        workers : int
+            Number of processes rendering the independent model sections of the input file in parallel, where
+            processes can be forked with Python 3.7+, elsewhere (Windows) the sections are rendered serially.
+        sets : list
+            Names of the node and element sets to export the results for, None for the whole structure.
 
         Returns
         -------
@@ -554,7 +679,9 @@ loc coor
 
         if software == 'ansys_sel':
             
-            ansys_sel.input_generate(self, fields=fields, output=output, lstep = lstep, sbstep=sbstep)            
+            ansys_sel.input_generate(self, fields=fields, output=output, lstep = lstep, sbstep=sbstep,
+                                     full_precision=full_precision, sink=sink, cache=cache,
+                                     workers=workers, sets=sets)            
 
         else: 
             raise NotImplementedError
@@ -611,7 +738,7 @@ loc coor
         exe : str
             Full terminal command to bypass subprocess defaults.
         sets : list
-            -
+            Names of the node and element sets the results were exported for, as given to write_input_file.
         license : str
             Software license type: 'research', 'student'.
         output : bool
@@ -630,13 +757,14 @@ loc coor
 
         if software == 'ansys_sel':
             ansys_sel.extract_data(self, fields=fields, exe=exe, output=output, return_data=return_data,
-                              components=components, error_found=error_found)                              
+                              components=components, error_found=error_found, sets=sets)                              
 
         else:
             raise NotImplementedError
 
     def analyse_and_extract(self, software, fields='u', exe=None, cpus=4, license='research', output=True, save=False,
-                            return_data=True, components=None, ndof=6, lstep = 'last', sbstep = 'last', ansys_version=None):
+                            return_data=True, components=None, ndof=6, lstep = 'last', sbstep = 'last', ansys_version=None,
+                            sets=None):
         """Runs the analysis through the chosen FEA software / library and extracts data.
 
         Parameters
@@ -663,6 +791,8 @@ loc coor
             For which load step(s) the results are extracted to a txt.
         ansys_version: string
             Ansys version that shoul be used. (e.g. '24' for version 2024 (v241))
+        sets : list
+            Names of the node and element sets to export and extract the results for, None for the whole structure.
 
         Returns
         -------
@@ -670,12 +800,13 @@ loc coor
 
         """
 
-        self.write_input_file(software=software, fields=fields, output=output, save=save, ndof=ndof, lstep=lstep, sbstep=sbstep)
+        self.write_input_file(software=software, fields=fields, output=output, save=save, ndof=ndof, lstep=lstep, sbstep=sbstep,
+                              sets=sets)
 
         error_found=self.analyse(software=software, exe=exe, cpus=cpus, license=license, output=output, ansys_version=ansys_version)
         print('Error was found:', error_found)
         self.extract_data(software=software, fields=fields, exe=exe, license=license, output=output,
-                          return_data=return_data, components=components, error_found=error_found)
+                          return_data=return_data, components=components, error_found=error_found, sets=sets)
 
     # ==============================================================================
     # Results
@@ -850,6 +981,11 @@ loc coor
         obj
             Imported Structure object.
 
+        Notes
+        -----
+        - Structures saved before the node and element tables were introduced are converted to a NodeTable and
+          ElementTables on load.
+
         """
 
         with open(filename, 'rb') as f:
@@ -57,8 +57,8 @@ def process_data(data, dtype, iptype, nodal, elements, n):
         'mean', 'max' or 'min' of an element's integration point data.
     nodal : str
         'mean', 'max' or 'min' for nodal data conversion.
-    elements : list
-        Node numbers for each element.
+    elements : list, obj
+        Node numbers for each element, or the structure's ElementTable.
     n : int
         Number of nodes.
     Returns
@@ -76,7 +76,7 @@ def process_data(data, dtype, iptype, nodal, elements, n):
 
     elif dtype == 'element':
 
-        m = len(elements)
+        m = len(elements.offsets) - 1 if hasattr(elements, 'csr') else len(elements)
         lengths = np.zeros(m, dtype=np.int64)
         data_array = np.zeros((m, 20), dtype=np.float64)
 
@@ -94,15 +94,21 @@ def process_data(data, dtype, iptype, nodal, elements, n):
                 lengths[j] = length
                 data_array[j, :length] = fdata
 
-        rows, cols = [], []
+        if hasattr(elements, 'csr'):
+            offsets, cols = elements.csr()
+            rows = np.repeat(np.arange(m), np.diff(offsets))
+            AT = elements.incidence(n, transpose=True)
+
+        else:
+            rows, cols = [], []
 
-        for ekey, nodes in enumerate(elements):
-            rows.extend([ekey] * len(nodes))
-            cols.extend(nodes)
-        vals = [1] * len(rows)
+            for ekey, nodes in enumerate(elements):
+                rows.extend([ekey] * len(nodes))
+                cols.extend(nodes)
+            vals = [1] * len(rows)
 
-        A = csr_matrix((vals, (rows, cols)), shape=(m, n))
-        AT = A.transpose()
+            A = csr_matrix((vals, (rows, cols)), shape=(m, n))
+            AT = A.transpose()
 
         def _process(data_array, lengths, iptype):
 
@@ -168,8 +174,7 @@ def identify_ranges(data):
         A list of identified ranges.
     """
 
-    data.sort()
-    data = set(data)
+    data = sorted(set(data))
     ranges = []
 
     for k, g in groupby(enumerate(data), lambda x: x[0] - x[1]):
@@ -0,0 +1,261 @@
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from compas_fea.fea.ansys_sel import writer as ansys_writer
+from compas_fea.fea.ansys_sel.ansys_sel import _read_gp_infos
+from compas_fea.fea.ansys_sel.ansys_sel import _read_gp_results
+from compas_fea.fea.ansys_sel.ansys_sel import extract_data
+from compas_fea.fea.ansys_sel.results import gp_columns
+from compas_fea.fea.ansys_sel.results import gp_groups
+from compas_fea.fea.ansys_sel.results import results_region
+from compas_fea.structure import AreaLoad
+from compas_fea.structure import ElasticIsotropic
+from compas_fea.structure import ElementProperties
+from compas_fea.structure import FixedDisplacement
+from compas_fea.structure import GeneralStep
+from compas_fea.structure import PointLoad
+from compas_fea.structure import ShellSection
+from compas_fea.structure import Steel
+from compas_fea.structure import Structure
+
+
+np = pytest.importorskip('numpy')
+
+SNAPSHOT = os.path.join(os.path.dirname(__file__), 'fixtures', 'ansys_sel_model.inp')
+SECTIONS = ['nodes', 'node_sets', 'elements', 'element_sets', 'materials', 'boundary_conditions']
+
+
+def model(path, n=4):
+
+    mdl = Structure(path=str(path), name='model')
+    mdl.add_nodes([[i * 0.5, j * 0.5, 0] for j in range(n + 1) for i in range(n + 1)])
+    shells = mdl.add_elements([[j * (n + 1) + i, j * (n + 1) + i + 1, (j + 1) * (n + 1) + i + 1, (j + 1) * (n + 1) + i]
+                               for j in range(n) for i in range(n)], type='ShellElement')
+
+    mdl.add_set('shell_a', 'element', shells[:n])
+    mdl.add_set('shell_b', 'element', shells[n:])
+    mdl.add_set('supports', 'node', list(range(n + 1)))
+    mdl.add_set('loaded', 'node', [mdl.node_count() - 2, mdl.node_count() - 1])
+
+    local = [[0, 0, 0], [1, 0, 0], [0, 1, 0], None, [1, 0, 0], [0, 1, 0], [0, 0, 1]]
+    mdl.add(ElasticIsotropic(name='concrete', E=30000, v=0.2, p=2.5e-9))
+    mdl.add(ElasticIsotropic(name='concrete_copy', E=30000, v=0.2, p=2.5e-9))
+    mdl.add(ShellSection(name='thin', t=200, semi_loc_coords=local, nn=5))
+    mdl.add(ShellSection(name='thick', t=300, semi_loc_coords=local, nn=5))
+    mdl.add(ElementProperties(name='ep_a', material='concrete', section='thin', elset='shell_a'))
+    mdl.add(ElementProperties(name='ep_b', material='concrete_copy', section='thick', elset='shell_b'))
+
+    mdl.add(FixedDisplacement(name='fixed', nodes='supports'))
+    mdl.add(PointLoad(name='point', nodes='loaded', z=-10))
+    mdl.add(AreaLoad(name='area', elements='shell_a', z=-0.01))
+    mdl.add(GeneralStep(name='step_1', displacements=['fixed']))
+    mdl.add(GeneralStep(name='step_2', loads=['point', 'area'], increments=2))
+    mdl.set_steps_order(['step_1', 'step_2'])
+
+    return mdl
+
+
+def deck(mdl, **kwargs):
+
+    sink = ansys_writer.MemorySink()
+    mdl.write_input_file('ansys_sel', fields=['u', 'sf', 's'], output=False, lstep=['step_2'], sink=sink, **kwargs)
+
+    return sink.getvalue()
+
+
+def write_model(mdl, sink, **kwargs):
+
+    with ansys_writer.Writer(mdl, 'ansys_sel', None, ['u'], sink=sink, **kwargs) as writer:
+        writer.write_sections([(name, []) for name in SECTIONS])
+        writer.write_steps()
+
+
+def test_memory_sink_deck_snapshot():
+
+    sink = ansys_writer.MemorySink()
+    write_model(model('', n=2), sink, buffer_lines=7)
+
+    with open(SNAPSHOT) as f:
+        assert sink.getvalue() == f.read()
+
+
+def test_file_and_pipe_sinks_match_memory_sink(tmp_path):
+
+    mdl = model('', n=2)
+    memory = ansys_writer.MemorySink()
+    write_model(mdl, memory)
+
+    filename = str(tmp_path / 'model.inp')
+    write_model(mdl, ansys_writer.FileSink(filename))
+
+    with open(filename) as f:
+        assert f.read() == memory.getvalue()
+
+    copy = 'import sys; sys.stdout.write(sys.stdin.read())'
+    process = subprocess.Popen([sys.executable, '-c', copy], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    write_model(mdl, ansys_writer.PipeSink(process))
+
+    assert process.stdout.read().decode('utf-8').replace('\r\n', '\n') == memory.getvalue()
+    process.wait()
+
+
+@pytest.mark.parametrize('forking', [True, False])
+def test_parallel_sections_match_serial(tmp_path, monkeypatch, forking):
+
+    if not forking:
+        monkeypatch.setattr(ansys_writer, 'fork', None)
+        monkeypatch.setattr(ansys_writer, 'ProcessPoolExecutor', None)
+    elif ansys_writer.fork is None:
+        pytest.skip('processes can not be forked')
+
+    mdl = model(tmp_path)
+
+    assert deck(mdl, workers=3) == deck(mdl)
+
+
+def test_parallel_empty_section_matches_serial(monkeypatch):
+
+    if ansys_writer.fork is None:
+        pytest.skip('processes can not be forked')
+
+    monkeypatch.setattr(ansys_writer.Writer, 'write_empty', lambda self: None, raising=False)
+    mdl = model('')
+    texts = []
+
+    for workers in [None, 2]:
+        sink = ansys_writer.MemorySink()
+        with ansys_writer.Writer(mdl, 'ansys_sel', None, ['u'], sink=sink) as writer:
+            writer.write_sections([('node_sets', []), ('empty', []), ('element_sets', [])], workers=workers)
+        texts.append(sink.getvalue())
+
+    assert texts[0] == texts[1]
+
+
+def test_unsupported_material_raises(tmp_path):
+
+    mdl = model(tmp_path)
+    mdl.add(Steel(name='steel'))
+    mdl.element_properties['ep_b'].material = 'steel'
+
+    with pytest.raises(NotImplementedError):
+        deck(mdl)
+
+
+def expand(text):
+
+    lines = []
+
+    for line in text.split('\n'):
+        if line.startswith('/input,'):
+            fname, ext, folder = line.split(',')[1:4]
+            with open(os.path.join(folder, fname + '.' + ext)) as f:
+                lines.append(f.read()[:-1])
+        else:
+            lines.append(line)
+
+    return '\n'.join(lines)
+
+
+def test_cache_reuses_and_invalidates_include_files(tmp_path):
+
+    mdl = model(str(tmp_path) + os.sep)
+    cache = str(tmp_path / 'cache')
+
+    text = deck(mdl, cache=cache)
+    files = sorted(os.listdir(cache))
+    mtimes = [os.stat(os.path.join(cache, fname)).st_mtime_ns for fname in files]
+
+    assert [fname.split('_')[0] for fname in files] == ['boundary', 'element', 'elements', 'materials', 'node', 'nodes']
+    assert text.count('/input,') == len(SECTIONS)
+    assert expand(text) == deck(mdl)
+
+    assert deck(mdl, cache=cache) == text
+    assert sorted(os.listdir(cache)) == files
+    assert [os.stat(os.path.join(cache, fname)).st_mtime_ns for fname in files] == mtimes
+
+    mdl.edit_node(0, {'z': 0.1})
+    changed = deck(mdl, cache=cache)
+    added = sorted(set(os.listdir(cache)) - set(files))
+
+    assert len(added) == 1 and added[0].startswith('nodes_')
+    assert expand(changed) == deck(mdl)
+
+
+def value(step, element, node, column):
+
+    return step * 1e6 + element * 1e3 + node + column / 100.
+
+
+def write_results_folder(mdl, fields, steps, sets=None):
+    """Writes the element infos and GP files Ansys exports for the given sets, with values encoding their row."""
+
+    out_path = os.path.join(mdl.path, mdl.name + '_output')
+    os.makedirs(out_path)
+
+    with open(os.path.join(out_path, 'elem_infos.txt'), 'w') as f:
+        for element in mdl.elements:
+            f.write(''.join('%24.16E' % i for i in [1, element + 1, 1, 0, 0, 0, 1, 0]) + '\n')
+
+    groups = gp_groups(mdl, results_region(mdl, sets)[1])
+
+    for fname, columns, step in [('gp_infos', gp_columns(fields, step=False), 0)] + \
+            [(name + '_gp_results', gp_columns(fields), i) for i, name in enumerate(steps, 1)]:
+        with open(os.path.join(out_path, fname + '.txt'), 'w') as f:
+            for layers, elements, nodes in groups:
+                owner = dict((node, element) for element in elements for node in mdl.elements.get_nodes(element))
+                for node in nodes:
+                    row = [node + 1] + [value(step, owner[node], node, i) for i in range(1, len(columns))]
+                    f.write(''.join('%24.16E' % i for i in row) + '\n')
+
+    return out_path
+
+
+def gps(mdl, elements):
+
+    return [(element, node) for element in sorted(elements) for node in sorted(mdl.elements.get_nodes(element))]
+
+
+def test_read_gp_results_per_step(tmp_path):
+
+    mdl = model(str(tmp_path) + os.sep)
+    fields = ['u', 's', 'eps', 'sig_sr']
+    out_path = write_results_folder(mdl, fields, ['step_1', 'step_2'])
+
+    gp_infos = _read_gp_infos(mdl, out_path, fields, {'elem_loc_x_glob_x': {0: 1.}})
+    first = _read_gp_results(out_path, 'step_1', fields, gp_infos)
+    second = _read_gp_results(out_path, 'step_2', fields, gp_infos)
+    infos, columns = gp_columns(fields, step=False), gp_columns(fields)
+
+    for key, (element, node) in enumerate(gps(mdl, mdl.elements)):
+        assert first['elem_nr_top'][key] == second['elem_nr_4L'][key] == element + 1
+        assert first['GP_name_bot'][key] == key + 1
+        assert first['coor_intp_layer_y_bot'][key] == value(0, element, node, infos.index('coor_intp_layer_y_bot'))
+        assert first['eps_3_bot'][key] == value(1, element, node, columns.index('eps_3_bot'))
+        assert second['sig_sr_4L_y'][key] == value(2, element, node, columns.index('sig_sr_4L_y'))
+
+    assert first['coor_x_sig_sr_1L'] is second['coor_x_sig_sr_1L']
+    assert first['loc_x_glob_x'][0] == 1. and first['loc_x_glob_x'][4] == 0.
+    assert _read_gp_results(out_path, 'step_3', fields, gp_infos) == {}
+
+
+def test_extract_data_restricted_to_sets(tmp_path):
+
+    mdl = model(str(tmp_path) + os.sep)
+    fields = ['s']
+    write_results_folder(mdl, fields, ['step_1', 'step_2'], sets=['shell_b'])
+
+    extract_data(mdl, fields, exe=None, output=False, return_data=True, components=None, sets=['shell_b'])
+    results = mdl.results['step_2']['GP']
+    region = gps(mdl, mdl.sets['shell_b'].selection)
+
+    assert sorted(results['sig_x_top']) == list(range(len(region)))
+
+    for key, (element, node) in enumerate(region):
+        assert results['elem_nr_top'][key] == element + 1
+        assert results['sig_x_top'][key] == value(2, element, node, gp_columns(fields).index('sig_x_top'))
+
+    assert mdl.results['step_1']['GP']['sig_x_top'][0] == value(1, region[0][0], region[0][1], 1)
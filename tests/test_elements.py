@@ -0,0 +1,106 @@
+
+import pytest
+
+from compas_fea.structure import Structure
+from compas_fea.structure import element
+
+
+np = pytest.importorskip('numpy')
+
+
+def quads():
+
+    return [[0, 1, 5, 4], [1, 2, 6, 5], [5, 1, 0, 4], [2, 3, 7, 6], [4, 5, 9, 8], [3, 3, 7, 6], [6, 2, 1, 5]]
+
+
+def grid():
+
+    mdl = Structure(path='')
+    mdl.add_nodes([[i, j, 0] for j in range(3) for i in range(4)])
+
+    return mdl
+
+
+def test_add_elements_matches_add_element():
+
+    batch = grid()
+    sequential = grid()
+
+    keys = batch.add_elements(quads(), type='ShellElement', axes={'ex': [1, 0, 0]})
+
+    assert keys == [sequential.add_element(nodes, type='ShellElement', axes={'ex': [1, 0, 0]}) for nodes in quads()]
+    assert keys == [0, 1, 0, 2, 3, None, 1]
+    assert batch.element_index == sequential.element_index
+
+    for key in sequential.elements:
+        assert batch.elements[key].nodes == sequential.elements[key].nodes
+        assert batch.elements[key].axes == sequential.elements[key].axes
+        assert batch.elements[key].__name__ == 'ShellElement'
+
+
+def test_element_table_set_nodes_shifts_following_elements():
+
+    mdl = grid()
+    mdl.add_elements([[0, 1], [1, 2], [2, 3]], type='BeamElement')
+    mdl.elements[1].nodes = [1, 2, 6]
+
+    assert [mdl.elements[key].nodes for key in mdl.elements] == [[0, 1], [1, 2, 6], [2, 3]]
+
+
+@pytest.mark.parametrize('numpy', [True, False])
+def test_node_elements_invalidated_after_add_element(numpy, monkeypatch):
+
+    if not numpy:
+        monkeypatch.setattr(element, 'np', None)
+
+    mdl = grid()
+    mdl.add_element([0, 1, 5, 4], type='ShellElement')
+    mdl.add_element([1, 2, 6, 5], type='ShellElement')
+
+    assert mdl.node_elements(1) == [0, 1]
+    assert mdl.node_elements(2) == [1]
+
+    mdl.add_element([2, 3, 7, 6], type='ShellElement')
+    mdl.elements[0].nodes = [0, 2, 5, 4]
+
+    assert mdl.node_elements(1) == [1]
+    assert mdl.node_elements(2) == [0, 1, 2]
+
+
+def test_incidence_cached_and_invalidated_after_add_element():
+
+    pytest.importorskip('scipy')
+
+    mdl = grid()
+    mdl.add_element([0, 1, 5, 4], type='ShellElement')
+    matrix = mdl.incidence()
+
+    assert mdl.incidence() is matrix
+    assert matrix.shape == (1, 12)
+
+    mdl.add_element([1, 2, 6, 5], type='ShellElement')
+
+    assert mdl.incidence() is not matrix
+    assert mdl.incidence().toarray()[1].nonzero()[0].tolist() == [1, 2, 5, 6]
+    assert mdl.incidence(transpose=True)[5].indices.tolist() == [0, 1]
+
+    mdl.add_node([9, 9, 9])
+
+    assert mdl.incidence().shape == (2, 13)
+
+
+def test_unknown_element_type_leaves_no_row():
+
+    mdl = grid()
+    mdl.add_element([0, 1], type='BeamElement')
+
+    with pytest.raises(KeyError, match='FooElement'):
+        mdl.add_element([1, 2], type='FooElement')
+
+    with pytest.raises(KeyError, match='FooElement'):
+        mdl.add_elements([[2, 3], [3, 7]], type='FooElement')
+
+    assert mdl.element_count() == 1 and mdl.check_element_exists([2, 3]) is None
+    assert mdl.elements.keys() == [0] and len(mdl.elements.types) == 1
+    assert mdl.add_element([1, 2], type='BeamElement') == 1
+    assert mdl.elements[1].nodes == [1, 2]
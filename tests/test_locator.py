@@ -0,0 +1,56 @@
+
+import pytest
+
+from compas_fea.structure import Structure
+from compas_fea.structure import locator as locators
+
+
+@pytest.mark.parametrize('locator', ['grid', 'kdtree'])
+def test_locator_tolerance_at_rounding_boundary(locator):
+
+    if locator == 'kdtree':
+        pytest.importorskip('scipy')
+
+    mdl = Structure(path='')
+    mdl.set_node_locator(locator)
+
+    assert mdl.add_node([0.00049999, 0, 0]) == 0
+    assert mdl.add_node([0.00050001, 0, 0]) == 0
+    assert mdl.add_node([0.0011, 0, 0]) == 1
+    assert mdl.check_node_exists([0.0005, 0, 0.0006]) is None
+    assert mdl.check_nodes_exist([[0.0005, 0, 0], [0.0013, 0, 0], [1, 0, 0]]) == [0, 1, None]
+
+
+def test_node_index_is_cached_and_invalidated():
+
+    mdl = Structure(path='')
+    mdl.add_nodes([[0, 0, 0], [1, 0, 0]])
+    index = mdl.node_index
+
+    assert mdl.node_index is index
+    assert dict(index) == {'0.000,0.000,0.000': 0, '1.000,0.000,0.000': 1}
+
+    mdl.add_node([2, 0, 0])
+    assert mdl.node_index['2.000,0.000,0.000'] == 2
+
+    mdl.move_nodes([0], [[0, 5, 0]])
+    assert '0.000,0.000,0.000' not in mdl.node_index
+    assert mdl.node_index['0.000,5.000,0.000'] == 0
+
+
+def test_node_index_is_read_only():
+
+    mdl = Structure(path='')
+    mdl.add_node([0, 0, 0])
+
+    with pytest.raises(TypeError):
+        mdl.node_index['1.000,0.000,0.000'] = 1
+
+
+def test_kdtree_locator_without_scipy_raises(monkeypatch):
+
+    monkeypatch.setattr(locators, 'cKDTree', None)
+    mdl = Structure(path='')
+
+    with pytest.raises(ImportError, match='SciPy'):
+        mdl.set_node_locator('kdtree')
@@ -0,0 +1,74 @@
+
+import pytest
+
+from compas_fea.structure import Structure
+from compas_fea.structure.mixins import nodemixins
+
+
+np = pytest.importorskip('numpy')
+
+
+def points():
+
+    rng = np.random.RandomState(0)
+    grid = np.round(rng.rand(500, 3) * 20) / 1000.
+    noisy = grid + rng.normal(0, 0.0003, grid.shape)
+
+    return [[0.00049999, 0, 0], [0.00050001, 0, 0], [0.0009, 0, 0], [0, 0, 0], [1, 1, 1]] + noisy.tolist()
+
+
+@pytest.mark.parametrize('kdtree', [True, False])
+def test_add_nodes_matches_add_node(kdtree, monkeypatch):
+
+    if not kdtree:
+        monkeypatch.setattr(nodemixins, 'cKDTree', None)
+
+    batch = Structure(path='')
+    sequential = Structure(path='')
+
+    for mdl in [batch, sequential]:
+        mdl.add_node([0.0012, 0, 0])
+
+    keys = batch.add_nodes(points())
+
+    assert keys == [sequential.add_node(xyz) for xyz in points()]
+    assert batch.nodes_xyz() == sequential.nodes_xyz()
+
+
+def test_add_nodes_merges_across_rounding_boundary():
+
+    mdl = Structure(path='')
+
+    assert mdl.add_nodes([[0.00049999, 0, 0], [0.00050001, 0, 0], [0.0016, 0, 0]]) == [0, 0, 1]
+
+
+@pytest.mark.parametrize('numpy', [True, False])
+def test_move_nodes_reindexes_nodes_and_element_centroids(numpy, monkeypatch):
+
+    if not numpy:
+        monkeypatch.setattr(nodemixins, 'np', None)
+
+    mdl = Structure(path='')
+    mdl.add_nodes([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0], [2, 0, 0]])
+    mdl.add_element([0, 1, 2, 3], type='ShellElement')
+    mdl.add_element([1, 4], type='BeamElement')
+    mdl.build_element_centroid_index()
+
+    mdl.move_nodes([1, 4], [[1, 0, 2], [2, 0, 2]])
+
+    assert mdl.nodes_xyz() == [[0, 0, 0], [1, 0, 2], [1, 1, 0], [0, 1, 0], [2, 0, 2]]
+    assert mdl.check_node_exists([1, 0, 0]) is None
+    assert mdl.check_node_exists([1, 0, 2]) == 1
+    assert mdl.check_element_exists(xyz=[0.5, 0.5, 0.5]) == 0
+    assert mdl.check_element_exists(xyz=[0.5, 0.5, 0]) is None
+    assert mdl.check_element_exists(xyz=[1.5, 0, 2]) == 1
+    assert mdl.check_element_exists(nodes=[3, 2, 1, 0]) == 0
+
+    mdl.move_nodes([4], [[1, 1, 0]])
+
+    assert mdl.node_count() == 5
+    assert mdl.node_xyz(4) == [1, 1, 0]
+    assert mdl.check_element_exists(xyz=[1, 0.5, 1]) == 1
+
+    with pytest.raises(ValueError):
+        mdl.move_nodes([0, 2], [[0, 0, 1]])
@@ -0,0 +1,202 @@
+import copyreg
+import pickle
+
+from compas.datastructures import Mesh
+from compas.datastructures import Network
+
+from compas_fea.structure import Structure
+from compas_fea.structure.element import ShellElement
+from compas_fea.structure.element import TrussElement
+from compas_fea.structure.node import Node
+
+
+class Legacy(object):
+    """Pickles as an object of cls with the given __dict__, as saved by compas_fea before the node table."""
+
+    def __init__(self, cls, state):
+        self.cls = cls
+        self.state = state
+
+    def __reduce_ex__(self, protocol):
+        return copyreg._reconstructor, (self.cls, object, None), self.state
+
+
+def legacy_structure():
+
+    nodes = {}
+
+    for key, xyz in enumerate([[0, 0, 0], [1, 0, 0], [1, 1, 0], [5, 5, 5]]):
+        nodes[key] = Legacy(Node, {'__name__': 'Node', 'key': key, 'x': xyz[0], 'y': xyz[1], 'z': xyz[2],
+                                   'ex': [1, 0, 0], 'ey': [0, 1, 0], 'ez': [0, 0, 1], 'mass': 2 if key == 1 else 0})
+
+    elements = {
+        0: Legacy(ShellElement, {'__name__': 'ShellElement', 'nodes': [0, 1, 2], 'number': 0, 'thermal': False,
+                                 'axes': {'ex': [1, 0, 0]}, 'mass': None, 'element_property': 'ep_shell'}),
+        1: Legacy(TrussElement, {'__name__': 'TrussElement', 'nodes': [0, 2], 'number': 1, 'thermal': True,
+                                 'axes': {}, 'mass': 3, 'element_property': None, 'acoustic': False}),
+    }
+
+    state = {'constraints': {}, 'displacements': {}, 'elements': elements,
+             'element_index': {'0.667,0.333,0.000': 0, '0.500,0.500,0.000': 1}, 'element_properties': {},
+             'interactions': {}, 'loads': {}, 'materials': {}, 'misc': {}, 'name': 'legacy', 'nodes': nodes,
+             'node_index': {'0.000,0.000,0.000': 0, '1.000,0.000,0.000': 1, '1.000,1.000,0.000': 2}, 'path': '',
+             'results': {}, 'sections': {}, 'sets': {}, 'steps': {}, 'loc_coor': {}, 'steps_order': [], 'tol': '3',
+             'virtual_nodes': {}, 'virtual_node_index': {'5.000,5.000,5.000': 3}, 'virtual_elements': {},
+             'virtual_element_index': {}}
+
+    return Legacy(Structure, state)
+
+
+def test_load_legacy_nodes(tmp_path):
+
+    filename = str(tmp_path / 'legacy.obj')
+
+    with open(filename, 'wb') as f:
+        pickle.dump(legacy_structure(), f, protocol=2)
+
+    mdl = Structure.load_from_obj(filename, output=False)
+
+    assert mdl.node_count() == 4
+    assert mdl.nodes_xyz() == [[0, 0, 0], [1, 0, 0], [1, 1, 0], [5, 5, 5]]
+    assert mdl.nodes[1].mass == 2
+    assert mdl.nodes[2].ex == [1, 0, 0]
+    assert dict(mdl.node_index) == {'0.000,0.000,0.000': 0, '1.000,0.000,0.000': 1, '1.000,1.000,0.000': 2}
+    assert mdl.add_node([1, 1, 0.0001]) == 2
+    assert mdl.add_node([2, 0, 0]) == 4
+
+
+def test_load_legacy_elements(tmp_path):
+
+    filename = str(tmp_path / 'legacy.obj')
+
+    with open(filename, 'wb') as f:
+        pickle.dump(legacy_structure(), f, protocol=2)
+
+    mdl = Structure.load_from_obj(filename, output=False)
+
+    assert mdl.element_count() == 2
+    assert [mdl.elements[key].__name__ for key in mdl.elements] == ['ShellElement', 'TrussElement']
+    assert mdl.elements[0].nodes == [0, 1, 2]
+    assert mdl.elements[0].axes == {'ex': [1, 0, 0]}
+    assert mdl.elements[0].element_property == 'ep_shell'
+    assert mdl.elements[1].thermal and mdl.elements[1].mass == 3
+    assert mdl.elements[1].acoustic is False
+    assert mdl.check_element_exists([2, 1, 0]) == 0
+    assert mdl.add_element([1, 2], type='TrussElement') == 2
+
+
+def per_item(mdl, vertices, xyz, elements, element_type):
+
+    node = {vertex: mdl.add_node(point) for vertex, point in zip(vertices, xyz)}
+
+    return [mdl.add_element([node[i] for i in nodes], type=element_type) for nodes in elements]
+
+
+def test_add_nodes_elements_from_mesh_matches_per_item():
+
+    xyz = [[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0], [2, 0, 0], [1, 0, 0.0001], [2, 1, 0]]
+    faces = [[0, 1, 2, 3], [5, 4, 2], [4, 6, 2], [1, 2, 3, 0]]
+    mesh = Mesh.from_vertices_and_faces(xyz, faces)
+
+    mdl = Structure(path='')
+    sequential = Structure(path='')
+    ekeys = mdl.add_nodes_elements_from_mesh(mesh, element_type='ShellElement', elset='shells')
+
+    assert ekeys == per_item(sequential, range(len(xyz)), xyz, faces, 'ShellElement')
+    assert ekeys == [0, 1, 2, 0]
+    assert mdl.node_count() == 6
+    assert mdl.nodes_xyz() == sequential.nodes_xyz()
+    assert [mdl.elements[key].nodes for key in mdl.elements] == [[0, 1, 2, 3], [1, 4, 2], [4, 5, 2]]
+    assert [mdl.elements[key].__name__ for key in mdl.elements] == ['ShellElement'] * 3
+    assert mdl.element_index == sequential.element_index
+    assert mdl.sets['shells'].selection == ekeys
+
+
+def test_add_nodes_elements_from_network_matches_per_item():
+
+    xyz = [[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 0, 0.0002]]
+    edges = [(0, 1), (1, 2), (2, 3), (3, 1)]
+    network = Network.from_nodes_and_edges(xyz, edges)
+
+    mdl = Structure(path='')
+    sequential = Structure(path='')
+    ekeys = mdl.add_nodes_elements_from_network(network, element_type='BeamElement', axes={'ex': [0, 0, 1]})
+
+    assert ekeys == per_item(sequential, range(len(xyz)), xyz, edges, 'BeamElement')
+    assert ekeys == [0, 1, 2, 0]
+    assert mdl.node_count() == 3
+    assert [mdl.elements[key].nodes for key in mdl.elements] == [[0, 1], [1, 2], [2, 0]]
+    assert [mdl.elements[key].__name__ for key in mdl.elements] == ['BeamElement'] * 3
+    assert mdl.elements[2].axes == {'ex': [0, 0, 1]}
+
+
+def model():
+
+    mdl = Structure(path='')
+    mdl.add_nodes([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]])
+    mdl.add_element([0, 1, 2, 3], type='ShellElement')
+    mdl.add_set('nset', type='node', selection=[0, 1])
+
+    return mdl
+
+
+def test_variant_changes_do_not_reach_the_original():
+
+    mdl = model()
+    variant = mdl.variant(name='variant')
+
+    variant.add_node([2, 0, 0])
+    variant.edit_node(0, {'z': 5})
+    variant.move_nodes([1], [[1, 0, 3]])
+    variant.add_element([1, 4, 2], type='ShellElement')
+    variant.add_set('eset', type='element', selection=[1])
+
+    assert variant.node_count() == 5 and variant.element_count() == 2
+    assert mdl.node_count() == 4 and mdl.element_count() == 1
+    assert mdl.nodes_xyz() == [[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]]
+    assert mdl.check_node_exists([0, 0, 0]) == 0 and mdl.check_node_exists([0, 0, 5]) is None
+    assert variant.check_node_exists([0, 0, 5]) == 0 and variant.check_node_exists([0, 0, 0]) is None
+    assert mdl.check_element_exists([1, 4, 2]) is None
+    assert sorted(mdl.sets) == ['nset'] and sorted(variant.sets) == ['eset', 'nset']
+    assert variant.name == 'variant' and mdl.name == 'compas_fea-Structure'
+
+
+def test_original_changes_do_not_reach_the_variant():
+
+    mdl = model()
+    variant = mdl.variant()
+
+    mdl.add_node([2, 0, 0])
+    mdl.edit_node(2, {'x': 7})
+    mdl.add_element([1, 4, 2], type='ShellElement')
+
+    assert variant.node_count() == 4 and variant.element_count() == 1
+    assert variant.node_xyz(2) == [1, 1, 0]
+    assert variant.check_node_exists([2, 0, 0]) is None
+    assert variant.node_elements(1) == [0]
+    assert mdl.node_elements(1) == [0, 1]
+
+
+def test_view_and_set_edits_do_not_cross_variants():
+
+    mdl = model()
+    variant = mdl.variant()
+
+    variant.nodes[0].x = 99
+    variant.elements[0].thermal = True
+    variant.elements[0].colour = 'red'
+    variant.sets['nset'].selection.append(2)
+
+    assert mdl.node_xyz(0) == [0, 0, 0] and variant.node_xyz(0) == [99, 0, 0]
+    assert not mdl.elements[0].thermal and variant.elements[0].thermal
+    assert not hasattr(mdl.elements[0], 'colour') and variant.elements[0].colour == 'red'
+    assert mdl.sets['nset'].selection == [0, 1] and variant.sets['nset'].selection == [0, 1, 2]
+
+    mdl.nodes[1].mass = 5
+    mdl.elements[0].nodes = [3, 2, 1, 0]
+    mdl.sets['nset'].selection.remove(0)
+
+    assert mdl.nodes[1].mass == 5 and variant.nodes[1].mass == 0
+    assert variant.elements[0].nodes == [0, 1, 2, 3]
+    assert mdl.sets['nset'].selection == [1] and variant.sets['nset'].selection == [0, 1, 2]
+    assert variant.check_node_exists([1, 0, 0]) == 1